@@ -0,0 +1,191 @@
+"""
+In-memory Airtable stand-ins shared by the AirtableManager and TableMirror tests
+"""
+import re
+import threading
+import time
+from datetime import datetime, timezone
+
+from app.utils.airtable import AirtableManager, AIRTABLE_BATCH_SIZE
+from app.utils.table_cache import TableCache
+
+# Start of TableMirror.modified_since_formula's time window
+SINCE_RE = re.compile(r"DATETIME_PARSE\('([^']+)'\)")
+
+
+class ValidationError(Exception):
+    """Stand-in for requests.HTTPError with a 422 response."""
+
+    class Response:
+        status_code = 422
+
+    response = Response()
+
+
+def has_bad_field(fields):
+    """Default rejection rule: records with a truthy "bad" field are invalid."""
+    return bool(fields.get("bad"))
+
+
+class FakeTable:
+    """
+    In-memory table counting its listings and pages and recording every request.
+
+    Listings honour the fields, max_records and formula options: "FALSE()"
+    matches nothing, TableMirror's modified-since formula matches records
+    changed after its time, and any other formula matches everything.
+    """
+
+    def __init__(self, records=None, modified=None, page_size=100, delay=0.0, fail=None, rejects=has_bad_field):
+        """
+        Args:
+            records: Initial fields by record ID
+            modified: Last modification time of the initial records (default: now)
+            page_size: Records per listed page
+            delay: Seconds every listing takes before its first page
+            fail: Exception raised by every listing after the delay
+            rejects: Called with a record's fields; a batch holding a record it
+                returns True for is rejected whole with a ValidationError
+        """
+        modified = time.time() if modified is None else modified
+        self.records = {record_id: dict(fields) for record_id, fields in (records or {}).items()}
+        self.modified = dict.fromkeys(self.records, modified)
+        self.page_size = page_size
+        self.delay = delay
+        self.fail = fail
+        self.rejects = rejects
+        self.next_id = len(self.records)
+        self.requests = []
+        self.calls = []
+        self.listings = 0
+        self.pages_served = 0
+
+    def put(self, record_id, fields, modified=None):
+        """Store a record as if it was last changed at `modified` (default: now)."""
+        self.records[record_id] = fields
+        self.modified[record_id] = time.time() if modified is None else modified
+
+    def _new_id(self):
+        record_id = f"rec{self.next_id}"
+        self.next_id += 1
+        return record_id
+
+    def _record(self, record_id, fields=None):
+        return {"id": record_id, "createdTime": "2025-01-01T00:00:00.000Z",
+                "fields": dict(self.records[record_id]) if fields is None else fields}
+
+    def iterate(self, **options):
+        self.calls.append(options)
+        self.listings += 1
+        time.sleep(self.delay)
+        if self.fail is not None:
+            raise self.fail
+
+        ids = list(self.records)
+        formula = options.get("formula")
+        if formula == "FALSE()":
+            ids = []
+        elif formula and SINCE_RE.search(formula):
+            stamp = SINCE_RE.search(formula).group(1)
+            since = datetime.strptime(stamp, "%Y-%m-%dT%H:%M:%S.000Z").replace(tzinfo=timezone.utc).timestamp()
+            ids = [record_id for record_id in ids if self.modified.get(record_id, 0) > since]
+        if options.get("max_records"):
+            ids = ids[:options["max_records"]]
+
+        fields = options.get("fields")
+        for start in range(0, len(ids), self.page_size):
+            self.pages_served += 1
+            yield [self._record(record_id, None if fields is None else
+                                {k: v for k, v in self.records[record_id].items() if k in fields})
+                   for record_id in ids[start:start + self.page_size]]
+
+    def create(self, fields):
+        record_id = self._new_id()
+        self.put(record_id, dict(fields))
+        return self._record(record_id)
+
+    def update(self, record_id, fields):
+        self.put(record_id, {**self.records[record_id], **fields})
+        return self._record(record_id)
+
+    def delete(self, record_id):
+        del self.records[record_id]
+        return {"id": record_id, "deleted": True}
+
+    def _check(self, chunk):
+        self.requests.append(len(chunk))
+        assert len(chunk) <= AIRTABLE_BATCH_SIZE
+        if any(self.rejects(item.get("fields", item)) for item in chunk if isinstance(item, dict)):
+            raise ValidationError("INVALID_VALUE_FOR_COLUMN")
+
+    def batch_create(self, records, typecast=False):
+        self._check(records)
+        return [self.create(fields) for fields in records]
+
+    def batch_update(self, records, typecast=False):
+        self._check(records)
+        return [self.update(record["id"], record["fields"]) for record in records]
+
+    def batch_delete(self, record_ids):
+        self.requests.append(len(record_ids))
+        missing = [record_id for record_id in record_ids if record_id not in self.records]
+        if missing:
+            raise RuntimeError(f"404 Client Error: {missing}")
+        return [self.delete(record_id) for record_id in record_ids]
+
+    def batch_upsert(self, records, key_fields, typecast=False):
+        self._check(records)
+        result = {"createdRecords": [], "updatedRecords": [], "records": []}
+        for record in records:
+            fields = record["fields"]
+            match = next((record_id for record_id, existing in self.records.items()
+                          if all(existing.get(key) == fields[key] for key in key_fields)), None)
+            if match is None:
+                match = self.create(fields)["id"]
+                result["createdRecords"].append(match)
+            else:
+                self.update(match, fields)
+                result["updatedRecords"].append(match)
+            result["records"].append(self._record(match))
+        return result
+
+
+class FakeApi:
+    """Api stand-in with one FakeTable per table name, recording the threads that asked for tables."""
+
+    def __init__(self, options_by_table=None, **table_options):
+        """
+        Args:
+            options_by_table: FakeTable arguments of specific tables by name
+            **table_options: FakeTable arguments of every other table
+        """
+        self.options_by_table = options_by_table or {}
+        self.table_options = table_options
+        self.tables = {}
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def fake_table(self, table_name):
+        """The FakeTable of a name, created on first use."""
+        with self._lock:
+            if table_name not in self.tables:
+                options = self.options_by_table.get(table_name, self.table_options)
+                self.tables[table_name] = FakeTable(**options)
+            return self.tables[table_name]
+
+    def table(self, base_id, table_name):
+        with self._lock:
+            self.threads.add(threading.current_thread().name)
+        return self.fake_table(table_name)
+
+
+def make_manager(table_name="tbl", base_id="app", cache=None, mirror_dir=None, **api_options):
+    """
+    AirtableManager with a private cache wired to in-memory tables.
+
+    Returns:
+        (manager, the FakeTable named table_name)
+    """
+    manager = AirtableManager(api_key="key", base_id=base_id, cache=cache or TableCache(), mirror_dir=mirror_dir)
+    manager.api = FakeApi(**api_options)
+    return manager, manager.api.fake_table(table_name)
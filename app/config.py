@@ -31,7 +31,34 @@ APP_CONFIGS = {
         page_icon="",
         custom_settings={
             "supported_file_types": ["html"],
-            "show_dataframe_info": True
+            "show_dataframe_info": True,
+            # Processes used to parse one HTML export. Opt-in: raise above 1 (or None for
+            # every CPU core) only once bench_parser shows a multi-core gain on this host
+            "parser_workers": 1,
+            # Text-extraction backend for the HTML parser: "bs4", "lxml" or "tokenizer"
+            "html_backend": "tokenizer",
+            # Size cap of the persistent parse cache in data/processed, incremental store included
+            "parse_cache_max_mb": 512,
+            # Reuse visits from the previous import of the same export name
+            "incremental_ingest": True,
+            # Store parsed visits with categorical/nullable dtypes to save session memory
+            "compact_output": True,
+            # Show the first visits of large uploads at once and parse the rest in the background
+            "progressive_preview": True,
+            # Visits parsed for the preview
+            "preview_visits": 200,
+            # Uploads smaller than this (in MB) are parsed synchronously
+            "progressive_min_mb": 1,
+            # Airtable tables fetched at the same time (e.g. on the dashboard)
+            "airtable_fetch_workers": 4,
+            # Local mirrors of Airtable tables, synced incrementally; None reads Airtable directly
+            "airtable_mirror_dir": "data/mirror",
+            # Hours between full downloads of a mirrored table (which drop deleted records)
+            "airtable_full_sync_hours": 24,
+            # Seconds a cached Airtable table is served before it is fetched again
+            "airtable_cache_ttl_seconds": 300,
+            # Memory cap (in MB) of the cached Airtable tables; least recently used tables are evicted
+            "airtable_cache_max_mb": 256
         }
     )
 }
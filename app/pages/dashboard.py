@@ -8,9 +8,24 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-from app.utils.airtable import AirtableManager
+from app.utils.airtable import AirtableManager, TableQuery, any_of_formula
 from app.config import get_app_config
 
+# Accounts whose transactions are listed under "Last Transactions"
+LAST_TRANSACTION_ACCOUNTS = ['3000', '3100', '4000', '4100', '4200', '4300']
+LAST_TRANSACTION_COLUMNS = ['timestamp', 'counterparty', 'description', 'amount', 'currency']
+
+# Only the fields and records each section shows are downloaded
+TOTALS_QUERY = TableQuery("transactions", fields=["account_id", "amount"])
+ACCOUNTS_QUERY = TableQuery("chart_of_accounts", fields=["account_id", "account_name"])
+LAST_TRANSACTIONS_QUERY = TableQuery(
+    "transactions",
+    fields=LAST_TRANSACTION_COLUMNS,
+    formula=any_of_formula("account_id", LAST_TRANSACTION_ACCOUNTS),
+    sort=["-timestamp"],
+    max_records=10
+)
+
 def welcome():
     """Display the welcome page with application overview."""
     
@@ -105,13 +120,18 @@ def welcome():
     st.markdown("Overview")
     
     # Initialize Airtable manager
-    airtable_manager = AirtableManager()
+    airtable_manager = AirtableManager.from_settings(config.custom_settings)
     
     if airtable_manager.is_configured():
         # Fetch and display wizyty table data
         with st.spinner("Loading data from Airtable..."):
-            transactions_df = airtable_manager.get_table_data("transactions")
-            chart_of_accounts_df = airtable_manager.get_table_data("chart_of_accounts")
+            # Fetch all sections at the same time instead of one after the other
+            tables = airtable_manager.get_tables_data(
+                (TOTALS_QUERY, ACCOUNTS_QUERY, LAST_TRANSACTIONS_QUERY),
+                max_workers=config.custom_settings.get("airtable_fetch_workers")
+            )
+            transactions_df = tables[TOTALS_QUERY]
+            chart_of_accounts_df = tables[ACCOUNTS_QUERY]
             df = pd.merge(transactions_df, chart_of_accounts_df, on='account_id', how='left')
         
         if not df.empty:
@@ -250,9 +270,8 @@ def welcome():
             st.markdown("Last Transactions")
             
             # Display dataframe without index column and with padding, sorted by timestamp desc
-            # Filter for expense accounts first, then select columns
-            df = df[df['account_id'].isin(['3000','3100','4000','4100','4200','4300'])]
-            df = df[['timestamp', 'counterparty', 'description', 'amount', 'currency']].head(10)
+            # Airtable already filtered the accounts and returned only the 10 newest rows
+            df = tables[LAST_TRANSACTIONS_QUERY].reindex(columns=LAST_TRANSACTION_COLUMNS)
             # Convert timestamp to string format safely
             try:
                 if 'timestamp' in df.columns:
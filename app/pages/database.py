@@ -1,91 +1,142 @@
 """
 Database Page - Airtable Integration
 
-Display Airtable records in a Streamlit dataframe.
+Display Airtable records in a paginated data grid.
 """
 
 import streamlit as st
 import pandas as pd
 import json
-from app.utils.airtable import AirtableManager
+from app.config import get_app_config
+from app.utils.airtable import AirtableManager, concat_chunks
+from app.utils.csv_upload import ChunkedCsvUploader, UploadInterrupted
+from app.utils.exports import EXPORT_FORMATS, download_button
+from app.utils.data_grid import data_grid
 from typing import List, Dict, Any
-from io import BytesIO
 
-def upload_csv_to_airtable(csv_file, table_name):
+def upload_csv_to_airtable(csv_file, table_name, restart=False):
     """
     Upload CSV data to Airtable.
     
+    Rows are sent in chunks and progress is checkpointed after every batch,
+    so an interrupted upload of the same file resumes where it stopped.
+    
     Args:
         csv_file: Uploaded CSV file
         table_name: Name of the Airtable table
+        restart: Ignore previous progress and upload every row again
         
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        # Read CSV file
-        df = pd.read_csv(csv_file)
-        
-        # Initialize Airtable manager
-        airtable_manager = AirtableManager()
+        # Initialize Airtable manager (uploads drop the table from the shared cache)
+        airtable_manager = AirtableManager.from_settings(get_app_config("finance").custom_settings)
         
         if not airtable_manager.is_configured():
             st.error("Airtable is not properly configured. Please check your secrets.toml file.")
             return False
         
-        # Convert DataFrame to list of records
-        records = []
-        for _, row in df.iterrows():
-            # Convert row to dictionary, handling NaN values and data types
-            record = {}
-            for col, value in row.items():
-                if pd.notna(value):  # Only include non-null values
-                    # Handle different data types
-                    if isinstance(value, str):
-                        # Check if it's a JSON string that should be parsed
-                        if value.strip().startswith('[') and value.strip().endswith(']'):
-                            try:
-                                record[col] = json.loads(value)
-                            except:
-                                record[col] = value
-                        else:
-                            record[col] = value
-                    elif isinstance(value, (int, float)):
-                        record[col] = value
-                    elif hasattr(value, 'isoformat'):  # datetime objects
-                        record[col] = value.isoformat()
-                    else:
-                        record[col] = str(value)
-            records.append(record)
+        uploader = ChunkedCsvUploader(airtable_manager, table_name, csv_file.getvalue())
+        checkpoint = uploader.checkpoint
+        
+        if restart:
+            checkpoint.clear()
+        elif checkpoint.completed:
+            st.info(
+                f"'{csv_file.name}' was already uploaded to '{table_name}' ({checkpoint.uploaded} records). "
+                "Tick 'Start over' to upload it again."
+            )
+            return False
+        elif checkpoint.rows_committed:
+            st.info(
+                f"Resuming after row {checkpoint.rows_committed} "
+                f"({checkpoint.uploaded} records were uploaded previously)."
+            )
+        
+        # Rows are converted chunk by chunk and sent 10 per request (Airtable's limit);
+        # rows Airtable rejects are reported instead of aborting the upload, while
+        # outages stop it so that it can be resumed
+        progress_bar = st.progress(0.0, text="Uploading records...")
         
-        # Upload records in batches (Airtable has a limit of 10 records per request)
-        batch_size = 10
-        total_uploaded = 0
+        def on_progress(progress):
+            progress_bar.progress(progress.fraction, text=progress.describe())
         
-        for i in range(0, len(records), batch_size):
-            batch = records[i:i + batch_size]
-            
-            # Upload batch
-            for i, record in enumerate(batch):
-                try:
-                    success = airtable_manager.add_record(table_name, record)
-                    if success:
-                        total_uploaded += 1
-                    else:
-                        st.error(f"Failed to upload record {i+1}: {record}")
-                        return False
-                except Exception as e:
-                    st.error(f"Error uploading record {i+1}: {str(e)}")
-                    st.error(f"Problematic record data: {record}")
-                    return False
+        checkpoint = uploader.run(on_progress)
+        progress_bar.empty()
         
-        st.success(f"Successfully uploaded {total_uploaded} records to '{table_name}' table!")
+        failures = checkpoint.failures
+        if failures:
+            st.warning(
+                f"Uploaded {checkpoint.uploaded} of {checkpoint.rows_committed} records to '{table_name}'; "
+                f"{len(failures)} failed."
+            )
+            with st.expander("Failed Records"):
+                st.dataframe(
+                    pd.DataFrame([
+                        {
+                            "row": failure["row"],
+                            "error": failure["error"],
+                            "record": json.dumps(failure["record"], default=str, ensure_ascii=False)
+                        }
+                        for failure in failures
+                    ]),
+                    use_container_width=True,
+                    hide_index=True
+                )
+            return False
+        
+        st.success(f"Successfully uploaded {checkpoint.uploaded} records to '{table_name}' table!")
         return True
         
+    except UploadInterrupted as e:
+        st.warning(
+            f"{e}. {e.checkpoint.uploaded} records were uploaded so far; "
+            "upload the same file again to resume from where it stopped."
+        )
+        return False
     except Exception as e:
         st.error(f"Error uploading to Airtable: {str(e)}")
         return False
 
+def load_table_data(airtable_manager, table_name):
+    """
+    Load a whole table from Airtable, showing its first rows as soon as they arrive.
+    
+    Records are fetched page by page and converted to DataFrame chunks as
+    they come in, so the first page is visible right away and the record
+    dictionaries of the whole table are never held at once.
+    
+    Args:
+        airtable_manager: Configured AirtableManager
+        table_name: Name of the Airtable table
+        
+    Returns:
+        pandas DataFrame with the table records (empty on error)
+    """
+    preview = st.empty()
+    status = st.empty()
+    chunks = []
+    loaded = 0
+    try:
+        for chunk in airtable_manager.iter_table_chunks(table_name):
+            if not chunks:
+                with preview.container():
+                    st.caption(f"First records of '{table_name}':")
+                    st.dataframe(chunk, use_container_width=True, hide_index=True)
+            chunks.append(chunk)
+            loaded += len(chunk)
+            status.caption(f"Loaded {loaded:,} records from '{table_name}'...")
+    except Exception as e:
+        st.error(f"Error fetching data from Airtable table '{table_name}': {str(e)}")
+        return pd.DataFrame()
+    finally:
+        preview.empty()
+        status.empty()
+    
+    # Consumes the chunks; the loaded table is not kept in the table cache as well
+    return concat_chunks(chunks)
+
 def show_database_page():
     """Display the database page with Airtable integration."""
     
@@ -93,7 +144,7 @@ def show_database_page():
     st.markdown("View and manage data from your Airtable base.")
     
     # Initialize Airtable manager
-    airtable_manager = AirtableManager()
+    airtable_manager = AirtableManager.from_settings(get_app_config("finance").custom_settings)
     
     if not airtable_manager.is_configured():
         st.error("❌ Airtable is not properly configured. Please check your secrets.toml file.")
@@ -123,22 +174,41 @@ def show_database_page():
     col1, col2 = st.columns(2)
     
     with col1:
-        if st.button("Load Table Data", help="Clear cache and load fresh data"):
-            airtable_manager.clear_cache()
-            with st.spinner(f"Refreshing data from '{selected_table}' table..."):
-                df = airtable_manager.get_table_data_fresh(selected_table)
-                if not df.empty:
-                    st.session_state.airtable_data = df
-                    st.session_state.airtable_filename = f"{selected_table}_data"
-                    st.session_state.selected_table = selected_table
-                    st.success(f"Successfully refreshed {len(df)} records from '{selected_table}'!")
-                else:
-                    st.warning(f"No data found in the '{selected_table}' table.")
+        if st.button("Load Table Data", help="Load fresh data, showing the first records while the rest arrive"):
+            df = load_table_data(airtable_manager, selected_table)
+            if not df.empty:
+                st.session_state.airtable_data = df
+                st.session_state.airtable_filename = f"{selected_table}_data"
+                st.session_state.selected_table = selected_table
+                st.success(f"Successfully refreshed {len(df)} records from '{selected_table}'!")
+            else:
+                st.warning(f"No data found in the '{selected_table}' table.")
+            if airtable_manager.mirror_dir:
+                status = airtable_manager.mirror(selected_table).status()
+                if status["last_sync"] is not None:
+                    last_full_sync = pd.Timestamp(status["last_full_sync"], unit="s", tz="UTC")
+                    st.caption(
+                        f"Local mirror: {status['records']:,} records, only changes are downloaded "
+                        f"(last full sync {last_full_sync:%Y-%m-%d %H:%M} UTC)."
+                    )
     
     with col2:
-        if st.button("Clear All Cache", help="Clear all Streamlit caches to fix API issues"):
+        if st.button("Clear All Cache", help="Clear every cached Airtable table to fix API issues"):
             airtable_manager.clear_all_cache()
             st.success("All caches cleared! Try loading data again.")
+        stats = airtable_manager.cache_stats()
+        st.caption(
+            f"Table cache: {stats['entries']} tables, {stats['bytes'] / 1024 / 1024:.1f} MB · "
+            f"{stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions"
+        )
+        metrics = airtable_manager.client_metrics()
+        st.caption(
+            f"Airtable requests: {metrics['requests']} sent, {metrics['throttled']} throttled, "
+            f"{metrics['retries']} retried, {metrics['rate_limit_wait']:.1f}s rate-limit wait · "
+            f"circuit {metrics['breaker_state'].replace('_', '-')}"
+        )
+        if metrics["breaker_state"] != "closed":
+            st.warning("Airtable keeps failing, so requests are paused for a moment to let it recover.")
     
     # Display data if available
     if 'airtable_data' in st.session_state and not st.session_state.airtable_data.empty:
@@ -146,33 +216,9 @@ def show_database_page():
         table_name = st.session_state.get('selected_table', 'Unknown')
         df = st.session_state.airtable_data
         
-        # # Display options
-        # st.markdown("#### Display Options")
-        # col1, col2 = st.columns(2)
-        
-        # with col1:
-        #     show_columns = st.multiselect(
-        #         "Select columns to display:",
-        #         options=df.columns.tolist(),
-        #         default=df.columns.tolist()[:5]  # Show first 5 columns by default
-        #     )
-        
-        # with col2:
-        #     max_rows = st.slider("Maximum rows to display:", 10, len(df), min(100, len(df)))
-        
-        # # Filter data based on selection
-        # if show_columns:
-        #     display_df = df[show_columns].head(max_rows)
-        # else:
-        #     display_df = df.head(max_rows)
-        
-        # Display the dataframe
+        # Display one page of the data (sorting and filtering run server-side)
         st.markdown(f"Data Preview - {table_name}")
-        st.dataframe(
-            df,
-            use_container_width=True,
-            height=400
-        )
+        data_grid(df, key="airtable_grid")
         
         # Data info
         with st.expander("Data Information"):
@@ -180,32 +226,15 @@ def show_database_page():
             for col in df.columns:
                 st.write(f"- **{col}**: {df[col].dtype} ({df[col].notna().sum()} non-null values)")
         
-        # Download options
+        # Download options (files are built only when a button is clicked)
         st.markdown("#### Download Data")
-        col1, col2, col3 = st.columns(3)
+        columns = st.columns(len(EXPORT_FORMATS) + 1)
         
-        with col1:
-            csv_data = df.to_csv(index=False)
-            st.download_button(
-                label="Download as CSV",
-                data=csv_data,
-                file_name=f"{st.session_state.airtable_filename}.csv",
-                mime="text/csv"
-            )
+        for column, format_name in zip(columns, EXPORT_FORMATS):
+            with column:
+                download_button(df, format_name, st.session_state.airtable_filename)
         
-        with col2:
-            # Create Excel data in memory
-            excel_buffer = BytesIO()
-            df.to_excel(excel_buffer, index=False, engine='openpyxl')
-            excel_data = excel_buffer.getvalue()
-            st.download_button(
-                label="Download as Excel",
-                data=excel_data,
-                file_name=f"{st.session_state.airtable_filename}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-        
-        with col3:
+        with columns[-1]:
             if st.button("Clear Data"):
                 if 'airtable_data' in st.session_state:
                     del st.session_state.airtable_data
@@ -246,11 +275,16 @@ def show_database_page():
         )
         selected_table = table_options[selected_display_name]
         
+        restart = st.checkbox(
+            "Start over",
+            help="Ignore the progress of a previous upload of this file and send every row again"
+        )
+        
         # Upload button
         if csv_file is not None and selected_table:
             if st.button("Upload to Airtable", type="primary"):
                 with st.spinner(f"Uploading {csv_file.name} to '{selected_table}' table..."):
-                    success = upload_csv_to_airtable(csv_file, selected_table)
+                    success = upload_csv_to_airtable(csv_file, selected_table, restart)
                     if success:
                         st.balloons()  # Celebration animation
     else:
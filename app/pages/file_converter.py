@@ -6,37 +6,163 @@ Following Streamlit best practices for multipage applications.
 """
 
 import streamlit as st
-import tempfile
 import pandas as pd
-import os
-import hashlib
-from io import BytesIO
 from app.config import get_app_config
-from app.utils.html_processor import read_html
+from app.utils.html_processor import HTMLProcessor, read_html
+from app.utils.parse_cache import ParseCache
+from app.utils.incremental import IncrementalParser
+from app.utils.visit_merge import merge_visits
+from app.utils.exports import EXPORT_FORMATS, download_button
+from app.utils.data_grid import data_grid
+from app.utils.background_parse import BackgroundParse, preview_frame
+
+# Seconds between progress updates while a background parse runs
+PROGRESS_POLL_SECONDS = 1
+
+
+def get_parse_cache() -> ParseCache:
+    """Return the persistent parse cache configured for the app."""
+    settings = get_app_config("finance").custom_settings
+    return ParseCache(max_bytes=settings.get("parse_cache_max_mb", 512) * 1024 * 1024)
+
+
+def compact_if_enabled(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert parsed visits to the compact schema when compact_output is enabled."""
+    if get_app_config("finance").custom_settings.get("compact_output", False):
+        return HTMLProcessor.compact_dataframe(df)
+    return df
+
 
 @st.cache_data
-def process_html_file(file_content: bytes, filename: str):
+def process_html_file(_file_content, content_hash: str, filename: str):
     """
     Cached function to process HTML files.
     This prevents re-processing the same file multiple times.
+    Parsed results are also persisted on disk, keyed by content hash,
+    so they survive restarts and clearing the in-memory cache.
+
+    The content is parsed in memory and is excluded from Streamlit's
+    argument hashing (leading underscore); content_hash is the cache key.
+
+    Args:
+        _file_content: Raw bytes or binary file object of the export
+        content_hash: SHA-256 of the content from ParseCache.content_hash
+        filename: Name of the uploaded file
     """
     try:
-        # Save uploaded file temporarily to read it
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.html') as tmp_file:
-            tmp_file.write(file_content)
-            tmp_file_path = tmp_file.name
-        
-        try:
-            df = read_html(tmp_file_path, filename)
-            return df
-        finally:
-            # Clean up temporary file
-            os.unlink(tmp_file_path)
+        parse_cache = get_parse_cache()
+        df = parse_cache.get(content_hash)
+        if df is not None:
+            return compact_if_enabled(df)
+
+        settings = get_app_config("finance").custom_settings
+        backend = settings.get("html_backend", "bs4")
+        if settings.get("incremental_ingest", False):
+            # Re-exports of a growing history only parse visits not seen before
+            incremental_parser = IncrementalParser(backend=backend)
+            df, _ = incremental_parser.ingest(_file_content, IncrementalParser.dataset_name(filename))
+        else:
+            df = read_html(
+                _file_content,
+                filename,
+                workers=settings.get("parser_workers", 1),
+                backend=backend
+            )
+        parse_cache.put(content_hash, df)
+        return compact_if_enabled(df)
     except Exception as e:
         st.error(f"Error processing file: {str(e)}")
         return None
 
 
+@st.cache_data
+def merge_processed_files(_frames, content_hashes: tuple):
+    """
+    Cached merge of several processed exports into one deduplicated dataset.
+
+    Args:
+        _frames: List of (file name, DataFrame) pairs (not hashed by Streamlit)
+        content_hashes: Content hashes of the exports, used as the cache key
+
+    Returns:
+        Tuple of the merged DataFrame and the per-file merge report
+    """
+    df, report = merge_visits(_frames)
+    # Categories of the individual files differ, so concatenation falls back to object
+    return compact_if_enabled(df), report
+
+
+def use_progressive_parse(uploads) -> bool:
+    """
+    Decide whether uploads are previewed and parsed in the background.
+
+    Small uploads and uploads already in the parse cache load quickly, so
+    they keep the synchronous path.
+    """
+    settings = get_app_config("finance").custom_settings
+    if not settings.get("progressive_preview", False):
+        return False
+
+    job = st.session_state.get('parse_job')
+    if job is not None and job.key == tuple(content_hash for _, _, content_hash in uploads):
+        return True
+
+    total_bytes = sum(len(file_content) for _, file_content, _ in uploads)
+    if total_bytes < settings.get("progressive_min_mb", 1) * 1024 * 1024:
+        return False
+    parse_cache = get_parse_cache()
+    return not all(parse_cache.contains(content_hash) for _, _, content_hash in uploads)
+
+
+def progressive_parse(uploads):
+    """
+    Show a preview of the first visits and parse the uploads in the background.
+
+    The preview is stored in session state right away; the complete
+    DataFrame replaces it once the background parse has finished.
+    """
+    key = tuple(content_hash for _, _, content_hash in uploads)
+    job = st.session_state.get('parse_job')
+
+    if job is None or job.key != key:
+        settings = get_app_config("finance").custom_settings
+        name, file_content, _ = uploads[0]
+        preview = preview_frame(file_content, settings.get("preview_visits", 200), settings.get("html_backend", "bs4"))
+        st.session_state.current_dataframe = compact_if_enabled(preview)
+        st.session_state.current_filename = name
+        st.session_state.merge_report = None
+        st.session_state.file_processed = False
+
+        job = BackgroundParse(key, uploads, process_html_file, merge_processed_files).start()
+        st.session_state.parse_job = job
+
+    if not job.done:
+        return
+
+    for error in job.errors:
+        st.error(error)
+    if job.result is not None:
+        df, filename, merge_report = job.result
+        st.session_state.current_dataframe = df
+        st.session_state.current_filename = filename
+        st.session_state.merge_report = merge_report
+        st.session_state.file_processed = True
+    else:
+        st.session_state.current_dataframe = None
+        st.session_state.file_processed = False
+
+
+@st.fragment(run_every=PROGRESS_POLL_SECONDS)
+def show_parse_progress():
+    """Report background parse progress; rerun the page once the full data is ready."""
+    job = st.session_state.get('parse_job')
+    if job is None:
+        return
+    if job.done:
+        st.rerun()
+    st.progress(job.progress, text=f"Parsing the full export in the background... {job.progress:.0%}")
+
+
 def convert_file():
     """Display the file upload page with improved session state management."""
     config = get_app_config("finance")
@@ -45,10 +171,12 @@ def convert_file():
     
     # File upload
     supported_types = config.custom_settings.get("supported_file_types", ["html"])
-    uploaded_file = st.file_uploader(
+    uploaded_files = st.file_uploader(
         "Drag and drop a file here", 
         type=supported_types,
-        help=f"Supported formats: {', '.join(supported_types)}",
+        help=f"Supported formats: {', '.join(supported_types)}. "
+             "Upload several overlapping exports to combine them without duplicate visits.",
+        accept_multiple_files=True,
         key="file_uploader"
     )
     
@@ -63,31 +191,56 @@ def convert_file():
                 st.session_state.current_dataframe = None
                 st.session_state.current_filename = None
                 st.session_state.file_processed = False
+                st.session_state.merge_report = None
+                st.session_state.parse_job = None
                 # Clear the cache for the processing function
                 process_html_file.clear()
                 st.rerun()
     
-    # Process file if uploaded
-    if uploaded_file is not None:
-        # Always process the file (this will use cache if same file, but allows reprocessing)
-        with st.spinner("Processing file..."):
-            if uploaded_file.name.endswith('.html'):
-                # Create a unique cache key that includes file content hash to ensure fresh processing
-                file_hash = hashlib.md5(uploaded_file.getvalue()).hexdigest()
-                cache_key = f"{uploaded_file.name}_{file_hash}"
+    # Process files if uploaded
+    if uploaded_files:
+        # Read each upload once and hash it once; the hash is the only cache key.
+        # getvalue() shares the upload's buffer instead of copying it, and the
+        # bytes are parsed in memory without a temporary file.
+        uploads = []
+        for uploaded_file in uploaded_files:
+            if not uploaded_file.name.endswith('.html'):
+                st.error(f"Unsupported file type: {uploaded_file.name}")
+                continue
+            file_content = uploaded_file.getvalue()
+            uploads.append((uploaded_file.name, file_content, ParseCache.content_hash(file_content)))
+
+        if uploads and use_progressive_parse(uploads):
+            progressive_parse(uploads)
+        else:
+            # Always process the files (this will use cache if same file, but allows reprocessing)
+            with st.spinner("Processing file..."):
+                frames = []
+                content_hashes = []
+                for name, file_content, content_hash in uploads:
+                    file_df = process_html_file(file_content, content_hash, name)
+                    if file_df is not None:
+                        frames.append((name, file_df))
+                        content_hashes.append(content_hash)
+
+                merge_report = None
+                if len(frames) > 1:
+                    # Combine overlapping exports, dropping visits seen in an earlier file
+                    df, merge_report = merge_processed_files(frames, tuple(content_hashes))
+                    filename = f"combined_{len(frames)}_files"
+                elif frames:
+                    filename, df = frames[0]
+                else:
+                    df = None
                 
-                df = process_html_file(uploaded_file.getvalue(), cache_key)
-            else:
-                st.error("Unsupported file type!")
-                df = None
-            
-            if df is not None:
-                # Store in session state for other pages
-                st.session_state.current_dataframe = df
-                st.session_state.current_filename = uploaded_file.name
-                st.session_state.file_processed = True
-            else:
-                st.session_state.file_processed = False
+                if df is not None:
+                    # Store in session state for other pages
+                    st.session_state.current_dataframe = df
+                    st.session_state.current_filename = filename
+                    st.session_state.merge_report = merge_report
+                    st.session_state.file_processed = True
+                else:
+                    st.session_state.file_processed = False
     
     # Display data if available
     if st.session_state.current_dataframe is not None:
@@ -95,32 +248,33 @@ def convert_file():
         
         st.markdown("### Processed Data")
         
-        # Display the dataframe
-        st.dataframe(df, use_container_width=True, height=400)
-        
-        # Download options
-        st.markdown("#### Download Data")
-        col1, col2 = st.columns(2)
+        job = st.session_state.get('parse_job')
+        parsing = job is not None and not job.done and not st.session_state.file_processed
+        if parsing:
+            st.info(f"Showing a preview of the first {len(df)} visits while the rest is parsed.")
+            show_parse_progress()
         
-        with col1:
-            csv_data = df.to_csv(index=False)
-            st.download_button(
-                label="Download as CSV",
-                data=csv_data,
-                file_name=f"processed_{st.session_state.current_filename}.csv",
-                mime="text/csv"
+        merge_report = st.session_state.get('merge_report')
+        if merge_report is not None:
+            st.info(
+                f"Combined {len(merge_report)} files: {merge_report['added'].sum()} visits kept, "
+                f"{merge_report['duplicates'].sum()} duplicates dropped"
             )
+            with st.expander("Merge Details"):
+                st.dataframe(merge_report, use_container_width=True, hide_index=True)
         
-        with col2:
-            # Create Excel data in memory
-            excel_buffer = BytesIO()
-            df.to_excel(excel_buffer, index=False, engine='openpyxl')
-            excel_data = excel_buffer.getvalue()
-            st.download_button(
-                label="Download as Excel",
-                data=excel_data,
-                file_name=f"processed_{st.session_state.current_filename}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        # Display one page of the data (sorting and filtering run server-side)
+        data_grid(df, key="converter_grid")
+        
+        # Download options (files are built only when a button is clicked)
+        st.markdown("#### Download Data")
+        file_stem = f"processed_{st.session_state.current_filename}"
+        
+        if parsing:
+            st.caption("Downloads are available once the full export has been parsed.")
+        else:
+            for column, format_name in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS):
+                with column:
+                    download_button(df, format_name, file_stem)
     else:
         st.info("Please upload an HTML file to get started")
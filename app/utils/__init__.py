@@ -2,7 +2,11 @@
 Utils package for Koteria application.
 """
 
-from .airtable import AirtableManager
+from .airtable import AirtableManager, BatchResult, TableQuery
+from .airtable_records import RecordConverter, dataframe_to_records
+from .csv_upload import ChunkedCsvUploader, UploadCheckpoint
+from .table_mirror import TableMirror
+from .table_cache import TableCache
 from .session_state import (
     SessionStateManager,
     initialize_session_state,
@@ -13,10 +17,24 @@ from .session_state import (
 )
 from .file_utils import FileUtils, validate_file_type, format_file_size
 from .data_utils import DataUtils, get_sample_data
-from .html_processor import HTMLProcessor, clean_multiline, read_html
+from .html_processor import HTMLProcessor, clean_multiline, read_html, iter_visits
+from .parse_cache import ParseCache
+from .incremental import IncrementalParser
+from .visit_merge import VisitMerger, merge_visits
+from .exports import DataExporter, EXPORT_FORMATS, download_button, write_year_partitioned
+from .data_grid import DataGrid, data_grid
+from .background_parse import BackgroundParse, preview_frame
 
 __all__ = [
     'AirtableManager',
+    'BatchResult',
+    'TableQuery',
+    'RecordConverter',
+    'dataframe_to_records',
+    'ChunkedCsvUploader',
+    'UploadCheckpoint',
+    'TableMirror',
+    'TableCache',
     'SessionStateManager',
     'initialize_session_state',
     'clear_data',
@@ -30,5 +48,18 @@ __all__ = [
     'get_sample_data',
     'HTMLProcessor',
     'clean_multiline',
-    'read_html'
+    'read_html',
+    'iter_visits',
+    'ParseCache',
+    'IncrementalParser',
+    'VisitMerger',
+    'merge_visits',
+    'DataExporter',
+    'EXPORT_FORMATS',
+    'download_button',
+    'write_year_partitioned',
+    'DataGrid',
+    'data_grid',
+    'BackgroundParse',
+    'preview_frame'
 ]
@@ -8,27 +8,296 @@ reading, adding, updating, and deleting records.
 import streamlit as st
 import pandas as pd
 from pyairtable import Api
-from typing import List, Dict, Any, Optional
+import itertools
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Dict, Any, Optional, Sequence, Tuple, Union
 import os
+import sqlite3
+
+from .rate_limit import RateLimitedAdapter, base_guard
+from .table_cache import TABLE_CACHE_MAX_BYTES, TABLE_CACHE_TTL, TableCache
+from .table_mirror import FULL_SYNC_INTERVAL, TableMirror
+
+
+# Airtable API root; overridable (e.g. a local fake server) via secrets [airtable] endpoint_url
+AIRTABLE_ENDPOINT_URL = "https://api.airtable.com"
+
+# Records per request accepted by Airtable's batch endpoints
+AIRTABLE_BATCH_SIZE = 10
+
+# Tables fetched at the same time by AirtableManager.fetch_tables
+AIRTABLE_FETCH_WORKERS = 4
+
+# Keep-alive connections held open to the Airtable API
+AIRTABLE_MAX_CONNECTIONS = 10
+
+# Records per DataFrame chunk yielded by AirtableManager.iter_table_chunks
+STREAM_CHUNK_RECORDS = 1000
+
+
+@st.cache_resource(show_spinner=False)
+def get_shared_api(api_key: str, endpoint_url: str = AIRTABLE_ENDPOINT_URL) -> Api:
+    """
+    Airtable client shared by every manager and session using this API key and endpoint.
+
+    Its session reuses a pool of keep-alive connections, waits on the
+    per-base rate limiter before each request, and retries throttled and
+    failed requests itself (pyairtable's own urllib3 retries are turned off
+    so they do not bypass the limiter and circuit breaker).
+    """
+    api = Api(api_key, retry_strategy=None, endpoint_url=endpoint_url)
+    adapter = RateLimitedAdapter(pool_connections=AIRTABLE_MAX_CONNECTIONS,
+                                 pool_maxsize=AIRTABLE_MAX_CONNECTIONS)
+    api.session.mount("https://", adapter)
+    api.session.mount("http://", adapter)
+    return api
+
+
+@st.cache_resource(show_spinner=False)
+def get_table_cache(ttl: float = TABLE_CACHE_TTL, max_bytes: int = TABLE_CACHE_MAX_BYTES) -> TableCache:
+    """Table cache shared by every manager and session with these settings."""
+    return TableCache(ttl=ttl, max_bytes=max_bytes)
+
+
+def records_to_dataframe(records: List[Dict[str, Any]], fields: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Turn Airtable records into a DataFrame of their fields plus an 'id' column.
+
+    Airtable leaves empty fields out of a record, so when specific fields
+    were requested, missing ones are added as empty columns.
+    """
+    if not records and not fields:
+        return pd.DataFrame()
+    data = []
+    for record in records:
+        row = record['fields'].copy()
+        row['id'] = record['id']  # Add record ID
+        data.append(row)
+    df = pd.DataFrame(data)
+    if fields:
+        for field in fields:
+            if field not in df.columns:
+                df[field] = pd.Series(np.nan, index=df.index, dtype=object)
+        if 'id' not in df.columns:
+            df['id'] = pd.Series(dtype=object)
+    return df
+
+
+def concat_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Combine the DataFrame chunks of one table, consuming them.
+
+    Columns are combined one at a time and removed from the chunks as they
+    go, so the chunks are freed while the table is built instead of both
+    being held in full. The result equals pd.concat(chunks, ignore_index=True).
+
+    Args:
+        chunks: DataFrames in row order; the list is emptied
+
+    Returns:
+        The whole table
+    """
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks.pop()
+    starts = np.cumsum([0] + [len(chunk) for chunk in chunks])
+    index = pd.RangeIndex(starts[-1])
+    columns = list(dict.fromkeys(column for chunk in chunks for column in chunk.columns))
+    data = {}
+    for column in columns:
+        parts = [chunk.pop(column).set_axis(pd.RangeIndex(start, start + len(chunk)))
+                 for chunk, start in zip(chunks, starts) if column in chunk.columns]
+        combined = pd.concat(parts)
+        del parts
+        # Rows of chunks without this field (Airtable omits empty fields) become missing values
+        data[column] = combined if len(combined) == len(index) else combined.reindex(index)
+    chunks.clear()
+    return pd.DataFrame(data, index=index)
+
+
+def formula_string(value: str) -> str:
+    """Quote a value as an Airtable formula string literal."""
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def any_of_formula(field: str, values: Sequence[Any]) -> str:
+    """
+    Airtable formula matching records whose field equals any of the values.
+
+    Args:
+        field: Field name
+        values: Accepted values, compared as text
+
+    Returns:
+        Formula for the filterByFormula parameter, e.g. OR({account_id}='4000', {account_id}='4100')
+    """
+    return "OR(" + ", ".join(f"{{{field}}}={formula_string(value)}" for value in values) + ")"
+
+
+@dataclass(frozen=True)
+class TableQuery:
+    """
+    A table fetch, optionally narrowed on Airtable's side.
+
+    Only the requested fields, the records matching the formula and at most
+    max_records of them (in sort order) are downloaded. Queries are
+    hashable and part of the table cache key.
+    """
+    table_name: str
+    fields: Optional[Tuple[str, ...]] = None
+    formula: Optional[str] = None
+    # Field names, prefixed with "-" for descending order
+    sort: Optional[Tuple[str, ...]] = None
+    max_records: Optional[int] = None
+
+    def __post_init__(self):
+        # Accept lists but store tuples, so queries stay hashable
+        for name in ("fields", "sort"):
+            value = getattr(self, name)
+            if value is not None and not isinstance(value, tuple):
+                object.__setattr__(self, name, tuple(value))
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """Keyword arguments for pyairtable's Table.all and Table.iterate."""
+        options = {}
+        if self.fields:
+            options["fields"] = list(self.fields)
+        if self.formula:
+            options["formula"] = self.formula
+        if self.sort:
+            options["sort"] = list(self.sort)
+        if self.max_records:
+            options["max_records"] = self.max_records
+        return options
+
+    @property
+    def variant(self) -> tuple:
+        """Table cache variant of this query; () for the whole table."""
+        return tuple((name, tuple(value) if isinstance(value, list) else value)
+                     for name, value in self.options.items())
+
+    @property
+    def filtered(self) -> bool:
+        """Whether Airtable selects or orders the records (not only the fields)."""
+        return bool(self.formula or self.sort or self.max_records)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one record in a batch operation."""
+    index: int
+    record_id: Optional[str] = None
+    error: Optional[str] = None
+    created: bool = False
+    # Airtable refused the record as invalid (HTTP 422): sending it again will fail again,
+    # while other errors (timeouts, outages) may succeed on a later attempt
+    rejected: bool = False
+
+    @property
+    def success(self) -> bool:
+        """Whether the record was written (or deleted)."""
+        return self.error is None
+
+
+def is_validation_error(error: Exception) -> bool:
+    """
+    Whether Airtable rejected a request as invalid (HTTP 422).
+
+    Such a request changed nothing, so its records can safely be sent again
+    one by one to find the offending ones. Timeouts, server errors and
+    unreadable responses give no such guarantee.
+    """
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 422
+
+
+def upsert_rows(df: pd.DataFrame, records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Replace the rows of records already in a table DataFrame and append the others.
+
+    Args:
+        df: Table DataFrame with an 'id' column
+        records: Airtable records as returned by create or update
+
+    Returns:
+        New DataFrame; replaced rows keep their position
+    """
+    new = records_to_dataframe(records)
+    if df.empty or 'id' not in df.columns:
+        return pd.concat([df, new], ignore_index=True) if not df.columns.empty else new
+
+    replaced = df['id'].isin(new['id']).to_numpy()
+    positions = pd.Series(np.arange(len(df)), index=df['id'].to_numpy())
+    new_positions = np.array(new['id'].map(positions), dtype=float)
+    appended = np.isnan(new_positions)
+    new_positions[appended] = len(df) + np.arange(appended.sum())
+
+    combined = pd.concat([
+        df[~replaced].assign(_position=np.flatnonzero(~replaced)),
+        new.assign(_position=new_positions)
+    ], ignore_index=True)
+    return combined.sort_values('_position', kind='stable').drop(columns='_position').reset_index(drop=True)
+
+
+def drop_rows(df: pd.DataFrame, record_ids: List[str]) -> pd.DataFrame:
+    """Remove the rows of deleted records from a table DataFrame."""
+    if 'id' not in df.columns:
+        return df
+    return df[~df['id'].isin(record_ids)].reset_index(drop=True)
 
 
 class AirtableManager:
     """Manager class for Airtable operations."""
     
-    def __init__(self, api_key: str = None, base_id: str = None):
+    def __init__(self, api_key: str = None, base_id: str = None, mirror_dir: Optional[str] = None,
+                 full_sync_interval: float = FULL_SYNC_INTERVAL, cache: Optional[TableCache] = None,
+                 endpoint_url: Optional[str] = None):
         """
         Initialize Airtable manager.
         
         Args:
             api_key: Airtable API key. If None, will try to get from secrets.
             base_id: Airtable base ID. If None, will try to get from secrets.
+            mirror_dir: Directory of local table mirrors. If set, tables are
+                synced incrementally into it and read from it.
+            full_sync_interval: Seconds between full downloads of a mirrored table
+            cache: Table cache. If None, the cache shared by all sessions is used.
+            endpoint_url: Airtable API root. If None, taken from secrets or the public API.
         """
         self.api_key = api_key or self._get_api_key()
         self.base_id = base_id or self._get_base_id()
+        self.mirror_dir = mirror_dir
+        self.full_sync_interval = full_sync_interval
+        self.endpoint_url = endpoint_url or self._get_endpoint_url()
+        self.cache = cache if cache is not None else get_table_cache()
         self.api = None
         
         if self.api_key and self.base_id:
-            self.api = Api(self.api_key)
+            self.api = get_shared_api(self.api_key, self.endpoint_url)
+    
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "AirtableManager":
+        """
+        Create a manager configured by the app's custom settings.
+
+        Args:
+            settings: AppConfig.custom_settings
+
+        Returns:
+            AirtableManager using the configured mirror and table cache
+        """
+        return cls(
+            mirror_dir=settings.get("airtable_mirror_dir"),
+            full_sync_interval=settings.get("airtable_full_sync_hours", 24) * 3600,
+            cache=get_table_cache(
+                ttl=settings.get("airtable_cache_ttl_seconds", TABLE_CACHE_TTL),
+                max_bytes=settings.get("airtable_cache_max_mb", TABLE_CACHE_MAX_BYTES // (1024 * 1024)) * 1024 * 1024
+            )
+        )
     
     def _get_api_key(self) -> Optional[str]:
         """Get API key from Streamlit secrets."""
@@ -44,54 +313,223 @@ class AirtableManager:
         except Exception:
             return None
     
-    @st.cache_data
-    def get_table_data(_self, table_name: str, cache_key: str = None) -> pd.DataFrame:
+    def _get_endpoint_url(self) -> str:
+        """Get the API root from Streamlit secrets, defaulting to Airtable's public API."""
+        try:
+            return st.secrets.get("airtable", {}).get("endpoint_url") or AIRTABLE_ENDPOINT_URL
+        except Exception:
+            return AIRTABLE_ENDPOINT_URL
+    
+    def mirror(self, table_name: str) -> TableMirror:
+        """
+        Local mirror of a table in mirror_dir.
+
+        Args:
+            table_name: Name of the Airtable table
+        """
+        return TableMirror(self.api, self.base_id, table_name, self.mirror_dir, self.full_sync_interval)
+
+    def fetch_table(self, query: Union[str, TableQuery]) -> pd.DataFrame:
+        """
+        Fetch records from a table, without caching.
+
+        With a mirror_dir, only the records changed since the last sync are
+        downloaded and the table is read from its local mirror; queries
+        with a formula, sort or record limit always go to Airtable.
+
+        Args:
+            query: Name of the Airtable table, or a TableQuery
+
+        Returns:
+            pandas DataFrame with table records
+
+        Raises:
+            Exception: If the fetch fails; throttled and temporarily failing
+                requests have already been retried by the shared session
+        """
+        return concat_chunks(list(self.iter_table_chunks(self._as_query(query))))
+
+    def iter_table_chunks(self, query: Union[str, TableQuery],
+                          chunk_records: int = STREAM_CHUNK_RECORDS) -> Iterator[pd.DataFrame]:
+        """
+        Fetch a table page by page, yielding DataFrame chunks as they arrive.
+
+        The first page (up to 100 records) is yielded on its own so a page
+        can show it right away; later pages are grouped into chunks of about
+        chunk_records records. Only one chunk of record dictionaries is held
+        at a time, instead of a list of every record. Nothing is cached.
+
+        With a mirror_dir, unfiltered queries stream the pages of a full
+        sync as they are stored, or sync the changes and read the mirror in
+        chunks.
+
+        Args:
+            query: Name of the Airtable table, or a TableQuery
+            chunk_records: Records per chunk after the first
+
+        Yields:
+            DataFrames with the columns get_table_data would return (at
+            least one, empty for an empty table)
+        """
+        query = self._as_query(query)
+        if not self.api:
+            return
+
+        # The mirror holds every field, so its rows are cut down to the requested ones
+        def project(chunk: pd.DataFrame) -> pd.DataFrame:
+            return chunk.reindex(columns=[*query.fields, 'id']) if query.fields else chunk
+
+        if self.mirror_dir and not query.filtered:
+            mirror = self.mirror(query.table_name)
+            if not mirror.needs_full_sync():
+                mirror.sync(full=False)
+                chunks = mirror.iter_chunks(chunk_records)
+                first = next(chunks, pd.DataFrame())
+                for chunk in itertools.chain([first], chunks):
+                    yield project(chunk)
+                return
+            pages = mirror.sync_pages(full=True)
+            from_mirror = True
+        else:
+            pages = self.api.table(self.base_id, query.table_name).iterate(**query.options)
+            from_mirror = False
+
+        def to_frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+            df = records_to_dataframe(records, query.fields)
+            return project(df) if from_mirror else df
+
+        batch = []
+        yielded = False
+        for page in pages:
+            batch.extend(page)
+            if not yielded or len(batch) >= chunk_records:
+                yield to_frame(batch)
+                batch = []
+                yielded = True
+        if batch or not yielded:
+            yield to_frame(batch)
+
+    def fetch_tables(self, queries: Sequence[Union[str, TableQuery]],
+                     max_workers: Optional[int] = None) -> Tuple[Dict[Any, pd.DataFrame], Dict[Any, str]]:
+        """
+        Fetch several tables (or queries) concurrently, without caching.
+
+        Each table's pages still arrive one after another (Airtable pages
+        are chained by offset), but the tables overlap, so the total time is
+        close to that of the slowest table. Requests share the connection
+        pool and per-base rate limit of the shared client.
+
+        Args:
+            queries: Table names and/or TableQuery objects
+            max_workers: Tables fetched at the same time (default: AIRTABLE_FETCH_WORKERS)
+
+        Returns:
+            Tuple of (DataFrame per query, error message per failed query),
+            keyed by the given names or queries; a failed query gets an
+            empty DataFrame
         """
-        Fetch all records from a specific table and return as DataFrame.
+        queries = list(dict.fromkeys(queries))
+        if not self.api or not queries:
+            return {query: pd.DataFrame() for query in queries}, {}
+
+        workers = max(1, min(len(queries), max_workers or AIRTABLE_FETCH_WORKERS))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="airtable-fetch") as executor:
+            futures = {query: executor.submit(self.fetch_table, query) for query in queries}
+
+        frames = {}
+        errors = {}
+        for query, future in futures.items():
+            try:
+                frames[query] = future.result()
+            except Exception as e:
+                frames[query] = pd.DataFrame()
+                errors[query] = str(e)
+        return frames, errors
+
+    @staticmethod
+    def _show_fetch_error(table_name: str, error_msg: str):
+        """Report a failed table fetch on the page."""
+        st.error(f"Error fetching data from Airtable table '{table_name}': {error_msg}")
+        if "403" in error_msg:
+            st.warning("💡 **Troubleshooting tip**: This might be a temporary API issue. Try refreshing the page or clearing the cache.")
+
+    @staticmethod
+    def _as_query(query: Union[str, TableQuery]) -> TableQuery:
+        """Turn a table name into a query for the whole table."""
+        return TableQuery(query) if isinstance(query, str) else query
+
+    def get_table_data(self, table_name: str, fields: Optional[Sequence[str]] = None,
+                       formula: Optional[str] = None, sort: Optional[Sequence[str]] = None,
+                       max_records: Optional[int] = None) -> pd.DataFrame:
+        """
+        Fetch records from a specific table and return as DataFrame.
+
+        The optional arguments are passed to Airtable, so only what the page
+        needs is downloaded. Tables are served from the shared table cache
+        (keyed by table and query) while fresh; failed fetches are reported
+        and not cached.
         
         Args:
             table_name: Name of the Airtable table
-            cache_key: Optional cache key to force refresh (use timestamp)
+            fields: Only return these fields
+            formula: Only return records matching this Airtable formula
+            sort: Field names to sort by, prefixed with "-" for descending order
+            max_records: Return at most this many records
             
         Returns:
             pandas DataFrame with table records
         """
-        if not _self.api:
+        if not self.api:
             return pd.DataFrame()
+
+        query = TableQuery(table_name, fields, formula, sort, max_records)
+        df = self.cache.get(self.base_id, table_name, query.variant)
+        if df is not None:
+            return df
         
-        # Retry logic for API calls
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                table = _self.api.table(_self.base_id, table_name)
-                records = table.all()
-                
-                if records:
-                    # Extract fields from records
-                    data = []
-                    for record in records:
-                        row = record['fields'].copy()
-                        row['id'] = record['id']  # Add record ID
-                        data.append(row)
-                    
-                    return pd.DataFrame(data)
-                else:
-                    return pd.DataFrame()
-                    
-            except Exception as e:
-                error_msg = str(e)
-                if "403" in error_msg and attempt < max_retries - 1:
-                    # Wait before retry for 403 errors
-                    import time
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                    continue
-                else:
-                    st.error(f"Error fetching data from Airtable table '{table_name}': {error_msg}")
-                    if "403" in error_msg:
-                        st.warning("💡 **Troubleshooting tip**: This might be a temporary API issue. Try refreshing the page or clearing the cache.")
-                    return pd.DataFrame()
-        
-        return pd.DataFrame()
+        try:
+            df = self.fetch_table(query)
+        except Exception as e:
+            self._show_fetch_error(table_name, str(e))
+            return pd.DataFrame()
+        self.cache.put(self.base_id, table_name, df, query.variant)
+        return df
+
+    def get_tables_data(self, queries: Sequence[Union[str, TableQuery]],
+                        max_workers: Optional[int] = None) -> Dict[Any, pd.DataFrame]:
+        """
+        Fetch several tables (or queries) concurrently and return a DataFrame per item.
+
+        Only items missing from the table cache are fetched. Errors are
+        reported here, on the script thread, since the worker threads have
+        no Streamlit script context.
+
+        Args:
+            queries: Table names and/or TableQuery objects
+            max_workers: Tables fetched at the same time (default: AIRTABLE_FETCH_WORKERS)
+
+        Returns:
+            Dictionary keyed by the given names or queries (empty DataFrames for failures)
+        """
+        queries = list(dict.fromkeys(queries))
+        if not self.api:
+            return {query: pd.DataFrame() for query in queries}
+
+        frames = {}
+        for query in queries:
+            table_query = self._as_query(query)
+            frames[query] = self.cache.get(self.base_id, table_query.table_name, table_query.variant)
+        missing = [query for query, df in frames.items() if df is None]
+        if missing:
+            fetched, errors = self.fetch_tables(missing, max_workers)
+            for query, df in fetched.items():
+                frames[query] = df
+                if query not in errors:
+                    table_query = self._as_query(query)
+                    self.cache.put(self.base_id, table_query.table_name, df, table_query.variant)
+            for query, error_msg in errors.items():
+                self._show_fetch_error(self._as_query(query).table_name, error_msg)
+        return frames
     
     def get_table_data_fresh(self, table_name: str) -> pd.DataFrame:
         """
@@ -103,18 +541,29 @@ class AirtableManager:
         Returns:
             pandas DataFrame with table records
         """
-        import time
-        # Use timestamp as cache key to force fresh data
-        cache_key = f"{table_name}_{int(time.time())}"
-        return self.get_table_data(table_name, cache_key)
+        self.cache.invalidate(self.base_id, table_name)
+        return self.get_table_data(table_name)
     
-    def clear_cache(self):
-        """Clear the cache for get_table_data."""
-        self.get_table_data.clear()
+    def clear_cache(self, table_name: Optional[str] = None):
+        """
+        Drop cached tables of this base.
+
+        Args:
+            table_name: Table to drop, or None for every table of the base
+        """
+        self.cache.invalidate(self.base_id, table_name)
     
     def clear_all_cache(self):
-        """Clear all Streamlit caches."""
-        st.cache_data.clear()
+        """Drop every cached table, of every base."""
+        self.cache.clear()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit, miss, eviction and size counters of the table cache."""
+        return self.cache.stats()
+
+    def client_metrics(self) -> Dict[str, Any]:
+        """Request, throttling, retry and circuit breaker counters of this base."""
+        return base_guard(self.base_id).metrics()
     
     def get_table_names(self) -> List[str]:
         """
@@ -168,7 +617,8 @@ class AirtableManager:
         
         try:
             table = self.api.table(self.base_id, table_name)
-            table.create(fields)
+            record = table.create(fields)
+            self.cache.patch(self.base_id, table_name, lambda df: upsert_rows(df, [record]))
             return True
         except Exception as e:
             st.error(f"Error adding record to table '{table_name}': {str(e)}")
@@ -191,7 +641,8 @@ class AirtableManager:
         
         try:
             table = self.api.table(self.base_id, table_name)
-            table.update(record_id, fields)
+            record = table.update(record_id, fields)
+            self.cache.patch(self.base_id, table_name, lambda df: upsert_rows(df, [record]))
             return True
         except Exception as e:
             st.error(f"Error updating record in table '{table_name}': {str(e)}")
@@ -214,11 +665,192 @@ class AirtableManager:
         try:
             table = self.api.table(self.base_id, table_name)
             table.delete(record_id)
+            self._drop_from_mirror(table_name, [record_id])
+            self.cache.patch(self.base_id, table_name, lambda df: drop_rows(df, [record_id]))
             return True
         except Exception as e:
             st.error(f"Error deleting record from table '{table_name}': {str(e)}")
             return False
     
+    def _drop_from_mirror(self, table_name: str, record_ids: List[str]):
+        """Remove deleted records from the table's mirror, which delta syncs cannot do."""
+        if not self.mirror_dir or not record_ids:
+            return
+        try:
+            self.mirror(table_name).delete(record_ids)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not remove deleted records from the mirror of '{table_name}': {e}")
+
+    def _run_batches(self, table_name: str, items: List[Any],
+                     send: Callable[[Any, List[Any]], List[Tuple[str, bool]]],
+                     on_batch: Optional[Callable[[List[BatchResult]], None]] = None,
+                     deletes: bool = False,
+                     check: Optional[Callable[[Any], Optional[str]]] = None) -> List[BatchResult]:
+        """
+        Send items in batches of AIRTABLE_BATCH_SIZE and collect per-record results.
+
+        A batch rejected as invalid is retried record by record, so one bad
+        record does not fail the other nine. Any other error fails the batch
+        (and, during such a retry, the records not sent yet).
+
+        Args:
+            table_name: Name of the Airtable table
+            items: Payload items, one per record
+            send: send(table, chunk) performs one request and returns a
+                (record id, created) pair per item
+            on_batch: Optional callback receiving the results of each batch
+            deletes: Whether the items are deleted record IDs, removed from
+                the table's mirror once Airtable confirms them
+            check: Optional check(item) returning why an item would be
+                rejected, or None; such items are not sent and fail as rejected
+
+        Returns:
+            One BatchResult per item, in input order
+        """
+        if not self.api:
+            return [BatchResult(index, error="Airtable is not configured") for index in range(len(items))]
+
+        table = self.api.table(self.base_id, table_name)
+        results = []
+        try:
+            for start in range(0, len(items), AIRTABLE_BATCH_SIZE):
+                chunk = items[start:start + AIRTABLE_BATCH_SIZE]
+                batch_results = []
+                indexes = []
+                for offset, item in enumerate(chunk):
+                    problem = check(item) if check is not None else None
+                    if problem:
+                        batch_results.append(BatchResult(start + offset, error=problem, rejected=True))
+                    else:
+                        indexes.append(start + offset)
+                if indexes:
+                    batch_results.extend(self._send_batch(table, [items[index] for index in indexes], indexes, send))
+                batch_results.sort(key=lambda result: result.index)
+
+                results.extend(batch_results)
+                if deletes:
+                    self._drop_from_mirror(table_name, [result.record_id for result in batch_results if result.success])
+                if on_batch is not None:
+                    on_batch(batch_results)
+        finally:
+            # Patching a cached table batch by batch would copy it once per batch
+            if items:
+                self.cache.invalidate(self.base_id, table_name)
+        return results
+
+    @staticmethod
+    def _send_batch(table, chunk: List[Any], indexes: List[int],
+                    send: Callable[[Any, List[Any]], List[Tuple[str, bool]]]) -> List[BatchResult]:
+        """Send one batch, retrying it record by record if Airtable rejects it as invalid."""
+        try:
+            return [
+                BatchResult(index, record_id=record_id, created=created)
+                for index, (record_id, created) in zip(indexes, send(table, chunk))
+            ]
+        except Exception as e:
+            if len(chunk) == 1 or not is_validation_error(e):
+                rejected = is_validation_error(e)
+                return [BatchResult(index, error=str(e), rejected=rejected) for index in indexes]
+
+        batch_results = []
+        for position, (index, item) in enumerate(zip(indexes, chunk)):
+            try:
+                (record_id, created), = send(table, [item])
+                batch_results.append(BatchResult(index, record_id=record_id, created=created))
+            except Exception as item_error:
+                if is_validation_error(item_error):
+                    batch_results.append(BatchResult(index, error=str(item_error), rejected=True))
+                    continue
+                # Not a rejection: the rest of the batch is left unsent
+                batch_results.extend(BatchResult(rest, error=str(item_error)) for rest in indexes[position:])
+                break
+        return batch_results
+
+    def batch_create(self, table_name: str, records: List[Dict[str, Any]], typecast: bool = False,
+                     on_batch: Optional[Callable[[List[BatchResult]], None]] = None) -> List[BatchResult]:
+        """
+        Create records, 10 per request.
+
+        Args:
+            table_name: Name of the Airtable table
+            records: Field dictionaries of the new records
+            typecast: Let Airtable convert values to the field types
+            on_batch: Optional callback receiving the results of each batch
+
+        Returns:
+            One BatchResult per record, with the new record ID on success
+        """
+        def send(table, chunk):
+            return [(record["id"], True) for record in table.batch_create(chunk, typecast=typecast)]
+
+        return self._run_batches(table_name, records, send, on_batch)
+
+    def batch_update(self, table_name: str, records: List[Dict[str, Any]], typecast: bool = False,
+                     on_batch: Optional[Callable[[List[BatchResult]], None]] = None) -> List[BatchResult]:
+        """
+        Update records, 10 per request.
+
+        Args:
+            table_name: Name of the Airtable table
+            records: Dictionaries with the record "id" and the "fields" to update
+            typecast: Let Airtable convert values to the field types
+            on_batch: Optional callback receiving the results of each batch
+
+        Returns:
+            One BatchResult per record
+        """
+        def send(table, chunk):
+            return [(record["id"], False) for record in table.batch_update(chunk, typecast=typecast)]
+
+        return self._run_batches(table_name, records, send, on_batch)
+
+    def batch_delete(self, table_name: str, record_ids: List[str],
+                     on_batch: Optional[Callable[[List[BatchResult]], None]] = None) -> List[BatchResult]:
+        """
+        Delete records, 10 per request.
+
+        Args:
+            table_name: Name of the Airtable table
+            record_ids: IDs of the records to delete
+            on_batch: Optional callback receiving the results of each batch
+
+        Returns:
+            One BatchResult per record ID
+        """
+        def send(table, chunk):
+            return [(record["id"], False) for record in table.batch_delete(chunk)]
+
+        return self._run_batches(table_name, record_ids, send, on_batch, deletes=True)
+
+    def batch_upsert(self, table_name: str, records: List[Dict[str, Any]], key_fields: List[str],
+                     typecast: bool = False,
+                     on_batch: Optional[Callable[[List[BatchResult]], None]] = None) -> List[BatchResult]:
+        """
+        Update records matching on key_fields, creating those without a match, 10 per request.
+
+        Args:
+            table_name: Name of the Airtable table
+            records: Field dictionaries; each must contain every key field
+            key_fields: Fields Airtable matches existing records on
+            typecast: Let Airtable convert values to the field types
+            on_batch: Optional callback receiving the results of each batch
+
+        Returns:
+            One BatchResult per record; created tells new records from updated ones.
+            Records missing a key field are not sent and fail as rejected.
+        """
+        def send(table, chunk):
+            response = table.batch_upsert([{"fields": fields} for fields in chunk], key_fields, typecast=typecast)
+            created_ids = set(response["createdRecords"])
+            return [(record["id"], record["id"] in created_ids) for record in response["records"]]
+
+        def check(fields):
+            # pyairtable refuses the whole batch before sending if one record lacks a key field
+            missing = [key for key in key_fields if key not in fields]
+            return f"Missing key fields: {', '.join(missing)}" if missing else None
+
+        return self._run_batches(table_name, records, send, on_batch, check=check)
+    
     def is_configured(self) -> bool:
         """
         Check if Airtable is properly configured.
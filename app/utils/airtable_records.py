@@ -0,0 +1,160 @@
+"""
+Airtable Record Conversion Utilities for App
+
+Turns a DataFrame (e.g. an uploaded CSV) into Airtable field dictionaries
+column by column: each column's target type is inferred once and its
+values are coerced with vectorized pandas operations.
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List
+
+
+# Column kinds inferred by RecordConverter.column_kind
+NUMBER = "number"
+CHECKBOX = "checkbox"
+DATETIME = "datetime"
+TEXT = "text"
+MIXED = "mixed"
+
+
+def parse_json_list(value: str) -> Any:
+    """Parse a JSON list (e.g. linked record IDs), keeping the text if it is not valid JSON."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def convert_cell(value: Any) -> Any:
+    """Convert one cell of a column mixing value types."""
+    if isinstance(value, str):
+        stripped = value.strip()
+        if stripped.startswith('[') and stripped.endswith(']'):
+            return parse_json_list(value)
+        return value
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return value.item() if isinstance(value, np.generic) else value
+    if hasattr(value, 'isoformat'):  # datetime objects
+        return value.isoformat()
+    return str(value)
+
+
+class RecordConverter:
+    """Utility class for converting DataFrames to Airtable records."""
+
+    @staticmethod
+    def column_kind(column: pd.Series) -> str:
+        """
+        Infer the Airtable value type of a column.
+
+        Args:
+            column: DataFrame column
+
+        Returns:
+            One of NUMBER, CHECKBOX, DATETIME, TEXT or MIXED
+        """
+        if pd.api.types.is_bool_dtype(column):
+            return CHECKBOX
+        if pd.api.types.is_numeric_dtype(column):
+            return NUMBER
+        if pd.api.types.is_datetime64_any_dtype(column):
+            return DATETIME
+        if pd.api.types.is_string_dtype(column) and pd.api.types.infer_dtype(column, skipna=True) in ("string", "empty"):
+            return TEXT
+        return MIXED
+
+    @staticmethod
+    def convert_column(column: pd.Series, kind: str) -> pd.Series:
+        """
+        Coerce a column to the Python values sent to Airtable.
+
+        Text cells holding a JSON list (e.g. '["rec1", "rec2"]') become lists,
+        datetimes become ISO 8601 strings and missing values stay missing.
+
+        Args:
+            column: DataFrame column
+            kind: Column kind from column_kind
+
+        Returns:
+            Object Series of Python values, NaN where the value is missing
+        """
+        present = column.notna()
+        if kind == DATETIME:
+            if isinstance(column.dtype, pd.DatetimeTZDtype):
+                text = column.dt.tz_convert("UTC").dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+            else:
+                text = column.dt.strftime("%Y-%m-%dT%H:%M:%S")
+            return text.astype(object).where(present)
+
+        if kind == TEXT:
+            values = column.astype(object).where(present)
+            stripped = column.str.strip()
+            is_list = (stripped.str.startswith('[') & stripped.str.endswith(']')).fillna(False).to_numpy(dtype=bool)
+            if is_list.any():
+                parsed = [parse_json_list(value) for value in values[is_list].tolist()]
+                values[is_list] = pd.Series(parsed, index=values.index[is_list], dtype=object)
+            return values
+
+        if kind in (NUMBER, CHECKBOX):
+            # astype(object) yields Python ints, floats and bools
+            return column.astype(object).where(present)
+
+        return column.map(convert_cell, na_action="ignore").astype(object).where(present)
+
+    @staticmethod
+    def to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Convert a DataFrame to Airtable field dictionaries, one per row.
+
+        Missing values are left out of each record. Rows are grouped by which
+        of their fields are present, so each group's records are zipped from
+        the same column lists without testing values row by row.
+
+        Args:
+            df: DataFrame to convert
+
+        Returns:
+            List of field dictionaries in row order
+        """
+        if df.empty:
+            return [{} for _ in range(len(df))]
+
+        columns = df.columns.tolist()
+        values = [
+            RecordConverter.convert_column(df[col], RecordConverter.column_kind(df[col])).to_numpy(dtype=object)
+            for col in columns
+        ]
+        present = np.column_stack([pd.notna(column) for column in values])
+
+        # One integer code per combination of present fields
+        if len(columns) < 63:
+            codes = present.astype(np.int64) @ (np.int64(1) << np.arange(len(columns), dtype=np.int64))
+        else:
+            codes = np.unique(np.packbits(present, axis=1), axis=0, return_inverse=True)[1].ravel()
+        order = np.argsort(codes, kind="stable")
+        group_starts = np.flatnonzero(np.diff(codes[order])) + 1
+
+        # Build the records group by group, then put them back in row order
+        ordered_records = []
+        for rows in np.split(order, group_starts):
+            fields = np.flatnonzero(present[rows[0]])
+            names = [columns[field] for field in fields]
+            field_values = [values[field][rows].tolist() for field in fields]
+            if names:
+                ordered_records.extend(dict(zip(names, row)) for row in zip(*field_values))
+            else:
+                ordered_records.extend({} for _ in rows)
+
+        records = np.empty(len(df), dtype=object)
+        records[order] = ordered_records
+        return records.tolist()
+
+
+def dataframe_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a DataFrame to Airtable field dictionaries, one per row."""
+    return RecordConverter.to_records(df)
@@ -0,0 +1,117 @@
+"""
+Background Parse Utilities for App
+
+Runs the full parse of uploaded exports in a worker thread, so a page can
+show a preview of the first visits right away and poll for progress until
+the complete dataset is ready.
+"""
+
+import io
+import threading
+import traceback
+import pandas as pd
+from typing import Callable, List, Optional, Tuple
+
+from .html_processor import HTMLProcessor
+
+
+class ProgressReader(io.BytesIO):
+    """In-memory binary stream that records how far it has been read."""
+
+    def __init__(self, content: bytes):
+        """Wrap export bytes; BytesIO shares the buffer of bytes objects instead of copying."""
+        super().__init__(content)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        """Read like BytesIO and remember the position reached."""
+        data = super().read(size)
+        self.bytes_read = self.tell()
+        return data
+
+
+class BackgroundParse:
+    """
+    Parse and merge several uploaded exports in a worker thread.
+
+    The worker must not call Streamlit display functions: it has no script
+    run context, so errors are collected in self.errors for the page to show.
+    """
+
+    def __init__(self, key: tuple, uploads: List[Tuple[str, bytes, str]],
+                 parse_file: Callable, merge_files: Callable):
+        """
+        Prepare a background parse.
+
+        Args:
+            key: Identifies the uploads (e.g. their content hashes)
+            uploads: List of (file name, content, content hash)
+            parse_file: parse_file(file object, content hash, file name) -> DataFrame or None
+            merge_files: merge_files(frames, content hashes) -> (DataFrame, merge report)
+        """
+        self.key = key
+        self.uploads = uploads
+        self.parse_file = parse_file
+        self.merge_files = merge_files
+        self.total_bytes = sum(len(content) for _, content, _ in uploads) or 1
+        self.completed_bytes = 0
+        self.reader: Optional[ProgressReader] = None
+        self.result = None
+        self.errors: List[str] = []
+        self._thread = threading.Thread(target=self._run, name="background-parse", daemon=True)
+
+    def start(self) -> "BackgroundParse":
+        """Start the worker thread and return self."""
+        self._thread.start()
+        return self
+
+    @property
+    def done(self) -> bool:
+        """Whether the worker has finished (successfully or not)."""
+        return self._thread.ident is not None and not self._thread.is_alive()
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the uploaded bytes read by the parser so far."""
+        if self.done:
+            return 1.0
+        reader = self.reader
+        current = reader.bytes_read if reader is not None else 0
+        return min((self.completed_bytes + current) / self.total_bytes, 1.0)
+
+    def _run(self):
+        """Parse every upload, then merge them as the synchronous path does."""
+        frames = []
+        content_hashes = []
+        try:
+            for name, content, content_hash in self.uploads:
+                self.reader = ProgressReader(content)
+                df = self.parse_file(self.reader, content_hash, name)
+                self.reader = None
+                self.completed_bytes += len(content)
+
+                if df is None:
+                    self.errors.append(f"Error processing file: {name}")
+                    continue
+                frames.append((name, df))
+                content_hashes.append(content_hash)
+
+            if len(frames) > 1:
+                df, merge_report = self.merge_files(frames, tuple(content_hashes))
+                self.result = (df, f"combined_{len(frames)}_files", merge_report)
+            elif frames:
+                self.result = (frames[0][1], frames[0][0], None)
+        except Exception as e:
+            print(f"Warning: Background parse failed:\n{traceback.format_exc()}")
+            self.errors.append(f"Error processing file: {str(e)}")
+
+
+def preview_frame(content: bytes, n_visits: int, backend: str) -> pd.DataFrame:
+    """
+    Parse only the first visits of an export.
+
+    Sections are streamed, so the cost depends on n_visits, not on the size
+    of the export.
+    """
+    batches = HTMLProcessor.iter_visits(content, batch_size=n_visits, backend=backend)
+    return next(batches, HTMLProcessor.records_to_dataframe([]))
@@ -0,0 +1,314 @@
+"""
+Resumable CSV Upload Utilities for App
+
+Uploads a CSV to Airtable in chunks, recording after every acknowledged
+batch how many rows are done in a checkpoint file keyed by the file's
+content hash and the target table. An interrupted import resumes after the
+last committed batch instead of re-sending (and duplicating) every row.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import time
+import pandas as pd
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .airtable import AirtableManager, BatchResult
+from .airtable_records import dataframe_to_records
+from .file_utils import write_atomic
+
+
+DEFAULT_CHECKPOINT_DIR = os.path.join("data", "uploads")
+
+# CSV rows read and converted at a time
+UPLOAD_CHUNK_ROWS = 1000
+
+# CSV rows read at a time while counting rows and inferring column types
+SCAN_CHUNK_ROWS = 50000
+
+
+class UploadInterrupted(Exception):
+    """An upload stopped by an error that may pass (timeout, outage); running it again resumes it."""
+
+    def __init__(self, message: str, checkpoint: "UploadCheckpoint"):
+        super().__init__(message)
+        self.checkpoint = checkpoint
+
+
+def csv_dtype(kinds: set, has_missing: bool) -> Optional[str]:
+    """
+    Dtype a whole CSV column would be read as, from the kinds inferred per chunk.
+
+    Args:
+        kinds: pandas.api.types.infer_dtype results of the column's non-empty chunks
+        has_missing: Whether any cell of the column is empty
+
+    Returns:
+        A dtype for pd.read_csv, or None if the column is empty throughout
+    """
+    if not kinds:
+        return None
+    if kinds == {"integer"}:
+        return "float64" if has_missing else "int64"
+    if kinds <= {"integer", "floating"}:
+        return "float64"
+    if kinds == {"boolean"}:
+        return "boolean" if has_missing else "bool"
+    return "str"
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Format a duration as e.g. '45s', '3m 05s' or '1h 02m'."""
+    if seconds is None:
+        return "unknown"
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+
+@dataclass
+class UploadProgress:
+    """Progress of a running upload."""
+    total_rows: int
+    rows_done: int
+    uploaded: int
+    failed: int
+    resumed_from: int
+    elapsed: float
+
+    @property
+    def fraction(self) -> float:
+        """Share of the CSV rows done, between 0 and 1."""
+        return min(self.rows_done / self.total_rows, 1.0) if self.total_rows else 1.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        """Rows sent per second in this run (rows done before resuming are not counted)."""
+        return (self.rows_done - self.resumed_from) / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated seconds until the upload finishes at the current rate."""
+        if self.rows_per_sec <= 0:
+            return None
+        return (self.total_rows - self.rows_done) / self.rows_per_sec
+
+    def describe(self) -> str:
+        """One-line summary for a progress bar."""
+        return (
+            f"Uploaded {self.rows_done:,} of {self.total_rows:,} rows · "
+            f"{self.rows_per_sec:.0f} rows/s · ETA {format_duration(self.eta_seconds)}"
+        )
+
+
+class UploadCheckpoint:
+    """Progress of one CSV file uploaded to one table, persisted as JSON."""
+
+    def __init__(self, file_hash: str, table_name: str, checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR):
+        """
+        Load the checkpoint for a file and table, or start a new one.
+
+        Args:
+            file_hash: SHA-256 of the CSV content
+            table_name: Target Airtable table
+            checkpoint_dir: Directory holding the checkpoint files
+        """
+        self.file_hash = file_hash
+        self.table_name = table_name
+        self.checkpoint_dir = checkpoint_dir
+        self.rows_committed = 0
+        self.uploaded = 0
+        self.failures: List[Dict[str, Any]] = []
+        self.completed = False
+        self.load()
+
+    @property
+    def path(self) -> str:
+        """Checkpoint file path for this file and table."""
+        safe_table = re.sub(r"[^A-Za-z0-9_.-]", "_", self.table_name)
+        return os.path.join(self.checkpoint_dir, f"{self.file_hash}-{safe_table}.json")
+
+    def load(self) -> None:
+        """Read the stored progress, if any."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable upload checkpoint {self.path}: {e}")
+            return
+        self.rows_committed = data.get("rows_committed", 0)
+        self.uploaded = data.get("uploaded", 0)
+        self.failures = data.get("failures", [])
+        self.completed = data.get("completed", False)
+
+    def save(self) -> None:
+        """Persist the current progress."""
+        data = {
+            "file_hash": self.file_hash,
+            "table_name": self.table_name,
+            "rows_committed": self.rows_committed,
+            "uploaded": self.uploaded,
+            "failures": self.failures,
+            "completed": self.completed,
+            "updated": time.time(),
+        }
+        # Written atomically, so an interruption mid-write never leaves a truncated checkpoint
+        write_atomic(self.path, lambda f: json.dump(data, f, default=str, ensure_ascii=False),
+                     mode="w", encoding="utf-8")
+
+    def clear(self) -> None:
+        """Forget the progress so the next upload starts from the first row."""
+        self.rows_committed = 0
+        self.uploaded = 0
+        self.failures = []
+        self.completed = False
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class ChunkedCsvUploader:
+    """Upload a CSV to an Airtable table in chunks, resuming from its checkpoint."""
+
+    def __init__(self, manager: AirtableManager, table_name: str, content: bytes,
+                 checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR, chunk_rows: int = UPLOAD_CHUNK_ROWS):
+        """
+        Prepare an upload.
+
+        Args:
+            manager: Configured AirtableManager
+            table_name: Target Airtable table
+            content: Raw CSV bytes
+            checkpoint_dir: Directory holding the checkpoint files
+            chunk_rows: CSV rows read and converted at a time
+        """
+        self.manager = manager
+        self.table_name = table_name
+        self.content = content
+        self.chunk_rows = chunk_rows
+        self.file_hash = hashlib.sha256(content).hexdigest()
+        self.checkpoint = UploadCheckpoint(self.file_hash, table_name, checkpoint_dir)
+        self.dtypes: Optional[Dict[str, str]] = None
+
+    def count_rows(self) -> int:
+        """
+        Number of data rows in the CSV (quoted line breaks are handled by the CSV parser).
+
+        Also infers each column's dtype over the whole file into self.dtypes.
+        pandas infers dtypes per chunk, so without them a column holding
+        numbers until a text value further down would be sent as numbers from
+        some chunks and as text from others.
+        """
+        kinds: Dict[str, set] = {}
+        missing: Dict[str, bool] = {}
+        rows = 0
+        for chunk in pd.read_csv(io.BytesIO(self.content), chunksize=SCAN_CHUNK_ROWS):
+            rows += len(chunk)
+            for name in chunk.columns:
+                kind = pd.api.types.infer_dtype(chunk[name], skipna=True)
+                column_kinds = kinds.setdefault(name, set())
+                if kind != "empty":
+                    column_kinds.add(kind)
+                missing[name] = missing.get(name, False) or bool(chunk[name].isna().any())
+        self.dtypes = {
+            name: dtype for name, dtype in
+            ((name, csv_dtype(kinds[name], missing[name])) for name in kinds)
+            if dtype is not None
+        }
+        return rows
+
+    def iter_chunks(self, start_row: int = 0) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """
+        Yield (offset of the first row, rows) for the CSV from start_row on.
+
+        Args:
+            start_row: Number of data rows to skip (already uploaded)
+        """
+        if self.dtypes is None:
+            self.count_rows()
+        position = 0
+        for chunk in pd.read_csv(io.BytesIO(self.content), chunksize=self.chunk_rows, dtype=self.dtypes):
+            chunk_start = position
+            position += len(chunk)
+            if position <= start_row:
+                continue
+            if chunk_start < start_row:
+                chunk = chunk.iloc[start_row - chunk_start:]
+                chunk_start = start_row
+            yield chunk_start, chunk
+
+    def run(self, on_progress: Optional[Callable[[UploadProgress], None]] = None) -> UploadCheckpoint:
+        """
+        Upload the rows not committed yet, checkpointing after every batch.
+
+        A batch interrupted before Airtable acknowledged it is sent again on
+        resume, so at most one batch (10 rows) can be duplicated by a crash.
+
+        Only rows Airtable rejects as invalid are recorded as failures. Any
+        other error (timeout, outage, open circuit) stops the upload at the
+        first row it affected, leaving the checkpoint incomplete so that
+        running the upload again resumes there.
+
+        Args:
+            on_progress: Optional callback receiving an UploadProgress after every batch
+
+        Returns:
+            The final checkpoint, with upload counts and failed rows
+
+        Raises:
+            UploadInterrupted: If a batch failed for a reason other than invalid rows
+        """
+        checkpoint = self.checkpoint
+        total_rows = self.count_rows()
+        resumed_from = checkpoint.rows_committed
+        started = time.monotonic()
+
+        for offset, chunk in self.iter_chunks(checkpoint.rows_committed):
+            records = dataframe_to_records(chunk)
+
+            def on_batch(results: List[BatchResult]):
+                interrupted = None
+                for result in results:
+                    if result.success:
+                        checkpoint.uploaded += 1
+                    elif result.rejected:
+                        checkpoint.failures.append({
+                            "row": offset + result.index + 1,
+                            "error": result.error,
+                            "record": records[result.index]
+                        })
+                    else:
+                        interrupted = result
+                        break
+                    checkpoint.rows_committed = offset + result.index + 1
+                checkpoint.save()
+                if interrupted is not None:
+                    raise UploadInterrupted(
+                        f"Upload stopped at row {offset + interrupted.index + 1}: {interrupted.error}", checkpoint
+                    )
+
+                if on_progress is not None:
+                    on_progress(UploadProgress(
+                        total_rows=total_rows,
+                        rows_done=checkpoint.rows_committed,
+                        uploaded=checkpoint.uploaded,
+                        failed=len(checkpoint.failures),
+                        resumed_from=resumed_from,
+                        elapsed=time.monotonic() - started
+                    ))
+
+            self.manager.batch_create(self.table_name, records, on_batch=on_batch)
+
+        checkpoint.completed = True
+        checkpoint.save()
+        return checkpoint
@@ -0,0 +1,230 @@
+"""
+Data Grid Utilities for App
+
+Paginated, sortable and filterable table view. Sorting and filtering run on
+the server over cached positional indexes, and only the visible page of
+rows is sent to the browser on each rerun.
+"""
+
+import operator
+import re
+import numpy as np
+import pandas as pd
+import streamlit as st
+from typing import List, Optional
+
+from .exports import DataExporter
+
+
+# Sort orders and filter masks kept in the shared Streamlit cache
+GRID_CACHE_ENTRIES = 32
+
+# Rows per page offered by the grid
+PAGE_SIZES = [25, 50, 100, 250, 500]
+
+# Comparison filters accepted on numeric and datetime columns, e.g. ">= 100"
+COMPARISON_RE = re.compile(r"^\s*(>=|<=|!=|>|<|=)\s*(.+?)\s*$")
+COMPARISON_OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    "=": operator.eq,
+}
+
+NO_SORT = "(none)"
+
+# Widget states (key suffixes) reset when the grid is given a different frame;
+# the rows per page are kept
+GRID_STATE = ("columns", "sort", "descending", "filter_column", "filter", "page")
+
+
+class DataGrid:
+    """Utility class for server-side paginated DataFrame views."""
+
+    @staticmethod
+    def sort_order(df: pd.DataFrame, column: str, ascending: bool = True) -> np.ndarray:
+        """
+        Compute the row positions of df sorted by one column.
+
+        The sort is stable and missing values always come last. Columns pandas
+        cannot order (e.g. Airtable fields mixing numbers, text and lists) are
+        sorted by their text representation.
+
+        Args:
+            df: DataFrame to sort
+            column: Column to sort by
+            ascending: Sort direction
+
+        Returns:
+            Array of row positions
+        """
+        values = df[column].reset_index(drop=True)
+        try:
+            ordered = values.sort_values(ascending=ascending, kind="stable", na_position="last")
+        except TypeError:
+            text = values.astype(str).where(values.notna())
+            ordered = text.sort_values(ascending=ascending, kind="stable", na_position="last")
+        return ordered.index.to_numpy()
+
+    @staticmethod
+    def filter_mask(df: pd.DataFrame, column: str, query: str) -> np.ndarray:
+        """
+        Compute which rows of df match a column filter.
+
+        Numeric and datetime columns accept comparisons (">= 100", "< 2025-03-01",
+        "= 4000"); any other query matches rows whose text contains it,
+        ignoring case.
+
+        Args:
+            df: DataFrame to filter
+            column: Column the filter applies to
+            query: Filter text
+
+        Returns:
+            Boolean array aligned with the rows of df
+        """
+        values = df[column]
+        comparison = COMPARISON_RE.match(query)
+        if comparison is not None:
+            if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                target = pd.to_numeric(comparison.group(2), errors="coerce")
+            elif pd.api.types.is_datetime64_any_dtype(values):
+                target = pd.to_datetime(comparison.group(2), errors="coerce")
+            else:
+                target = None
+            if target is not None and not pd.isna(target):
+                compare = COMPARISON_OPERATORS[comparison.group(1)]
+                try:
+                    return (compare(values, target) & values.notna()).to_numpy(dtype=bool)
+                except TypeError:
+                    # e.g. a time-zone-naive date against a time-zone-aware column
+                    pass
+
+        text = values.astype(str).where(values.notna(), "")
+        return text.str.contains(query, case=False, regex=False).to_numpy(dtype=bool)
+
+    @staticmethod
+    def page_positions(n_rows: int, order: Optional[np.ndarray], mask: Optional[np.ndarray],
+                       page: int, page_size: int) -> tuple:
+        """
+        Select the row positions shown on one page.
+
+        Args:
+            n_rows: Number of rows in the DataFrame
+            order: Sorted row positions, or None for the original order
+            mask: Boolean filter mask, or None for all rows
+            page: 1-based page number
+            page_size: Rows per page
+
+        Returns:
+            Tuple of (row positions of the page, number of matching rows)
+        """
+        if order is None:
+            positions = np.flatnonzero(mask) if mask is not None else None
+        else:
+            positions = order[mask[order]] if mask is not None else order
+
+        matching = n_rows if positions is None else len(positions)
+        start = (page - 1) * page_size
+        stop = min(start + page_size, matching)
+        if positions is None:
+            return np.arange(start, stop), matching
+        return positions[start:stop], matching
+
+    @staticmethod
+    def page_count(matching: int, page_size: int) -> int:
+        """Number of pages needed for the matching rows (at least one)."""
+        return max(1, -(-matching // page_size))
+
+    @staticmethod
+    def display(df: pd.DataFrame, key: str, default_columns: Optional[List[str]] = None):
+        """
+        Display a paginated, sortable and filterable view of a DataFrame.
+
+        Args:
+            df: DataFrame to display
+            key: Prefix for the widget keys, unique per page
+            default_columns: Columns shown initially (default: all)
+        """
+        columns = df.columns.tolist()
+        page_key = f"{key}_page"
+
+        # A new frame under the same key (e.g. another table loaded) starts
+        # unsorted and unfiltered: the old filter text and page mean nothing for it
+        fingerprint = DataExporter.session_fingerprint(df)
+        fingerprint_key = f"{key}_fingerprint"
+        if st.session_state.get(fingerprint_key) != fingerprint:
+            for state in GRID_STATE:
+                st.session_state.pop(f"{key}_{state}", None)
+            st.session_state[fingerprint_key] = fingerprint
+
+        def reset_page():
+            st.session_state[page_key] = 1
+
+        show_columns = st.multiselect(
+            "Columns to display:",
+            options=columns,
+            default=default_columns or columns,
+            key=f"{key}_columns"
+        )
+
+        col1, col2, col3, col4 = st.columns([2, 1, 2, 3])
+        with col1:
+            sort_column = st.selectbox("Sort by:", [NO_SORT] + columns, key=f"{key}_sort", on_change=reset_page)
+        with col2:
+            descending = st.toggle("Descending", key=f"{key}_descending", on_change=reset_page)
+        with col3:
+            filter_column = st.selectbox("Filter column:", columns, key=f"{key}_filter_column", on_change=reset_page)
+        with col4:
+            query = st.text_input(
+                "Filter:",
+                key=f"{key}_filter",
+                on_change=reset_page,
+                help="Text to search for, or a comparison such as '>= 100' or '< 2025-03-01' on number and date columns"
+            )
+
+        order = None
+        if sort_column != NO_SORT:
+            order = get_sort_order(df, fingerprint, sort_column, not descending)
+        mask = get_filter_mask(df, fingerprint, filter_column, query) if query else None
+
+        col1, col2, col3 = st.columns([1, 1, 3])
+        with col1:
+            page_size = st.selectbox("Rows per page:", PAGE_SIZES, key=f"{key}_page_size", on_change=reset_page)
+
+        matching = len(df) if mask is None else int(mask.sum())
+        n_pages = DataGrid.page_count(matching, page_size)
+        if st.session_state.get(page_key, 1) > n_pages:
+            st.session_state[page_key] = n_pages
+        with col2:
+            page = st.number_input("Page:", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+        positions, matching = DataGrid.page_positions(len(df), order, mask, int(page), page_size)
+        with col3:
+            start = (int(page) - 1) * page_size
+            summary = f"Page {int(page)} of {n_pages}: rows {start + 1}–{start + len(positions)} of {matching}" if matching else "No matching rows"
+            if mask is not None:
+                summary += f" (filtered from {len(df)})"
+            st.caption(summary)
+
+        page_df = df.iloc[positions]
+        st.dataframe(page_df[show_columns] if show_columns else page_df, use_container_width=True)
+
+
+@st.cache_data(max_entries=GRID_CACHE_ENTRIES, show_spinner=False)
+def get_sort_order(_df: pd.DataFrame, fingerprint: str, column: str, ascending: bool) -> np.ndarray:
+    """Cached sort order, keyed by DataFrame fingerprint, column and direction."""
+    return DataGrid.sort_order(_df, column, ascending)
+
+
+@st.cache_data(max_entries=GRID_CACHE_ENTRIES, show_spinner=False)
+def get_filter_mask(_df: pd.DataFrame, fingerprint: str, column: str, query: str) -> np.ndarray:
+    """Cached filter mask, keyed by DataFrame fingerprint, column and filter text."""
+    return DataGrid.filter_mask(_df, column, query)
+
+
+def data_grid(df: pd.DataFrame, key: str, default_columns: Optional[List[str]] = None):
+    """Display a paginated, sortable and filterable view of a DataFrame."""
+    DataGrid.display(df, key, default_columns)
@@ -0,0 +1,295 @@
+"""
+Export Utilities for App
+
+Builds download files on demand and caches the bytes per DataFrame
+fingerprint and format, so page reruns never pay the export cost.
+"""
+
+import hashlib
+import weakref
+import streamlit as st
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as pa_ipc
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Callable, Dict
+
+
+# Export results kept in the shared Streamlit cache (one per fingerprint and format)
+EXPORT_CACHE_ENTRIES = 16
+
+# DataFrame fingerprints remembered per session
+FINGERPRINT_MEMO_SIZE = 4
+
+# Compression used for Parquet exports and datasets
+PARQUET_COMPRESSION = "zstd"
+
+# Partition column added to year-partitioned Parquet datasets
+YEAR_PARTITION_COLUMN = "year"
+
+# Data rows per Excel sheet (the format allows 1,048,576 rows including the header)
+EXCEL_MAX_DATA_ROWS = 1048575
+
+# Rows converted to Python values at a time by the streaming Excel writer
+EXCEL_CHUNK_ROWS = 10000
+
+
+def to_arrow_table(df: pd.DataFrame) -> pa.Table:
+    """
+    Convert a DataFrame to an Arrow table.
+
+    Object columns Arrow cannot type (e.g. Airtable fields mixing numbers
+    and text) are exported as strings, with missing values kept as null.
+    """
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+
+    df = df.copy()
+    for col in df.columns:
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[col] = df[col].map(lambda value: None if value is None or value != value else str(value))
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def write_csv(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame as UTF-8 CSV."""
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def excel_cell_values(column: pd.Series) -> list:
+    """Convert one column chunk to Python values openpyxl writes as typed cells."""
+    if isinstance(column.dtype, pd.DatetimeTZDtype):
+        # Excel has no time zones; keep the local wall time
+        column = column.dt.tz_localize(None)
+    values = column.astype(object).where(column.notna(), None).tolist()
+    if column.dtype == object:
+        # Airtable linked-record and attachment fields hold lists or dicts
+        values = [str(value) if isinstance(value, (list, dict, tuple, set)) else value for value in values]
+    return values
+
+
+def write_excel_pandas(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame as an Excel workbook through pandas (whole sheet built in memory)."""
+    excel_buffer = BytesIO()
+    df.to_excel(excel_buffer, index=False, engine='openpyxl')
+    return excel_buffer.getvalue()
+
+
+def write_excel(df: pd.DataFrame, max_rows_per_sheet: int = EXCEL_MAX_DATA_ROWS) -> bytes:
+    """
+    Serialize a DataFrame as an Excel workbook, streaming rows into it.
+
+    Uses a write-only openpyxl workbook, so rows are serialized as they are
+    appended instead of keeping a cell object per value. Numbers, booleans
+    and datetimes are written as typed cells. Frames longer than one sheet
+    are continued on Sheet2, Sheet3, ...
+
+    Args:
+        df: DataFrame to export
+        max_rows_per_sheet: Data rows per sheet before starting a new one
+
+    Returns:
+        The .xlsx file as bytes
+    """
+    workbook = Workbook(write_only=True)
+    header_font = Font(bold=True)
+    columns = [str(col) for col in df.columns]
+
+    def new_sheet():
+        sheet = workbook.create_sheet(f"Sheet{len(workbook.worksheets) + 1}")
+        header = []
+        for name in columns:
+            cell = WriteOnlyCell(sheet, value=name)
+            cell.font = header_font
+            header.append(cell)
+        sheet.append(header)
+        return sheet
+
+    sheet = new_sheet()
+    sheet_rows = 0
+    for start in range(0, len(df), EXCEL_CHUNK_ROWS):
+        chunk = df.iloc[start:start + EXCEL_CHUNK_ROWS]
+        for row in zip(*(excel_cell_values(chunk[col]) for col in chunk.columns)):
+            if sheet_rows >= max_rows_per_sheet:
+                sheet = new_sheet()
+                sheet_rows = 0
+            sheet.append(row)
+            sheet_rows += 1
+
+    excel_buffer = BytesIO()
+    workbook.save(excel_buffer)
+    return excel_buffer.getvalue()
+
+
+def write_parquet(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame as zstd-compressed Parquet."""
+    buffer = BytesIO()
+    pq.write_table(to_arrow_table(df), buffer, compression=PARQUET_COMPRESSION)
+    return buffer.getvalue()
+
+
+def write_arrow_ipc(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame as an Arrow IPC (Feather v2) file."""
+    table = to_arrow_table(df)
+    sink = pa.BufferOutputStream()
+    with pa_ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def write_year_partitioned(df: pd.DataFrame, root_dir: str, date_column: str = "data") -> None:
+    """
+    Write a year-partitioned Parquet dataset (root_dir/year=YYYY/*.parquet).
+
+    Partitions present in df replace the files already stored for those
+    years; other years are left untouched. A year of visits can then be
+    loaded with column pruning, e.g.
+    pd.read_parquet(root_dir, columns=[...], filters=[("year", "=", 2024)]).
+
+    Args:
+        df: DataFrame with a datetime column
+        root_dir: Dataset directory
+        date_column: Datetime column the partitions are keyed on
+    """
+    df = df.assign(**{YEAR_PARTITION_COLUMN: pd.to_datetime(df[date_column]).dt.year})
+    pq.write_to_dataset(
+        to_arrow_table(df),
+        root_path=root_dir,
+        partition_cols=[YEAR_PARTITION_COLUMN],
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+        compression=PARQUET_COMPRESSION
+    )
+
+
+@dataclass
+class ExportFormat:
+    """Configuration for one download format."""
+    label: str
+    extension: str
+    mime: str
+    writer: Callable[[pd.DataFrame], bytes]
+
+
+# Available export formats
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    "csv": ExportFormat(
+        label="Download as CSV",
+        extension="csv",
+        mime="text/csv",
+        writer=write_csv
+    ),
+    "excel": ExportFormat(
+        label="Download as Excel",
+        extension="xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        writer=write_excel
+    ),
+    "parquet": ExportFormat(
+        label="Download as Parquet",
+        extension="parquet",
+        mime="application/vnd.apache.parquet",
+        writer=write_parquet
+    ),
+    "arrow": ExportFormat(
+        label="Download as Arrow",
+        extension="arrow",
+        mime="application/vnd.apache.arrow.file",
+        writer=write_arrow_ipc
+    ),
+}
+
+
+class DataExporter:
+    """Utility class for lazily generated, cached DataFrame exports."""
+
+    @staticmethod
+    def fingerprint(df: pd.DataFrame) -> str:
+        """
+        Compute a content fingerprint of a DataFrame.
+
+        Uses pandas' vectorized row hashing plus the column names and dtypes,
+        which is far cheaper than building any export.
+        """
+        digest = hashlib.sha1()
+        digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode("utf-8"))
+        digest.update(str(df.shape).encode("utf-8"))
+        if len(df.columns) and len(df):
+            try:
+                row_hashes = pd.util.hash_pandas_object(df, index=True)
+            except TypeError:
+                # Unhashable cells, e.g. lists from Airtable linked-record fields
+                row_hashes = pd.util.hash_pandas_object(df.astype(str), index=True)
+            digest.update(row_hashes.to_numpy().tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def session_fingerprint(df: pd.DataFrame) -> str:
+        """
+        Return the fingerprint of a DataFrame, memoized per session.
+
+        Frames kept in session state are the same object across reruns, so
+        the fingerprint is only computed again when the data is replaced.
+        Frames are referenced weakly, so the memo never keeps old data alive.
+        """
+        memo = st.session_state.setdefault("_export_fingerprints", {})
+        cached = memo.get(id(df))
+        if cached is not None and cached[0]() is df:
+            return cached[1]
+
+        fingerprint = DataExporter.fingerprint(df)
+        if len(memo) >= FINGERPRINT_MEMO_SIZE:
+            memo.pop(next(iter(memo)))
+        memo[id(df)] = (weakref.ref(df), fingerprint)
+        return fingerprint
+
+    @staticmethod
+    def to_bytes(df: pd.DataFrame, format_name: str) -> bytes:
+        """Serialize a DataFrame in the given export format."""
+        return EXPORT_FORMATS[format_name].writer(df)
+
+    @staticmethod
+    def download_button(df: pd.DataFrame, format_name: str, file_stem: str, key: str = None):
+        """
+        Display a download button that builds the file only when clicked.
+
+        Args:
+            df: DataFrame to export
+            format_name: Key of EXPORT_FORMATS
+            file_stem: Download file name without extension
+            key: Optional widget key
+        """
+        export_format = EXPORT_FORMATS[format_name]
+        fingerprint = DataExporter.session_fingerprint(df)
+        st.download_button(
+            label=export_format.label,
+            data=lambda: get_export_bytes(df, fingerprint, format_name),
+            file_name=f"{file_stem}.{export_format.extension}",
+            mime=export_format.mime,
+            key=key
+        )
+
+
+@st.cache_data(max_entries=EXPORT_CACHE_ENTRIES, show_spinner=False)
+def get_export_bytes(_df: pd.DataFrame, fingerprint: str, format_name: str) -> bytes:
+    """
+    Cached export bytes, keyed by DataFrame fingerprint and format.
+
+    The DataFrame itself is excluded from Streamlit's argument hashing
+    (leading underscore); the fingerprint identifies its content.
+    """
+    return DataExporter.to_bytes(_df, format_name)
+
+
+def download_button(df: pd.DataFrame, format_name: str, file_stem: str, key: str = None):
+    """Display a lazily generated, cached download button."""
+    DataExporter.download_button(df, format_name, file_stem, key)
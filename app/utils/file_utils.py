@@ -4,9 +4,11 @@ File Utilities for App
 Common file processing utilities and validation functions.
 """
 
+import os
+import tempfile
 import streamlit as st
 import pandas as pd
-from typing import List
+from typing import IO, Callable, List
 
 
 class FileUtils:
@@ -44,3 +46,31 @@ def validate_file_type(filename: str, supported_types: List[str]) -> bool:
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
     return FileUtils.format_file_size(size_bytes)
+
+
+def write_atomic(path: str, write: Callable[[IO], None], mode: str = "wb", encoding: str = None) -> None:
+    """
+    Write a file under a temporary name and rename it into place.
+
+    Readers (other sessions, a resumed upload) therefore never see a
+    partially written file, and an interrupted write leaves the old one intact.
+
+    Args:
+        path: Destination file path; its directory is created if needed
+        write: Called with the open temporary file to write the content
+        mode: Open mode of the temporary file ("wb" or "w")
+        encoding: Text encoding, for mode "w"
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -5,11 +5,130 @@ Processes HTML files and extracts structured data.
 Following Streamlit best practices for modular code organization.
 """
 
+import html as html_lib
+import io
+import math
+import mmap
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import pandas as pd
 from bs4 import BeautifulSoup
 import csv
 
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # lxml is optional
+    lxml_etree = None
+
+try:
+    import pyarrow  # noqa: F401
+    COMPACT_STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    COMPACT_STRING_DTYPE = pd.StringDtype()
+
+
+HTML_ENCODING = "iso-8859-2"
+
+# Bump whenever the parsed output changes, so persisted parse results are not reused
+PARSER_VERSION = "1"
+
+# Bytes read from an export per chunk when streaming
+READ_CHUNK_SIZE = 256 * 1024
+
+# Characters kept from the end of a chunk so a marker split across chunks is still found
+HEADER_LOOKBACK = 256
+
+# Exports with fewer visits than this are parsed serially even when workers > 1
+PARALLEL_MIN_VISITS = 500
+
+# Shards submitted per worker, so uneven sections still balance across the pool
+SHARDS_PER_WORKER = 4
+
+# Text-extraction backend used when none is configured
+DEFAULT_TEXT_BACKEND = "bs4"
+
+# Markup tags (not comments or stray "<" characters) for the tokenizer backend
+TAG_RE = re.compile(r"<(?:/?[A-Za-z][^>]*|!--.*?--)>", re.DOTALL)
+
+# Repeated, low-cardinality columns stored as categoricals in the compact schema
+COMPACT_CATEGORY_COLUMNS = (
+    "typ", "wlasciciel", "gatunek", "rasa", "plec", "wiek",
+    "nazwa_zwierzecia", "zabiegi", "leki", "zalecenia",
+)
+
+# Visit marker: <B>DATE: Wizyta<BR></B> or <B>DATE: Badanie<BR></B>
+VISIT_HEADER_RE = re.compile(r"<B>\s*(\d{2}/\d{2}/\d{4} \d{2}:\d{2}): (Wizyta|Badanie)<BR>\s*</B>")
+
+ANIMAL_RE = re.compile(r"Zwierz.*?:\s*(\S+)\s+Nr:\s*(\S+)")
+DATE_LINE_RE = re.compile(r"^\d{2}/\d{2}/\d{4} \d{2}:\d{2}:")
+MEDICATION_RE = re.compile(r"^[A-Z].*\d{1,2}[.,]?\s?ml")
+
+# "Label: value" fields matched on the start of a line, dispatched by first character
+PREFIX_FIELDS = {
+    "T": (("Tel.:", "telefon"),),
+    "E": (("E-mail:", "email"),),
+    "G": (("Gatunek", "gatunek"),),
+    "R": (("Rasa", "rasa"),),
+    "W": (("Wiek", "wiek"),),
+    "M": (("Mikrochip", "microchip"),),
+}
+
+# "Label: value" fields matched anywhere in a line
+CONTAINS_FIELDS = (
+    ("Właściciel", "wlasciciel"),
+    ("Płeć", "plec"),
+)
+
+
+def bs4_text(section):
+    """Extract text with BeautifulSoup's html.parser (reference backend)."""
+    return BeautifulSoup(section, "html.parser").get_text(separator="\n")
+
+
+def lxml_text(section):
+    """Extract text with lxml's C HTML parser."""
+    if not section.strip():
+        return ""
+    root = lxml_etree.fromstring(f"<div>{section}</div>", lxml_etree.HTMLParser())
+    return "\n".join(root.itertext(tag=lxml_etree.Element))
+
+
+def tokenizer_text(section):
+    """Extract text by stripping tags; the export only uses flat <B>, <BR>, <TD>-style markup."""
+    return "\n".join(html_lib.unescape(part) for part in TAG_RE.split(section))
+
+
+# Available text-extraction backends by name
+TEXT_BACKENDS = {
+    "bs4": bs4_text,
+    "tokenizer": tokenizer_text,
+}
+if lxml_etree is not None:
+    TEXT_BACKENDS["lxml"] = lxml_text
+
+
+def get_text_backend(name):
+    """
+    Look up a text-extraction backend by name.
+
+    Args:
+        name: Backend name, one of TEXT_BACKENDS
+
+    Returns:
+        Function turning section HTML into newline-separated text
+
+    Raises:
+        ValueError: If the backend is unknown or its dependency is not installed
+    """
+    try:
+        return TEXT_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown HTML text backend '{name}'. Available: {', '.join(sorted(TEXT_BACKENDS))}"
+        ) from None
+
 
 class HTMLProcessor:
     """Class for processing HTML files and extracting structured data."""
@@ -22,80 +141,203 @@ class HTMLProcessor:
         return re.sub(r"[\n\r\t]+", " ", joined).strip()
     
     @staticmethod
-    def read_html(file_path, file_name):
+    def parse_visit_lines(date, visit_type, lines):
         """
-        Read and process HTML file to extract structured data.
-        
+        Extract one visit record from the text lines of its section.
+
+        Every field is filled in a single walk over ``lines``. Each field takes
+        the first line that matches it, like the previous per-field scans did.
+
         Args:
-            file_path: Path to the HTML file
-            file_name: Name of the file (for output naming)
-            
+            date: Visit date string from the section header ("dd/mm/yyyy hh:mm")
+            visit_type: "Wizyta" or "Badanie"
+            lines: Stripped, non-empty text lines of the visit section
+
         Returns:
-            pandas DataFrame with extracted data
+            dict with one entry per output column
+        """
+        fields = {}
+        animal_line = None
+        treatments = []
+        medications = []
+        recommendations = []
+        # 0 - before "Zalecenia:", 1 - collecting, 2 - stopped at the next date line
+        recommendations_state = 0
+
+        for line in lines:
+            if recommendations_state == 1:
+                if DATE_LINE_RE.match(line):
+                    recommendations_state = 2
+                else:
+                    recommendations.append(line)
+            elif recommendations_state == 0 and line == "Zalecenia:":
+                recommendations_state = 1
+
+            if line.startswith("_"):
+                treatments.append(line)
+            elif MEDICATION_RE.match(line):
+                medications.append(line)
+
+            if animal_line is None and line.startswith("Zwierz"):
+                animal_line = line
+
+            for prefix, key in PREFIX_FIELDS.get(line[0], ()):
+                if key not in fields and line.startswith(prefix):
+                    fields[key] = line.split(":")[1].strip()
+            for needle, key in CONTAINS_FIELDS:
+                if key not in fields and needle in line:
+                    fields[key] = line.split(":")[1].strip()
+
+        animal_name = None
+        animal_id = None
+        if animal_line:
+            match = ANIMAL_RE.search(animal_line)
+            if match:
+                animal_name = match.group(1)
+                animal_id = match.group(2)
+
+        return {
+            "data": date,
+            "typ": visit_type,
+            "wlasciciel": fields.get("wlasciciel"),
+            "telefon": fields.get("telefon"),
+            "email": fields.get("email"),
+            "nazwa_zwierzecia": animal_name,
+            "id_zwierzecia": animal_id,
+            "gatunek": fields.get("gatunek"),
+            "rasa": fields.get("rasa"),
+            "plec": fields.get("plec"),
+            "wiek": fields.get("wiek"),
+            "microchip": fields.get("microchip"),
+            "zabiegi": HTMLProcessor.clean_multiline(treatments),
+            "leki": HTMLProcessor.clean_multiline(medications),
+            "zalecenia": HTMLProcessor.clean_multiline(recommendations)
+        }
+
+    @staticmethod
+    def section_lines(section, backend=DEFAULT_TEXT_BACKEND):
         """
-        # Step 1: Read HTML file
-        with open(file_path, encoding="iso-8859-2") as f:
-            html = f.read()
+        Turn the HTML of one visit section into stripped, non-empty text lines.
 
-        # Step 2: Split by visits using the <B>DATE: Wizyta<BR></B> or Badanie marker
-        visit_sections = re.split(r"<B>\s*\d{2}/\d{2}/\d{4} \d{2}:\d{2}: (?:Wizyta|Badanie)<BR>\s*</B>", html)
+        Args:
+            section: HTML of the visit section
+            backend: Name of the text-extraction backend (see TEXT_BACKENDS)
 
-        # Step 3: Extract date-time info to match with split sections
-        visit_headers = re.findall(r"<B>\s*(\d{2}/\d{2}/\d{4} \d{2}:\d{2}): (Wizyta|Badanie)<BR>\s*</B>", html)
+        Returns:
+            List of text lines
+        """
+        text = get_text_backend(backend)(section)
+        return [line.strip() for line in text.split("\n") if line.strip()]
 
-        # Step 4: Parse each visit section into structured data
-        data = []
+    @staticmethod
+    def iter_sections(stream, chunk_size=READ_CHUNK_SIZE):
+        """
+        Yield (date, visit_type, section_html) for every visit in an export stream.
 
-        for i, section in enumerate(visit_sections[1:]):  # skip the first chunk (header)
-            soup = BeautifulSoup(section, "html.parser")
-            text = soup.get_text(separator="\n")
+        The stream is read in chunks, so only the visit being assembled and one
+        chunk are held in memory at a time.
 
-            # Clean and prepare lines
-            lines = [line.strip() for line in text.split("\n") if line.strip()]
+        Args:
+            stream: Binary or text file object, or an mmap of the export
+            chunk_size: Number of bytes/characters read per chunk
 
-            animal_line = next((l for l in lines if l.startswith("Zwierz")), None)
-            if animal_line:
-                match = re.search(r"Zwierz.*?:\s*(\S+)\s+Nr:\s*(\S+)", animal_line)
-                animal_name = match.group(1) if match else None
-                animal_id = match.group(2) if match else None
+        Yields:
+            Tuples of header date, visit type and the HTML following the header
+        """
+        buffer = ""
+        scan_from = 0
+        header = None
+        section_start = 0
+
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            if isinstance(chunk, bytes):
+                # Single-byte encoding, so chunks can be decoded independently
+                chunk = chunk.decode(HTML_ENCODING)
+            buffer += chunk
+
+            for match in VISIT_HEADER_RE.finditer(buffer, scan_from):
+                if header is not None:
+                    yield header[0], header[1], buffer[section_start:match.start()]
+                header = (match.group(1), match.group(2))
+                section_start = match.end()
+                scan_from = match.end()
+
+            # Drop text that can no longer be part of a visit or of a split marker
+            if header is not None:
+                trim = section_start
             else:
-                animal_name = None
-                animal_id = None
-
-            # Extract zalecenia
-            recommendations = []
-            if "Zalecenia:" in lines:
-                start_idx = lines.index("Zalecenia:") + 1
-                while start_idx < len(lines) and not re.match(r"^\d{2}/\d{2}/\d{4} \d{2}:\d{2}:", lines[start_idx]):
-                    recommendations.append(lines[start_idx])
-                    start_idx += 1
-
-            # Extract treatments and medications
-            treatments = [l.strip() for l in lines if l.startswith("__") or l.startswith("_")]
-            medications = [l.strip() for l in lines if re.match(r"^[A-Z].*\d{1,2}[.,]?\s?ml", l)]
-
-            entry = {
-                "data": visit_headers[i][0],
-                "typ": visit_headers[i][1],
-                "wlasciciel": next((l.split(":")[1].strip() for l in lines if "Właściciel" in l), None),
-                "telefon": next((l.split(":")[1].strip() for l in lines if l.startswith("Tel.:")), None),
-                "email": next((l.split(":")[1].strip() for l in lines if l.startswith("E-mail:")), None),
-                "nazwa_zwierzecia": animal_name,
-                "id_zwierzecia": animal_id,
-                "gatunek": next((l.split(":")[1].strip() for l in lines if l.startswith("Gatunek")), None),
-                "rasa": next((l.split(":")[1].strip() for l in lines if l.startswith("Rasa")), None),
-                "plec": next((l.split(":")[1].strip() for l in lines if "Płeć" in l), None),
-                "wiek": next((l.split(":")[1].strip() for l in lines if l.startswith("Wiek")), None),
-                "microchip": next((l.split(":")[1].strip() for l in lines if l.startswith("Mikrochip")), None),
-                "zabiegi": HTMLProcessor.clean_multiline(treatments),
-                "leki": HTMLProcessor.clean_multiline(medications),
-                "zalecenia": HTMLProcessor.clean_multiline(recommendations)
-            }
-
-            data.append(entry)
-
-        # Step 5: Create DataFrame
-        df = pd.DataFrame(data)
+                trim = max(0, len(buffer) - HEADER_LOOKBACK)
+            buffer = buffer[trim:]
+            section_start -= trim
+            scan_from = max(0, scan_from - trim)
+
+        if header is not None:
+            yield header[0], header[1], buffer[section_start:]
+
+    @staticmethod
+    def iter_visits(source, batch_size=None, backend=DEFAULT_TEXT_BACKEND):
+        """
+        Stream visit records from an HTML export.
+
+        Args:
+            source: Path to the HTML file (memory-mapped while reading), the
+                raw bytes of an export, or an open binary/text file object
+            batch_size: If given, yield DataFrames of up to this many visits
+                instead of single records
+            backend: Name of the text-extraction backend (see TEXT_BACKENDS)
+
+        Yields:
+            One dict per visit, or DataFrames of batch_size visits
+        """
+        batch = []
+        for date, visit_type, section in HTMLProcessor._iter_source_sections(source):
+            lines = HTMLProcessor.section_lines(section, backend)
+            record = HTMLProcessor.parse_visit_lines(date, visit_type, lines)
+
+            if batch_size is None:
+                yield record
+                continue
+
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield HTMLProcessor.records_to_dataframe(batch)
+                batch = []
+
+        if batch:
+            yield HTMLProcessor.records_to_dataframe(batch)
+
+    @staticmethod
+    def _iter_source_sections(source):
+        """Yield the sections of a path (memory-mapped), bytes-like object or open file object."""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            # BytesIO shares the buffer of bytes objects, so this does not copy the payload
+            source = io.BytesIO(source)
+
+        if hasattr(source, "read"):
+            yield from HTMLProcessor.iter_sections(source)
+            return
+
+        with open(source, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from HTMLProcessor.iter_sections(mapped)
+
+    @staticmethod
+    def records_to_dataframe(records):
+        """
+        Build the output DataFrame from visit records.
+
+        Args:
+            records: List of dicts returned by parse_visit_lines
+
+        Returns:
+            pandas DataFrame with the date column converted to datetime
+        """
+        df = pd.DataFrame(records)
         
         # Convert date column to datetime format
         if not df.empty and 'data' in df.columns:
@@ -112,12 +354,111 @@ class HTMLProcessor:
         
         return df
 
+    @staticmethod
+    def parse_sections(sections, backend=DEFAULT_TEXT_BACKEND):
+        """Parse a list of (date, visit_type, section_html) tuples into visit records."""
+        return [
+            HTMLProcessor.parse_visit_lines(date, visit_type, HTMLProcessor.section_lines(section, backend))
+            for date, visit_type, section in sections
+        ]
+
+    @staticmethod
+    def read_html_parallel(source, workers=None, min_visits=PARALLEL_MIN_VISITS,
+                           backend=DEFAULT_TEXT_BACKEND):
+        """
+        Parse the visit sections of one export across a process pool.
+
+        Sections are split into contiguous shards and the records are merged
+        back in file order, so the result equals the serial parse.
+
+        Args:
+            source: Path to the HTML file, raw bytes or an open file object
+            workers: Number of worker processes (defaults to the CPU count)
+            min_visits: Below this many visits the export is parsed serially
+            backend: Name of the text-extraction backend (see TEXT_BACKENDS)
+
+        Returns:
+            pandas DataFrame with extracted data
+        """
+        workers = workers or os.cpu_count() or 1
+        sections = list(HTMLProcessor._iter_source_sections(source))
+
+        if workers <= 1 or len(sections) < min_visits:
+            return HTMLProcessor.records_to_dataframe(HTMLProcessor.parse_sections(sections, backend))
+
+        shard_size = math.ceil(len(sections) / (workers * SHARDS_PER_WORKER))
+        shards = [sections[i:i + shard_size] for i in range(0, len(sections), shard_size)]
+
+        records = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for shard_records in executor.map(partial(HTMLProcessor.parse_sections, backend=backend), shards):
+                records.extend(shard_records)
+
+        return HTMLProcessor.records_to_dataframe(records)
+
+    @staticmethod
+    def compact_dataframe(df):
+        """
+        Convert parsed visits to the compact output schema.
+
+        Repeated columns become categoricals and the remaining text columns
+        nullable strings (Arrow-backed when pyarrow is installed). Values, and
+        therefore CSV/Excel exports, are unchanged. The deep memory usage
+        before compaction is kept in df.attrs["uncompacted_memory"].
+
+        Args:
+            df: DataFrame returned by read_html (plain or already compact)
+
+        Returns:
+            A new DataFrame using the compact dtypes
+        """
+        original_memory = df.attrs.get("uncompacted_memory", int(df.memory_usage(deep=True).sum()))
+
+        dtypes = {}
+        for col in df.columns:
+            if col == "data":
+                continue
+            if col in COMPACT_CATEGORY_COLUMNS:
+                dtypes[col] = "category"
+            else:
+                dtypes[col] = COMPACT_STRING_DTYPE
+
+        compact = df.astype(dtypes)
+        compact.attrs["uncompacted_memory"] = original_memory
+        return compact
+
+    @staticmethod
+    def read_html(file_path, file_name, workers=1, backend=DEFAULT_TEXT_BACKEND, compact=False):
+        """
+        Read and process HTML file to extract structured data.
+        
+        Args:
+            file_path: Path to the HTML file, raw bytes or an open file object
+            file_name: Name of the file (for output naming)
+            workers: Number of processes to parse with; 1 parses serially,
+                None uses every CPU core
+            backend: Name of the text-extraction backend (see TEXT_BACKENDS)
+            compact: Return the compact schema (see compact_dataframe)
+            
+        Returns:
+            pandas DataFrame with extracted data
+        """
+        if workers != 1:
+            df = HTMLProcessor.read_html_parallel(file_path, workers, backend=backend)
+        else:
+            df = HTMLProcessor.records_to_dataframe(list(HTMLProcessor.iter_visits(file_path, backend=backend)))
+        return HTMLProcessor.compact_dataframe(df) if compact else df
+
 
 # Convenience functions for backward compatibility
 def clean_multiline(text_list):
     """Clean multiline text by joining and removing excess whitespace."""
     return HTMLProcessor.clean_multiline(text_list)
 
-def read_html(file_path, file_name):
+def read_html(file_path, file_name, workers=1, backend=DEFAULT_TEXT_BACKEND, compact=False):
     """Read and process HTML file to extract structured data."""
-    return HTMLProcessor.read_html(file_path, file_name)
+    return HTMLProcessor.read_html(file_path, file_name, workers, backend, compact)
+
+def iter_visits(source, batch_size=None, backend=DEFAULT_TEXT_BACKEND):
+    """Stream visit records (or DataFrames of batch_size visits) from an HTML export."""
+    return HTMLProcessor.iter_visits(source, batch_size, backend)
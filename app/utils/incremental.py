@@ -0,0 +1,166 @@
+"""
+Incremental Visit Ingestion for Koteria App
+
+Re-imports growing visit exports by parsing only new or changed visits.
+Each stored visit is identified by its header key (date, time and
+Wizyta/Badanie) and a hash of its section, so unchanged visits are reused
+from the previous import instead of being parsed again.
+"""
+
+import hashlib
+import os
+import re
+import pandas as pd
+from collections import Counter
+from typing import Dict, Tuple
+
+from .html_processor import HTMLProcessor, DEFAULT_TEXT_BACKEND, PARSER_VERSION
+from .parse_cache import DEFAULT_CACHE_DIR, write_parquet_atomic
+
+
+# Inside the parse cache directory, so stored results count towards its size
+# cap and are evicted with its entries (an evicted dataset is parsed in full again)
+DEFAULT_STORE_DIR = os.path.join(DEFAULT_CACHE_DIR, "incremental")
+
+# Bookkeeping columns saved next to the visit columns in the stored result
+KEY_COLUMN = "_visit_key"
+HASH_COLUMN = "_section_hash"
+
+
+class IncrementalParser:
+    """Parser that remembers previously imported visits per dataset."""
+
+    def __init__(self, store_dir: str = DEFAULT_STORE_DIR, backend: str = DEFAULT_TEXT_BACKEND):
+        """
+        Initialize the incremental parser.
+
+        Args:
+            store_dir: Directory holding one stored result per dataset
+            backend: Text-extraction backend used for new or changed visits
+        """
+        self.store_dir = store_dir
+        self.backend = backend
+
+    @staticmethod
+    def dataset_name(filename: str) -> str:
+        """
+        Derive a dataset name from an export's file name.
+
+        Re-downloaded copies such as "Wizyty25 (1).html" map to the same
+        dataset as "Wizyty25.html".
+        """
+        stem = os.path.splitext(os.path.basename(filename))[0]
+        stem = re.sub(r"\s*\(\d+\)$", "", stem)
+        return re.sub(r"[^\w.-]+", "_", stem) or "export"
+
+    @staticmethod
+    def section_hash(section: str) -> str:
+        """Return a hash identifying the content of one visit section."""
+        return hashlib.sha1(section.encode("utf-8")).hexdigest()
+
+    def _path(self, dataset: str) -> str:
+        """Return the stored result path for a dataset."""
+        return os.path.join(self.store_dir, f"{dataset}-v{PARSER_VERSION}.parquet")
+
+    def load(self, dataset: str) -> pd.DataFrame:
+        """
+        Load the stored result of a dataset, including the bookkeeping columns.
+
+        Returns:
+            The stored DataFrame, or an empty DataFrame if nothing is stored
+        """
+        try:
+            return pd.read_parquet(self._path(dataset))
+        except FileNotFoundError:
+            return pd.DataFrame()
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable incremental store for '{dataset}': {e}")
+            return pd.DataFrame()
+
+    def ingest(self, source, dataset: str) -> Tuple[pd.DataFrame, Dict[str, int]]:
+        """
+        Import an export, parsing only visits that are new or changed.
+
+        The result is in file order and equals read_html on the same export.
+        It replaces the stored result for the dataset.
+
+        Args:
+            source: Path to the HTML file, raw bytes or an open file object
+            dataset: Name of the dataset the export belongs to
+
+        Returns:
+            Tuple of the visit DataFrame and counts of total, reused, new
+            and changed visits
+        """
+        stored = self.load(dataset)
+        known = {}
+        if not stored.empty:
+            known = {
+                key: (position, section_hash)
+                for position, (key, section_hash)
+                in enumerate(zip(stored[KEY_COLUMN], stored[HASH_COLUMN]))
+            }
+
+        keys = []
+        hashes = []
+        # Stored row position for reused visits, None for visits parsed now
+        slots = []
+        new_records = []
+        stats = {"total": 0, "reused": 0, "new": 0, "changed": 0}
+        header_counts = Counter()
+
+        for date, visit_type, section in HTMLProcessor._iter_source_sections(source):
+            # Visits sharing a header (same minute and type) are told apart by occurrence
+            header = f"{date} {visit_type}"
+            key = f"{header}#{header_counts[header]}"
+            header_counts[header] += 1
+            section_hash = self.section_hash(section)
+
+            keys.append(key)
+            hashes.append(section_hash)
+            stats["total"] += 1
+
+            previous = known.get(key)
+            if previous is not None and previous[1] == section_hash:
+                slots.append(previous[0])
+                stats["reused"] += 1
+                continue
+
+            lines = HTMLProcessor.section_lines(section, self.backend)
+            new_records.append(HTMLProcessor.parse_visit_lines(date, visit_type, lines))
+            slots.append(None)
+            stats["changed" if previous is not None else "new"] += 1
+
+        df = self._assemble(stored, slots, new_records)
+        if not df.empty:
+            stored_df = df.copy()
+            stored_df[KEY_COLUMN] = keys
+            stored_df[HASH_COLUMN] = hashes
+            write_parquet_atomic(stored_df, self._path(dataset))
+
+        return df, stats
+
+    @staticmethod
+    def _assemble(stored: pd.DataFrame, slots, new_records) -> pd.DataFrame:
+        """Combine reused stored rows and newly parsed records in file order."""
+        new_df = HTMLProcessor.records_to_dataframe(new_records)
+        reused_positions = [i for i, slot in enumerate(slots) if slot is not None]
+        if not reused_positions:
+            return new_df
+
+        reused = stored.iloc[[slots[i] for i in reused_positions]].drop(columns=[KEY_COLUMN, HASH_COLUMN])
+        reused.index = reused_positions
+        if new_df.empty:
+            return reused.reset_index(drop=True)
+
+        # Keep the stored dtypes, e.g. when every new value of a column is missing
+        new_df = new_df.astype(reused.dtypes.to_dict())
+        new_df.index = [i for i, slot in enumerate(slots) if slot is None]
+        return pd.concat([reused, new_df]).sort_index().reset_index(drop=True)
+
+    def clear(self, dataset: str) -> None:
+        """Forget the stored result of a dataset."""
+        try:
+            os.remove(self._path(dataset))
+        except FileNotFoundError:
+            pass
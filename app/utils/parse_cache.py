@@ -0,0 +1,151 @@
+"""
+Parse Cache for Koteria App
+
+Persistent, content-addressed cache of parsed HTML exports.
+Parsed DataFrames are stored as Parquet files under data/processed so that
+re-uploading a known export survives restarts and "Clear Data".
+"""
+
+import hashlib
+import os
+import pandas as pd
+from typing import Optional
+
+from .file_utils import write_atomic
+from .html_processor import PARSER_VERSION
+
+
+DEFAULT_CACHE_DIR = os.path.join("data", "processed")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+CACHE_SUFFIX = ".parquet"
+
+
+def write_parquet_atomic(df: pd.DataFrame, path: str) -> None:
+    """
+    Write a DataFrame to Parquet under a temporary name and rename it into place.
+
+    Concurrent sessions therefore never read a partially written file.
+
+    Args:
+        df: DataFrame to write
+        path: Destination file path; its directory is created if needed
+    """
+    write_atomic(path, lambda f: df.to_parquet(f, index=False))
+
+
+class ParseCache:
+    """Disk-backed cache of parsed exports keyed by content hash and parser version."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 parser_version: str = PARSER_VERSION):
+        """
+        Initialize the parse cache.
+
+        Args:
+            cache_dir: Directory holding the cached Parquet files
+            max_bytes: Total size cap; least recently used entries are evicted above it
+            parser_version: Part of every key, so a parser change never serves stale frames
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.parser_version = parser_version
+
+    @staticmethod
+    def content_hash(content) -> str:
+        """Return the SHA-256 hex digest of a file's content (bytes or a buffer)."""
+        return hashlib.sha256(content).hexdigest()
+
+    def _path(self, content_hash: str) -> str:
+        """Return the cache file path for a content hash."""
+        return os.path.join(self.cache_dir, f"{content_hash}-v{self.parser_version}{CACHE_SUFFIX}")
+
+    def contains(self, content_hash: str) -> bool:
+        """Return whether a parsed result is stored for a content hash."""
+        return os.path.exists(self._path(content_hash))
+
+    def get(self, content_hash: str) -> Optional[pd.DataFrame]:
+        """
+        Load a cached DataFrame.
+
+        Args:
+            content_hash: Hash returned by content_hash()
+
+        Returns:
+            The cached DataFrame, or None on a miss or an unreadable entry
+        """
+        path = self._path(content_hash)
+        try:
+            df = pd.read_parquet(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: Dropping unreadable parse cache entry {path}: {e}")
+            self._remove(path)
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return df
+
+    def put(self, content_hash: str, df: pd.DataFrame) -> None:
+        """
+        Store a DataFrame and evict old entries above the size cap.
+
+        Args:
+            content_hash: Hash returned by content_hash()
+            df: Parsed DataFrame to store
+        """
+        try:
+            write_parquet_atomic(df, self._path(content_hash))
+        except Exception as e:
+            print(f"Warning: Could not write parse cache entry: {e}")
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove least recently used files until the cache fits in max_bytes.
+
+        Parquet files in subdirectories of cache_dir count too, so stores
+        kept there (e.g. the incremental store in incremental/) share the cap
+        and are evicted like cache entries.
+        """
+        entries = []
+        for directory, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if not name.endswith(CACHE_SUFFIX):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    # Evicted by another session in the meantime
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(CACHE_SUFFIX):
+                self._remove(os.path.join(self.cache_dir, name))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Delete a file, ignoring files already removed by another session."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,382 @@
+"""
+Rate Limit Utilities for App
+
+Airtable allows 5 requests per second per base. Every request made through
+the shared Airtable session waits on a token bucket for its base, so
+concurrent fetches (and every Streamlit session in this process) stay under
+the limit together instead of each being throttled by 429 responses.
+
+Throttled (429) and failed (5xx, connection error) requests are retried with
+jittered exponential backoff, honoring Retry-After. A circuit breaker per
+base stops sending requests during an outage, and the counters of all of
+this are exposed by client_metrics().
+"""
+
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Requests per second Airtable accepts for one base
+AIRTABLE_REQUESTS_PER_SECOND = 5
+
+# Attempts per request, including the first one
+MAX_ATTEMPTS = 6
+
+# Backoff before the n-th retry: between half and all of min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**n)
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+# Random seconds added to a Retry-After delay, so waiting clients do not retry in lockstep
+RETRY_AFTER_JITTER = 1.0
+
+# Statuses that are retried: 429 for every request, server errors only when
+# the request is safe to repeat (see is_retry_safe)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Consecutive failed requests that open a base's circuit, and seconds until a trial request
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30.0
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Base ID in an Airtable API URL, e.g. /v0/appXXXX/Table or /v0/meta/bases/appXXXX/tables
+BASE_ID_RE = re.compile(r"/v0/(?:meta/bases/)?(app[A-Za-z0-9]+)")
+
+
+class TokenBucket:
+    """Thread-safe token bucket: up to `capacity` requests at once, refilled at `rate` per second."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Create a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (default: rate)
+            clock: Monotonic time source, replaceable in tests
+            sleep: Sleep function, replaceable in tests
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it."""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            # A negative balance is the queue of callers already waiting
+            return max(0.0, -self.tokens / self.rate)
+
+    def acquire(self) -> float:
+        """
+        Block until a request may be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve()
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for at least `seconds` (e.g. after a 429 with Retry-After)."""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while a base's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a service keeps failing.
+
+    After failure_threshold consecutive failures the circuit opens and
+    requests are rejected at once. After reset_timeout one trial request is
+    let through (half-open): success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Create a closed circuit.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial request
+            clock: Monotonic time source, replaceable in tests
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """
+        Check that a request may be sent.
+
+        Raises:
+            CircuitOpenError: While the circuit is open, or while the
+                half-open trial request is running
+        """
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self.reset_timeout - (self.clock() - self.opened_at)
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        f"Airtable is unavailable after {self.failures} failed requests; "
+                        f"retrying in {remaining:.0f}s"
+                    )
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if self._trial_running:
+                    self.rejected += 1
+                    raise CircuitOpenError("Airtable is unavailable; a trial request is in progress")
+                self._trial_running = True
+
+    def record_success(self) -> None:
+        """Close the circuit after a request reached a healthy service."""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit at the threshold or after a failed trial."""
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.state = OPEN
+                self.opened_at = self.clock()
+                self.times_opened += 1
+
+
+class BaseGuard:
+    """Rate limiter, circuit breaker and request counters shared by all requests to one base."""
+
+    COUNTERS = ("requests", "retries", "throttled", "server_errors", "connection_errors", "rate_limit_wait")
+
+    def __init__(self):
+        self.limiter = TokenBucket(AIRTABLE_REQUESTS_PER_SECOND)
+        self.breaker = CircuitBreaker()
+        self.counters: Dict[str, float] = dict.fromkeys(self.COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def count(self, name: str, amount: float = 1) -> None:
+        """Add to a counter."""
+        with self._lock:
+            self.counters[name] += amount
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Counters and circuit breaker state.
+
+        Returns:
+            Dictionary with requests, retries, throttled (429 responses),
+            server_errors, connection_errors, rate_limit_wait (seconds spent
+            waiting for the token bucket), breaker_state, consecutive_failures,
+            times_opened and rejected (requests refused by the open circuit)
+        """
+        with self._lock:
+            metrics = dict(self.counters)
+        metrics["rate_limit_wait"] = round(metrics["rate_limit_wait"], 3)
+        metrics.update({
+            "breaker_state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "times_opened": self.breaker.times_opened,
+            "rejected": self.breaker.rejected,
+        })
+        return metrics
+
+
+_base_guards: Dict[str, BaseGuard] = {}
+_base_guards_lock = threading.Lock()
+
+
+def base_guard(base_id: str) -> BaseGuard:
+    """Guard shared by every request to one base in this process."""
+    with _base_guards_lock:
+        guard = _base_guards.get(base_id)
+        if guard is None:
+            guard = _base_guards[base_id] = BaseGuard()
+        return guard
+
+
+def base_limiter(base_id: str) -> TokenBucket:
+    """Token bucket shared by every request to one base in this process."""
+    return base_guard(base_id).limiter
+
+
+def client_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics of every base contacted by this process, keyed by base ID."""
+    with _base_guards_lock:
+        guards = dict(_base_guards)
+    return {base_id: guard.metrics() for base_id, guard in guards.items()}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait according to a Retry-After header.
+
+    Args:
+        value: Header value, in seconds or as an HTTP date
+
+    Returns:
+        Non-negative seconds, or None if missing or unreadable
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Seconds to wait before retrying.
+
+    Args:
+        attempt: Number of retries already made (0 before the first retry)
+        retry_after: Delay requested by the server, if any
+
+    Returns:
+        The requested delay plus up to RETRY_AFTER_JITTER, or a jittered
+        exponential backoff
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, RETRY_AFTER_JITTER)
+    backoff = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+    return backoff / 2 + random.uniform(0, backoff / 2)
+
+
+def is_retry_safe(request) -> bool:
+    """
+    Whether repeating a request after a server error cannot duplicate a write.
+
+    Creating records (POST) is the only non-idempotent Airtable call; POSTs to
+    listRecords are reads that were too long for a GET URL.
+    """
+    if request.method != "POST":
+        return True
+    return request.path_url.split("?")[0].endswith("/listRecords")
+
+
+def base_id_from_url(url: str) -> Optional[str]:
+    """Extract the base ID from an Airtable API URL, or None for requests not tied to a base."""
+    match = BASE_ID_RE.search(url or "")
+    return match.group(1) if match else None
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTP adapter applying the per-base guard to every Airtable request.
+
+    Each attempt waits for a token and is refused while the base's circuit
+    is open. 429 responses are retried for every method (Airtable rejected
+    them unprocessed) and pause the whole base for Retry-After; server and
+    connection errors are retried when is_retry_safe allows it.
+    """
+
+    def __init__(self, max_attempts: int = MAX_ATTEMPTS, sleep: Callable[[float], None] = time.sleep, **kwargs):
+        """
+        Create the adapter.
+
+        Args:
+            max_attempts: Attempts per request, including the first one
+            sleep: Sleep function for backoff, replaceable in tests
+            **kwargs: Passed to HTTPAdapter (e.g. pool sizes)
+        """
+        super().__init__(**kwargs)
+        self.max_attempts = max_attempts
+        self.sleep = sleep
+
+    def send(self, request, **kwargs):
+        """Send a request under its base's rate limit, retry policy and circuit breaker."""
+        base_id = base_id_from_url(request.url)
+        if base_id is None:
+            return super().send(request, **kwargs)
+
+        guard = base_guard(base_id)
+        for attempt in range(self.max_attempts):
+            last_attempt = attempt == self.max_attempts - 1
+            guard.breaker.before_request()
+            guard.count("rate_limit_wait", guard.limiter.acquire())
+            guard.count("requests")
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                guard.count("connection_errors")
+                guard.breaker.record_failure()
+                if last_attempt or not is_retry_safe(request):
+                    raise
+                guard.count("retries")
+                self.sleep(retry_delay(attempt))
+                continue
+            except BaseException:
+                # Any other error must still end a half-open trial, or the circuit never closes
+                guard.breaker.record_failure()
+                raise
+
+            status = response.status_code
+            if status == 429:
+                # Throttled, not down: the service answered
+                guard.count("throttled")
+                guard.breaker.record_success()
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = retry_delay(attempt, retry_after)
+                if retry_after is not None:
+                    guard.limiter.pause(retry_after)
+            elif status >= 500:
+                guard.count("server_errors")
+                guard.breaker.record_failure()
+                if not is_retry_safe(request):
+                    return response
+                delay = retry_delay(attempt, parse_retry_after(response.headers.get("Retry-After")))
+            else:
+                guard.breaker.record_success()
+                return response
+
+            if last_attempt or status not in RETRY_STATUSES:
+                return response
+            guard.count("retries")
+            response.close()
+            self.sleep(delay)
+        return response
@@ -25,6 +25,10 @@ class SessionStateManager:
             st.session_state.current_filename = None
         if 'file_processed' not in st.session_state:
             st.session_state.file_processed = False
+        if 'merge_report' not in st.session_state:
+            st.session_state.merge_report = None
+        if 'parse_job' not in st.session_state:
+            st.session_state.parse_job = None
         
         # UI state
         if 'show_data_info' not in st.session_state:
@@ -36,17 +40,23 @@ class SessionStateManager:
         st.session_state.current_dataframe = None
         st.session_state.current_filename = None
         st.session_state.file_processed = False
+        st.session_state.merge_report = None
+        st.session_state.parse_job = None
     
     @staticmethod
     def get_data_summary() -> Dict[str, Any]:
         """Get a summary of the current data in session state."""
         if st.session_state.current_dataframe is not None:
             df = st.session_state.current_dataframe
+            memory_usage = df.memory_usage(deep=True).sum()
+            # Frames in the compact schema remember their size before compaction
+            uncompacted_memory = df.attrs.get('uncompacted_memory', memory_usage)
             return {
                 'loaded': True,
                 'filename': st.session_state.get('current_filename', 'Unknown'),
                 'shape': df.shape,
-                'memory_usage': df.memory_usage(deep=True).sum() / 1024,  # KB
+                'memory_usage': memory_usage / 1024,  # KB
+                'memory_saved': max(uncompacted_memory - memory_usage, 0) / 1024,  # KB
                 'columns': list(df.columns),
                 'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()},
                 'null_counts': df.isnull().sum().to_dict()
@@ -57,6 +67,7 @@ class SessionStateManager:
                 'filename': None,
                 'shape': (0, 0),
                 'memory_usage': 0,
+                'memory_saved': 0,
                 'columns': [],
                 'dtypes': {},
                 'null_counts': {}
@@ -75,7 +86,12 @@ class SessionStateManager:
                 st.metric("Columns", summary['shape'][1])
             
             with col2:
-                st.metric("Memory Usage", f"{summary['memory_usage']:.1f} KB")
+                st.metric(
+                    "Memory Usage",
+                    f"{summary['memory_usage']:.1f} KB",
+                    delta=f"-{summary['memory_saved']:.1f} KB" if summary['memory_saved'] else None,
+                    delta_color="inverse"
+                )
                 st.metric("File", summary['filename'])
             
             # Column information
@@ -97,6 +113,8 @@ class SessionStateManager:
             st.write(f"**File:** {summary['filename']}")
             st.write(f"**Shape:** {summary['shape'][0]} × {summary['shape'][1]}")
             st.write(f"**Memory:** {summary['memory_usage']:.1f} KB")
+            if summary['memory_saved']:
+                st.write(f"**Saved by compact schema:** {summary['memory_saved']:.1f} KB")
             
             if st.button("🗑️ Clear Data"):
                 SessionStateManager.clear_data()
@@ -0,0 +1,213 @@
+"""
+Table Cache Utilities for App
+
+In-process cache of Airtable tables as DataFrames, keyed per base and table.
+Entries expire after a TTL, and the least recently used ones are evicted
+once the cached frames exceed a memory cap. Writes through AirtableManager
+patch or invalidate only the table they touch.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+
+# Seconds a cached table is served before it is fetched again
+TABLE_CACHE_TTL = 300
+
+# Memory cap of all cached tables together
+TABLE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class CacheEntry:
+    """One cached DataFrame."""
+    df: pd.DataFrame
+    nbytes: int
+    stored: float
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Memory used by a DataFrame, including the Python objects it holds."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class TableCache:
+    """
+    Thread-safe LRU cache of table DataFrames with a TTL and a memory cap.
+
+    Keys are (base ID, table name, variant), where the variant identifies a
+    query on the table (e.g. selected fields) and () is the whole table.
+    Invalidating a table drops all of its variants.
+
+    Frames are stored once and handed out as shallow copies, so a cache hit
+    costs no copy of the data. Callers may add, replace or drop columns of a
+    frame they got, but must not modify its values in place (.loc/.iloc
+    assignment, inplace=True on a column), which would change the cached table.
+    """
+
+    def __init__(self, ttl: float = TABLE_CACHE_TTL, max_bytes: int = TABLE_CACHE_MAX_BYTES,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Create an empty cache.
+
+        Args:
+            ttl: Seconds an entry is served after it was stored
+            max_bytes: Total size cap; least recently used entries are evicted above it
+            clock: Monotonic time source, replaceable in tests
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, str, Hashable], CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _remove(self, key) -> None:
+        """Drop an entry (the lock must be held)."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.nbytes
+
+    def get(self, base_id: str, table_name: str, variant: Hashable = ()) -> Optional[pd.DataFrame]:
+        """
+        Look up a table.
+
+        Args:
+            base_id: Airtable base ID
+            table_name: Name of the Airtable table
+            variant: Query variant, () for the whole table
+
+        Returns:
+            A shallow copy of the cached DataFrame (see the class docstring
+            on mutating it), or None if missing or expired
+        """
+        key = (base_id, table_name, variant)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() - entry.stored >= self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.df.copy(deep=False)
+
+    def put(self, base_id: str, table_name: str, df: pd.DataFrame, variant: Hashable = ()) -> None:
+        """
+        Store a table, evicting least recently used tables above the memory cap.
+
+        A table larger than the whole cap is not stored.
+
+        Args:
+            base_id: Airtable base ID
+            table_name: Name of the Airtable table
+            df: DataFrame to cache (a shallow copy is stored; do not modify its values afterwards)
+            variant: Query variant, () for the whole table
+        """
+        key = (base_id, table_name, variant)
+        nbytes = frame_nbytes(df)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if nbytes > self.max_bytes:
+                return
+            while self._entries and self._bytes + nbytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = CacheEntry(df.copy(deep=False), nbytes, self.clock())
+            self._bytes += nbytes
+
+    def patch(self, base_id: str, table_name: str, update: Callable[[pd.DataFrame], pd.DataFrame]) -> bool:
+        """
+        Apply a write to the cached whole table and drop the table's other variants.
+
+        Args:
+            base_id: Airtable base ID
+            table_name: Name of the Airtable table
+            update: Function returning the updated DataFrame
+
+        Returns:
+            Whether a cached whole table was patched
+        """
+        key = (base_id, table_name, ())
+        with self._lock:
+            entry = self._entries.get(key)
+            self._drop_table(base_id, table_name, keep=key)
+            if entry is None:
+                return False
+            try:
+                df = update(entry.df)
+            except Exception as e:
+                print(f"Warning: Could not patch cached table '{table_name}', dropping it: {e}")
+                self._remove(key)
+                self.invalidations += 1
+                return False
+            nbytes = frame_nbytes(df)
+            self._bytes += nbytes - entry.nbytes
+            entry.df = df
+            entry.nbytes = nbytes
+            return True
+
+    def _drop_table(self, base_id: str, table_name: Optional[str], keep=None) -> int:
+        """Drop the entries of one table, or of a whole base (the lock must be held)."""
+        keys = [
+            key for key in self._entries
+            if key[0] == base_id and (table_name is None or key[1] == table_name) and key != keep
+        ]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def invalidate(self, base_id: str, table_name: Optional[str] = None) -> int:
+        """
+        Drop every cached variant of a table, or of every table in a base.
+
+        Args:
+            base_id: Airtable base ID
+            table_name: Name of the Airtable table, or None for the whole base
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            return self._drop_table(base_id, table_name)
+
+    def clear(self) -> None:
+        """Drop every entry (the counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache counters for monitoring.
+
+        Returns:
+            Dictionary with entries, bytes, hits, misses, hit_rate, evictions,
+            expirations and invalidations
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,299 @@
+"""
+Table Mirror Utilities for App
+
+Keeps a local SQLite copy of each Airtable table under data/mirror. A sync
+downloads only the records created or modified since the previous sync
+(filtered with LAST_MODIFIED_TIME() on Airtable's side), and a periodic
+full download drops records deleted in Airtable. DataFrames are then read
+from the mirror instead of re-downloading every page of the table.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+
+DEFAULT_MIRROR_DIR = os.path.join("data", "mirror")
+
+# A full download (which also drops deleted records) happens at least this often
+FULL_SYNC_INTERVAL = 24 * 3600
+
+# Delta syncs re-read this many extra seconds of changes, covering clock skew
+# between this host and Airtable; re-reading a record is harmless
+SYNC_OVERLAP_SECONDS = 300
+
+# Rows decoded at a time when reading a mirror
+MIRROR_CHUNK_ROWS = 5000
+
+# Record IDs per DELETE statement (below SQLite's limit on bound parameters)
+DELETE_CHUNK_IDS = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id TEXT PRIMARY KEY,
+    created_time TEXT,
+    fields TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+UPSERT_SQL = """
+INSERT INTO records (id, created_time, fields) VALUES (?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET fields = excluded.fields
+"""
+
+# One lock per mirror file, so two sessions never sync the same table at once
+_sync_locks: Dict[str, threading.Lock] = {}
+_sync_locks_lock = threading.Lock()
+
+
+def _sync_lock(path: str) -> threading.Lock:
+    """Lock serializing syncs of one mirror file within this process."""
+    with _sync_locks_lock:
+        return _sync_locks.setdefault(path, threading.Lock())
+
+
+@dataclass
+class SyncResult:
+    """Outcome of one mirror sync."""
+    full: bool
+    fetched: int
+    total: int
+    elapsed: float
+
+
+class TableMirror:
+    """Local SQLite mirror of one Airtable table."""
+
+    def __init__(self, api, base_id: str, table_name: str,
+                 mirror_dir: str = DEFAULT_MIRROR_DIR, full_sync_interval: float = FULL_SYNC_INTERVAL):
+        """
+        Open (or prepare) the mirror of a table.
+
+        Args:
+            api: pyairtable Api (or compatible) used for syncing
+            base_id: Airtable base ID
+            table_name: Name of the Airtable table
+            mirror_dir: Directory holding the mirror databases
+            full_sync_interval: Seconds after which the next sync downloads the whole table
+        """
+        self.api = api
+        self.base_id = base_id
+        self.table_name = table_name
+        self.mirror_dir = mirror_dir
+        self.full_sync_interval = full_sync_interval
+
+    @property
+    def path(self) -> str:
+        """SQLite file of this table's mirror."""
+        safe_base = re.sub(r"[^A-Za-z0-9_.-]", "_", self.base_id)
+        safe_table = re.sub(r"[^A-Za-z0-9_.-]", "_", self.table_name)
+        return os.path.join(self.mirror_dir, safe_base, f"{safe_table}.sqlite")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the mirror database (creating it if needed) for one transaction."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            # Write-ahead logging lets pages read the mirror while a sync writes it
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _meta(connection: sqlite3.Connection, key: str) -> Optional[float]:
+        """Read a value from the meta table."""
+        row = connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Describe the mirror.
+
+        Returns:
+            Dictionary with the record count and the times (epoch seconds,
+            None if never) of the last sync and the last full sync
+        """
+        if not os.path.exists(self.path):
+            return {"records": 0, "last_sync": None, "last_full_sync": None}
+        with self._connect() as connection:
+            return {
+                "records": connection.execute("SELECT COUNT(*) FROM records").fetchone()[0],
+                "last_sync": self._meta(connection, "last_sync"),
+                "last_full_sync": self._meta(connection, "last_full_sync"),
+            }
+
+    @staticmethod
+    def modified_since_formula(since: float) -> str:
+        """
+        Airtable formula matching records created or modified after a time.
+
+        Args:
+            since: Epoch seconds
+
+        Returns:
+            Formula for the filterByFormula parameter
+        """
+        stamp = datetime.fromtimestamp(since, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        return (
+            f"OR(IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{stamp}')), "
+            f"IS_AFTER(CREATED_TIME(), DATETIME_PARSE('{stamp}')))"
+        )
+
+    @staticmethod
+    def _rows(records: Iterable[Dict[str, Any]]) -> List[tuple]:
+        """Turn Airtable records into rows of the records table."""
+        return [
+            (record["id"], record.get("createdTime"), json.dumps(record["fields"], ensure_ascii=False))
+            for record in records
+        ]
+
+    def _full_sync_due(self, connection: sqlite3.Connection, full: Optional[bool], now: float) -> bool:
+        """Decide whether a sync downloads the whole table (see sync)."""
+        if full is None:
+            last_full_sync = self._meta(connection, "last_full_sync")
+            return last_full_sync is None or now - last_full_sync >= self.full_sync_interval
+        return full or self._meta(connection, "last_sync") is None
+
+    def needs_full_sync(self) -> bool:
+        """Whether the next default sync will download the whole table."""
+        if not os.path.exists(self.path):
+            return True
+        with self._connect() as connection:
+            return self._full_sync_due(connection, None, time.time())
+
+    def sync_pages(self, full: Optional[bool] = None) -> Generator[List[Dict[str, Any]], None, SyncResult]:
+        """
+        Sync the mirror, yielding each page of downloaded records once it is stored.
+
+        The sync is committed when the generator is exhausted; closing it
+        early rolls the sync back.
+
+        Args:
+            full: See sync
+
+        Returns:
+            SyncResult (as the generator's return value)
+        """
+        with _sync_lock(self.path), self._connect() as connection:
+            started = time.time()
+            last_sync = self._meta(connection, "last_sync")
+            full = self._full_sync_due(connection, full, started)
+
+            table = self.api.table(self.base_id, self.table_name)
+            fetched = 0
+            if full:
+                # Readers keep seeing the previous copy until this transaction commits
+                connection.execute("DELETE FROM records")
+                pages = table.iterate()
+            else:
+                pages = table.iterate(formula=self.modified_since_formula(last_sync - SYNC_OVERLAP_SECONDS))
+
+            for page in pages:
+                connection.executemany(UPSERT_SQL, self._rows(page))
+                fetched += len(page)
+                yield page
+
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_sync', ?)", (started,))
+            if full:
+                connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_full_sync', ?)", (started,))
+            total = connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+        return SyncResult(full=full, fetched=fetched, total=total, elapsed=time.time() - started)
+
+    def sync(self, full: Optional[bool] = None) -> SyncResult:
+        """
+        Bring the mirror up to date with Airtable.
+
+        Args:
+            full: Force (True) or forbid (False) a full download; by default a
+                full download happens when the mirror is empty or its last
+                full sync is older than full_sync_interval
+
+        Returns:
+            SyncResult with the number of records downloaded
+        """
+        pages = self.sync_pages(full)
+        while True:
+            try:
+                next(pages)
+            except StopIteration as done:
+                return done.value
+
+    def delete(self, record_ids: Iterable[str]) -> int:
+        """
+        Remove records deleted in Airtable through this app.
+
+        Delta syncs cannot see deletions, so without this the records would
+        stay in the mirror until the next full sync.
+
+        Args:
+            record_ids: IDs of the deleted records
+
+        Returns:
+            Number of records removed from the mirror
+        """
+        record_ids = list(record_ids)
+        if not record_ids or not os.path.exists(self.path):
+            return 0
+        removed = 0
+        with self._connect() as connection:
+            for start in range(0, len(record_ids), DELETE_CHUNK_IDS):
+                chunk = record_ids[start:start + DELETE_CHUNK_IDS]
+                placeholders = ", ".join("?" * len(chunk))
+                removed += connection.execute(f"DELETE FROM records WHERE id IN ({placeholders})", chunk).rowcount
+        return removed
+
+    @staticmethod
+    def _frame(rows: List[tuple]) -> pd.DataFrame:
+        """Build a DataFrame from (id, fields JSON) rows."""
+        data = []
+        for record_id, fields in rows:
+            row = json.loads(fields)
+            row['id'] = record_id
+            data.append(row)
+        return pd.DataFrame(data)
+
+    def iter_chunks(self, chunk_rows: int = MIRROR_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """
+        Read the mirrored table in DataFrame chunks of up to chunk_rows rows.
+
+        Only one chunk of decoded records is held at a time.
+        """
+        if not os.path.exists(self.path):
+            return
+        with self._connect() as connection:
+            cursor = connection.execute("SELECT id, fields FROM records ORDER BY rowid")
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                yield self._frame(rows)
+
+    def load(self) -> pd.DataFrame:
+        """
+        Read the mirrored table as a DataFrame of its fields plus an 'id' column.
+
+        Rows keep the order in which Airtable listed them; records created
+        since the last full sync come last.
+        """
+        chunks = list(self.iter_chunks())
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
@@ -0,0 +1,108 @@
+"""
+Visit Merge Utilities for Koteria App
+
+Combines several parsed visit exports into one dataset without duplicate
+visits, using a vectorized hash index over a normalized visit key.
+"""
+
+import pandas as pd
+from typing import List, Tuple
+
+
+# Columns identifying a visit across exports
+VISIT_KEY_COLUMNS = ["data", "typ", "id_zwierzecia", "wlasciciel"]
+
+
+class VisitMerger:
+    """Incrementally merges visit DataFrames, dropping visits already added."""
+
+    def __init__(self):
+        """Initialize an empty merge with no indexed visits."""
+        self._index = pd.Index([], dtype="uint64")
+        self._frames = []
+        self.report = []
+
+    @staticmethod
+    def visit_hashes(df: pd.DataFrame) -> pd.Series:
+        """
+        Hash the normalized visit key of every row.
+
+        Strings are trimmed, lower-cased and whitespace-collapsed, and missing
+        values count as empty. Visits sharing a key inside one export (e.g.
+        two procedures in the same minute) are told apart by occurrence number,
+        so they are matched one-to-one against other exports.
+
+        Args:
+            df: DataFrame returned by read_html
+
+        Returns:
+            Series of uint64 hashes aligned with df
+        """
+        keys = pd.DataFrame(index=df.index)
+        for col in VISIT_KEY_COLUMNS:
+            values = df[col] if col in df.columns else pd.Series("", index=df.index)
+            keys[col] = (
+                values.astype("string")
+                .fillna("")
+                .str.strip()
+                .str.lower()
+                .str.replace(r"\s+", " ", regex=True)
+            )
+
+        base = pd.util.hash_pandas_object(keys, index=False)
+        occurrence = base.groupby(base).cumcount()
+        return pd.util.hash_pandas_object(
+            pd.DataFrame({"key": base.to_numpy(), "occurrence": occurrence.to_numpy()}),
+            index=False
+        ).set_axis(df.index)
+
+    def add(self, name: str, df: pd.DataFrame) -> int:
+        """
+        Add the visits of one export that are not already in the merge.
+
+        Args:
+            name: File name reported for this export
+            df: DataFrame returned by read_html
+
+        Returns:
+            Number of visits added
+        """
+        hashes = self.visit_hashes(df)
+        is_new = ~hashes.isin(self._index)
+        added = df[is_new.to_numpy()]
+
+        self._index = self._index.append(pd.Index(hashes[is_new].to_numpy(), dtype="uint64"))
+        self._frames.append(added)
+        self.report.append({
+            "file": name,
+            "rows": len(df),
+            "added": len(added),
+            "duplicates": len(df) - len(added)
+        })
+        return len(added)
+
+    def result(self) -> pd.DataFrame:
+        """Return the merged visits in the order they were added."""
+        if not self._frames:
+            return pd.DataFrame()
+        return pd.concat(self._frames, ignore_index=True)
+
+    def report_frame(self) -> pd.DataFrame:
+        """Return per-file counts of rows, added visits and dropped duplicates."""
+        return pd.DataFrame(self.report, columns=["file", "rows", "added", "duplicates"])
+
+
+def merge_visits(frames: List[Tuple[str, pd.DataFrame]]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Merge several parsed exports into one dataset without duplicate visits.
+
+    Args:
+        frames: List of (file name, DataFrame) pairs, in priority order
+
+    Returns:
+        Tuple of the merged DataFrame and the per-file report
+    """
+    merger = VisitMerger()
+    for name, df in frames:
+        merger.add(name, df)
+    return merger.result(), merger.report_frame()
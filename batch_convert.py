@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Batch conversion of HTML visit exports to a year-partitioned Parquet dataset
+
+Parses every given export, merges overlapping ones without duplicate visits
+and writes data/processed/visits/year=YYYY/*.parquet (zstd).
+
+Usage:
+    python batch_convert.py data/raw/Wizyty2024.html data/raw/Wizyty2025.html [--output DIR]
+"""
+import argparse
+import os
+import sys
+sys.path.append('.')
+
+from app.utils.html_processor import read_html
+from app.utils.visit_merge import merge_visits
+from app.utils.exports import write_year_partitioned
+
+DEFAULT_OUTPUT_DIR = os.path.join("data", "processed", "visits")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("exports", nargs="+", help="HTML visit exports, in priority order")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="Dataset directory")
+    parser.add_argument("--backend", default="tokenizer", help="HTML text-extraction backend")
+    args = parser.parse_args()
+
+    frames = [
+        (os.path.basename(path), read_html(path, os.path.basename(path), backend=args.backend))
+        for path in args.exports
+    ]
+    df, report = merge_visits(frames)
+    print(report.to_string(index=False))
+
+    write_year_partitioned(df, args.output)
+    years = df["data"].dt.year.value_counts().sort_index()
+    for year, count in years.items():
+        print(f"{args.output}/year={year}: {count} visits")
+
+
+if __name__ == "__main__":
+    main()
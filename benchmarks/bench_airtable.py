@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Airtable throughput benchmark against the local fake Airtable server
+
+Starts benchmarks/fake_airtable.py in-process, seeds a synthetic
+transactions table and measures records/s through the app's real client
+stack (shared rate-limited session, AirtableManager, TableMirror,
+ChunkedCsvUploader) for each path:
+
+    fetch        AirtableManager.fetch_table of the whole table
+    fetch_query  fetch with fields, a filter formula and a sort pushed down
+    upload       ChunkedCsvUploader.run of a CSV with --records rows
+    sync_full    first TableMirror sync (full download into SQLite)
+    sync_delta   TableMirror sync after 1% of the records changed (records/s
+                 counts the whole table brought up to date)
+
+Runs offline. The client keeps Airtable's 5 requests/s per base unless
+--client-rps is raised; pass --server-rps to also make the fake server
+answer 429 above a rate. Results are written as JSON (with the git commit)
+so runs can be compared across commits.
+
+Usage:
+    python benchmarks/bench_airtable.py [--records 5000] [--paths fetch upload ...]
+                                        [--latency 0.02] [--page-size 100]
+                                        [--client-rps 5] [--server-rps 0] [--retry-after 1]
+                                        [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+sys.path.append('.')
+
+import pandas as pd
+
+from app.utils.airtable import AirtableManager, TableQuery, any_of_formula
+from app.utils.csv_upload import ChunkedCsvUploader
+from app.utils.rate_limit import base_guard
+from app.utils.table_cache import TableCache
+from benchmarks.bench_parser import RESULTS_DIR, git_commit
+from benchmarks.fake_airtable import MAX_PAGE_SIZE, FakeAirtable, synthetic_transactions
+
+BASE_ID = "appBenchmark"
+TABLE = "transactions"
+UPLOAD_TABLE = "uploads"
+
+# Share of the records changed before the delta sync
+DELTA_FRACTION = 0.01
+
+
+def run_fetch(fake, manager, n):
+    return len(manager.fetch_table(TABLE))
+
+
+def run_fetch_query(fake, manager, n):
+    query = TableQuery(TABLE, fields=["account_id", "amount", "timestamp"],
+                       formula=any_of_formula("account_id", ["4000", "4100"]), sort=["-timestamp"])
+    return len(manager.fetch_table(query))
+
+
+def run_upload(fake, manager, n, checkpoint_dir):
+    content = pd.DataFrame(synthetic_transactions(n, seed=1)).to_csv(index=False).encode()
+    uploader = ChunkedCsvUploader(manager, UPLOAD_TABLE, content, checkpoint_dir=checkpoint_dir)
+    checkpoint = uploader.run()
+    if checkpoint.failures:
+        raise RuntimeError(f"{len(checkpoint.failures)} records failed to upload: {checkpoint.failures[0]['error']}")
+    return checkpoint.uploaded
+
+
+def run_sync_full(fake, manager, n):
+    return manager.mirror(TABLE).sync(full=True).fetched
+
+
+def run_sync_delta(fake, manager, n):
+    mirror = manager.mirror(TABLE)
+    if mirror.status()["last_sync"] is None:
+        mirror.sync(full=True)
+    changed = list(fake.table(BASE_ID, TABLE).records)[:max(1, int(n * DELTA_FRACTION))]
+    fake.touch(BASE_ID, TABLE, changed, {"description": "changed"})
+    return mirror.sync(full=False).total
+
+
+# Benchmarked paths by name
+PATHS = {
+    "fetch": run_fetch,
+    "fetch_query": run_fetch_query,
+    "upload": run_upload,
+    "sync_full": run_sync_full,
+    "sync_delta": run_sync_delta,
+}
+
+
+def measure(path, fake, manager, n, work_dir):
+    """Run one path and report records/s with the requests it took."""
+    server_before = dict(fake.stats)
+    client_before = base_guard(BASE_ID).metrics()
+    args = (fake, manager, n, work_dir) if path == "upload" else (fake, manager, n)
+
+    start = time.perf_counter()
+    records = PATHS[path](*args)
+    elapsed = time.perf_counter() - start
+
+    client_after = base_guard(BASE_ID).metrics()
+    return {
+        "path": path,
+        "records": records,
+        "seconds": elapsed,
+        "records_per_sec": records / elapsed if elapsed else None,
+        "requests": fake.stats["requests"] - server_before["requests"],
+        "throttled": fake.stats["throttled"] - server_before["throttled"],
+        "retries": client_after["retries"] - client_before["retries"],
+        "rate_limit_wait": round(client_after["rate_limit_wait"] - client_before["rate_limit_wait"], 3),
+    }
+
+
+def compare(baseline_path, results):
+    """Print the speed ratio of each path against a previous results file."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {run["path"]: run for run in baseline["runs"]}
+
+    print(f"\n=== Compared with {baseline_path} (commit {baseline.get('commit')}) ===")
+    for run in results["runs"]:
+        old = previous.get(run["path"])
+        if old is None or not old["records_per_sec"]:
+            continue
+        print(f"{run['path']:<12} speed {run['records_per_sec'] / old['records_per_sec']:.2f}x  "
+              f"requests {run['requests']} (was {old['requests']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=5000, help="Records in the seeded table and the uploaded CSV")
+    parser.add_argument("--paths", nargs="+", choices=list(PATHS), default=list(PATHS))
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the fake server adds to each response")
+    parser.add_argument("--page-size", type=int, default=MAX_PAGE_SIZE)
+    parser.add_argument("--client-rps", type=float, default=None,
+                        help="Client requests/s per base (default: the app's limit, 5)")
+    parser.add_argument("--server-rps", type=float, default=0, help="Fake server limit before 429s (0 for none)")
+    parser.add_argument("--retry-after", type=float, default=1, help="Retry-After of the fake server's 429s")
+    parser.add_argument("--output", help=f"Results file (default: {RESULTS_DIR}/airtable-<commit>.json)")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    limiter = base_guard(BASE_ID).limiter
+    if args.client_rps:
+        limiter.rate = limiter.capacity = limiter.tokens = args.client_rps
+
+    commit = git_commit()
+    results = {
+        "benchmark": "airtable",
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "settings": {
+            "records": args.records,
+            "latency": args.latency,
+            "page_size": args.page_size,
+            "client_rps": limiter.rate,
+            "server_rps": args.server_rps or None,
+        },
+        "runs": [],
+    }
+
+    print(f"=== {args.records} records, {args.latency * 1000:.0f} ms latency, pages of {args.page_size}, "
+          f"client {limiter.rate:g} req/s, server limit {args.server_rps or 'none'} ===")
+    with FakeAirtable(latency=args.latency, page_size=args.page_size,
+                      requests_per_second=args.server_rps or None, retry_after=args.retry_after) as fake, \
+            tempfile.TemporaryDirectory() as work_dir:
+        # Created an hour ago, so delta syncs only pick up the records changed later
+        fake.seed(BASE_ID, TABLE, synthetic_transactions(args.records), created=time.time() - 3600)
+        manager = AirtableManager(api_key="benchmark", base_id=BASE_ID, cache=TableCache(),
+                                  endpoint_url=fake.url, mirror_dir=os.path.join(work_dir, "mirror"))
+        # Fetch paths measure the API, not the mirror
+        fetch_manager = AirtableManager(api_key="benchmark", base_id=BASE_ID, cache=TableCache(),
+                                        endpoint_url=fake.url)
+
+        for path in args.paths:
+            run = measure(path, fake, fetch_manager if path.startswith("fetch") else manager,
+                          args.records, work_dir)
+            results["runs"].append(run)
+            print(f"{path:<12} {run['records']:>8} records {run['seconds']:8.2f} s "
+                  f"{run['records_per_sec']:9.0f} records/s  {run['requests']:>5} requests  "
+                  f"{run['throttled']} throttled")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"airtable-{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
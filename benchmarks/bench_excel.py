@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Excel export benchmark: pandas to_excel vs the streaming write-only writer
+
+Builds visit frames of the requested sizes (a parsed synthetic export tiled
+to size, so dtypes match read_html output, datetimes included) and exports
+each with both writers in a fresh process, recording wall time, rows/s and
+peak resident memory.
+
+Usage:
+    python benchmarks/bench_excel.py [--sizes 10000 100000 1000000] [--writers pandas streaming]
+"""
+import argparse
+import multiprocessing
+import resource
+import sys
+import time
+sys.path.append('.')
+
+import pandas as pd
+
+from app.utils.exports import write_excel, write_excel_pandas
+from app.utils.html_processor import HTMLProcessor
+from benchmarks.bench_parser import max_rss_mb
+from benchmarks.synthetic import generate_export
+
+# Distinct visits parsed before tiling the frame to size
+SEED_VISITS = 2000
+
+# Excel writers by name
+WRITERS = {
+    "pandas": write_excel_pandas,
+    "streaming": write_excel,
+}
+
+
+def visit_frame(rows):
+    """Return a read_html-shaped frame with the given number of rows."""
+    seed = HTMLProcessor.read_html(generate_export(SEED_VISITS), "synthetic", backend="tokenizer")
+    repeats = -(-rows // len(seed))
+    df = pd.concat([seed] * repeats, ignore_index=True).iloc[:rows]
+    # Spread the dates so the tiles do not repeat exactly
+    df["data"] = df["data"] + pd.to_timedelta(df.index // len(seed), unit="D")
+    return df
+
+
+def measure(writer, rows, queue):
+    """Build the frame, then export it with one writer in this (fresh) process."""
+    df = visit_frame(rows)
+    baseline_rss = max_rss_mb(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    data = WRITERS[writer](df)
+    elapsed = time.perf_counter() - start
+    queue.put({
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed else None,
+        "file_mb": len(data) / 1024 / 1024,
+        "peak_rss_delta_mb": max_rss_mb(resource.RUSAGE_SELF) - baseline_rss,
+    })
+
+
+def run_isolated(writer, rows):
+    """Run one export in a spawned process so peak memory is not shared between runs."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=measure, args=(writer, rows, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                        help="Row counts to export (1000000 takes several minutes per writer)")
+    parser.add_argument("--writers", nargs="+", choices=sorted(WRITERS), default=sorted(WRITERS))
+    args = parser.parse_args()
+
+    for rows in args.sizes:
+        print(f"=== {rows} rows ===")
+        for writer in args.writers:
+            run = run_isolated(writer, rows)
+            print(f"{writer:<10} {run['seconds']:9.2f} s  {run['rows_per_sec']:9.0f} rows/s  "
+                  f"{run['file_mb']:7.1f} MB file  peak +{run['peak_rss_delta_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Data grid benchmark on a large Airtable-like table
+
+Times the server-side work behind the grid: building a sort order and a
+filter mask (done once, then cached), slicing one page of rows (done on
+every page flip) and serializing the page versus the whole frame.
+
+Usage:
+    python benchmarks/bench_grid.py [--rows 500000] [--page-size 50]
+"""
+import argparse
+import sys
+import time
+sys.path.append('.')
+
+import numpy as np
+import pandas as pd
+
+from app.utils.data_grid import DataGrid
+from app.utils.exports import write_arrow_ipc
+
+
+def airtable_frame(rows, seed=0):
+    """Return a transactions-like frame with numbers, dates, codes and text."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "amount": rng.normal(100, 50, rows).round(2),
+        "account_id": rng.choice(["3000", "3100", "4000", "5000", "6000"], rows),
+        "timestamp": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 10 ** 8, rows), unit="s"),
+        "description": [f"Transaction {i}" for i in range(rows)],
+    })
+
+
+def timed(label, func):
+    """Run func once and print its wall time; returns its result."""
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<32} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    df = airtable_frame(args.rows)
+    print(f"=== {args.rows} rows ===")
+
+    for column in ["amount", "timestamp", "description"]:
+        timed(f"sort order ({column})", lambda: DataGrid.sort_order(df, column, ascending=False))
+    timed("filter mask (amount >= 150)", lambda: DataGrid.filter_mask(df, "amount", ">= 150"))
+    timed("filter mask (text contains)", lambda: DataGrid.filter_mask(df, "description", "99"))
+
+    order = DataGrid.sort_order(df, "timestamp", ascending=False)
+    mask = DataGrid.filter_mask(df, "account_id", "4000")
+    last_page = DataGrid.page_count(int(mask.sum()), args.page_size)
+    for page in [1, last_page // 2, last_page]:
+        timed(f"page flip (page {page})", lambda: df.iloc[
+            DataGrid.page_positions(len(df), order, mask, page, args.page_size)[0]
+        ])
+
+    # st.dataframe sends its frame to the browser as Arrow IPC
+    page_df = df.iloc[DataGrid.page_positions(len(df), order, mask, 1, args.page_size)[0]]
+    timed("serialize one page", lambda: write_arrow_ipc(page_df))
+    timed("serialize full frame (previous)", lambda: write_arrow_ipc(df))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-upload ingestion path of the File Converter
+
+Compares the previous path (two getvalue() copies, MD5 in convert_file,
+argument hashing by st.cache_data, NamedTemporaryFile round-trip) with
+hashing the upload buffer once and parsing it in memory.
+
+Usage:
+    python benchmarks/bench_ingest.py [--repeat N] [--backend NAME]
+"""
+import argparse
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.append('.')
+
+from app.utils.html_processor import HTMLProcessor, TEXT_BACKENDS
+from app.utils.parse_cache import ParseCache
+
+FIXTURES = [
+    os.path.join("data", "raw", "Wizyty2025.html"),
+    os.path.join("data", "raw", "Wizyty2024.html"),
+]
+
+
+def legacy_ingest(upload, backend):
+    """Upload path before in-memory ingestion."""
+    file_hash = hashlib.md5(upload.getvalue()).hexdigest()
+    content = upload.getvalue()
+    # st.cache_data hashes the bytes argument again
+    hashlib.md5(content).hexdigest()
+    with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.html') as tmp_file:
+        tmp_file.write(content)
+        tmp_file_path = tmp_file.name
+    try:
+        return file_hash, HTMLProcessor.read_html(tmp_file_path, "upload.html", backend=backend)
+    finally:
+        os.unlink(tmp_file_path)
+
+
+def in_memory_ingest(upload, backend):
+    """Upload path reading and hashing the payload once and parsing it in memory."""
+    content = upload.getvalue()
+    content_hash = ParseCache.content_hash(content)
+    return content_hash, HTMLProcessor.read_html(content, "upload.html", backend=backend)
+
+
+def measure(ingest, payload, backend, repeat):
+    """Return best wall time and peak traced memory (bytes) for one ingestion path."""
+    best = None
+    for _ in range(repeat):
+        upload = io.BytesIO(payload)
+        start = time.perf_counter()
+        ingest(upload, backend)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    upload = io.BytesIO(payload)
+    tracemalloc.start()
+    ingest(upload, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backend", choices=sorted(TEXT_BACKENDS), default="tokenizer")
+    args = parser.parse_args()
+
+    print(f"=== Upload ingestion ({args.backend} backend) ===")
+    for file_path in FIXTURES:
+        with open(file_path, "rb") as f:
+            payload = f.read()
+        print(f"{os.path.basename(file_path)} ({len(payload) / 1024:.0f} KB)")
+        for name, ingest in (("legacy", legacy_ingest), ("in-memory", in_memory_ingest)):
+            elapsed, peak = measure(ingest, payload, args.backend, args.repeat)
+            print(f"  {name:<10} {elapsed * 1000:8.1f} ms  peak {peak / 1024:8.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
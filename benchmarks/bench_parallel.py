@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark serial vs parallel parsing of one HTML visit export
+
+Usage:
+    python benchmarks/bench_parallel.py [path/to/export.html] [--repeat N] [--backend NAME]
+"""
+import argparse
+import os
+import sys
+import time
+sys.path.append('.')
+
+from app.utils.html_processor import HTMLProcessor, DEFAULT_TEXT_BACKEND, TEXT_BACKENDS
+
+
+def time_parse(file_path, workers, repeat, backend=DEFAULT_TEXT_BACKEND):
+    """Return the best wall time of `repeat` parses and the parsed row count."""
+    best = None
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if workers == 1:
+            df = HTMLProcessor.read_html(file_path, os.path.basename(file_path), backend=backend)
+        else:
+            df = HTMLProcessor.read_html_parallel(file_path, workers, min_visits=0, backend=backend)
+        elapsed = time.perf_counter() - start
+        rows = len(df)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("file_path", nargs="?", default=os.path.join("data", "raw", "Wizyty2024.html"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", choices=sorted(TEXT_BACKENDS), default=DEFAULT_TEXT_BACKEND)
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpu_count})
+
+    print(f"=== Parsing {args.file_path} ({cpu_count} CPU cores, {args.backend} backend) ===")
+    serial_time, rows = time_parse(args.file_path, 1, args.repeat, args.backend)
+    print(f"workers=1  {serial_time:8.3f} s  {rows / serial_time:10.0f} visits/s  speedup 1.00x")
+
+    for workers in worker_counts:
+        if workers == 1:
+            continue
+        elapsed, rows = time_parse(args.file_path, workers, args.repeat, args.backend)
+        print(f"workers={workers:<2} {elapsed:8.3f} s  {rows / elapsed:10.0f} visits/s  "
+              f"speedup {serial_time / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Parser benchmark suite over synthetic visit exports
+
+Generates exports of the requested sizes, then runs every parser mode in a
+fresh process and records wall time, visits/s and peak resident memory.
+Results are written as JSON (with the git commit) so runs can be compared
+across commits.
+
+Usage:
+    python benchmarks/bench_parser.py [--sizes 1000 10000 100000] [--modes tokenizer stream ...]
+                                      [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+sys.path.append('.')
+
+import pandas as pd
+
+from app.utils.html_processor import HTMLProcessor, TEXT_BACKENDS
+from benchmarks.synthetic import write_export
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+
+# Visits per DataFrame in the streaming mode
+STREAM_BATCH_SIZE = 10000
+
+
+def run_serial(path, backend):
+    return len(HTMLProcessor.read_html(path, path, backend=backend))
+
+
+def run_stream(path):
+    # Batches are dropped after use, as a converter writing them out would do
+    return sum(len(batch) for batch in HTMLProcessor.iter_visits(path, STREAM_BATCH_SIZE, "tokenizer"))
+
+
+def run_parallel(path):
+    return len(HTMLProcessor.read_html_parallel(path, workers=None, min_visits=0, backend="tokenizer"))
+
+
+def run_compact(path):
+    return len(HTMLProcessor.read_html(path, path, backend="tokenizer", compact=True))
+
+
+# Parser modes by name
+MODES = {
+    **{backend: (lambda path, backend=backend: run_serial(path, backend)) for backend in TEXT_BACKENDS},
+    "stream": run_stream,
+    "parallel": run_parallel,
+    "compact": run_compact,
+}
+
+
+def max_rss_mb(who):
+    """Peak resident set size in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    rss = resource.getrusage(who).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def measure(mode, path, queue):
+    """Run one mode in this (fresh) process and report its measurements."""
+    baseline_rss = max_rss_mb(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    visits = MODES[mode](path)
+    elapsed = time.perf_counter() - start
+    queue.put({
+        "visits": visits,
+        "seconds": elapsed,
+        "visits_per_sec": visits / elapsed if elapsed else None,
+        "peak_rss_mb": max_rss_mb(resource.RUSAGE_SELF),
+        "peak_rss_delta_mb": max_rss_mb(resource.RUSAGE_SELF) - baseline_rss,
+        "peak_child_rss_mb": max_rss_mb(resource.RUSAGE_CHILDREN),
+    })
+
+
+def run_isolated(mode, path):
+    """Run a mode in a spawned process so peak memory is not shared between runs."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=measure, args=(mode, path, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def git_commit():
+    """Return the current git commit, or None outside a repository."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(baseline_path, results):
+    """Print the speed and memory ratio of each run against a previous results file."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(run["mode"], run["visits"]): run for run in baseline["runs"]}
+
+    print(f"\n=== Compared with {baseline_path} (commit {baseline.get('commit')}) ===")
+    for run in results["runs"]:
+        old = previous.get((run["mode"], run["visits"]))
+        if old is None:
+            continue
+        print(f"{run['mode']:<10} {run['visits']:>9} visits  "
+              f"speed {run['visits_per_sec'] / old['visits_per_sec']:.2f}x  "
+              f"peak memory {run['peak_rss_delta_mb'] / max(old['peak_rss_delta_mb'], 0.1):.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Visit counts of the synthetic exports (up to 1000000)")
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=sorted(MODES))
+    parser.add_argument("--data-dir", help="Directory for the generated exports (default: temporary)")
+    parser.add_argument("--output", help=f"Results file (default: {RESULTS_DIR}/parser-<commit>.json)")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = {
+        "benchmark": "parser",
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "runs": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.data_dir or tmp_dir
+        os.makedirs(data_dir, exist_ok=True)
+
+        for size in args.sizes:
+            path = os.path.join(data_dir, f"synthetic_{size}.html")
+            if not os.path.exists(path):
+                write_export(path, size)
+            file_mb = os.path.getsize(path) / 1024 / 1024
+            print(f"=== {size} visits ({file_mb:.1f} MB) ===")
+
+            for mode in args.modes:
+                run = run_isolated(mode, path)
+                run.update({"mode": mode, "visits": size, "file_mb": file_mb})
+                results["runs"].append(run)
+                print(f"{mode:<10} {run['seconds']:9.3f} s  {run['visits_per_sec']:10.0f} visits/s  "
+                      f"peak +{run['peak_rss_delta_mb']:.1f} MB")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"parser-{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
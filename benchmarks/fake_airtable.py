@@ -0,0 +1,617 @@
+#!/usr/bin/env python3
+"""
+In-process fake of the Airtable REST API for offline benchmarks and tests
+
+Serves the record endpoints used by AirtableManager over real HTTP, so the
+whole client stack (pyairtable, the rate-limited session, retries) runs as
+it would against Airtable:
+
+    GET    /v0/{base}/{table}               list, with pageSize, offset, fields[],
+                                            filterByFormula, sort and maxRecords
+    POST   /v0/{base}/{table}/listRecords   list, with the options as JSON
+    POST   /v0/{base}/{table}               create one record or a batch of up to 10
+    PATCH  /v0/{base}/{table}               update or upsert a batch of up to 10
+    PATCH  /v0/{base}/{table}/{record_id}   update one record
+    DELETE /v0/{base}/{table}/{record_id}   delete one record
+    DELETE /v0/{base}/{table}?records[]=... delete a batch of up to 10
+
+Tables are created on first use. Each response is delayed by `latency`
+seconds, and a base receiving more than `requests_per_second` requests in
+one second gets 429 responses. Formulas support field references, string
+and number literals, comparisons, AND/OR/NOT, TRUE/FALSE/BLANK and the
+date functions used for incremental syncs (IS_AFTER, IS_BEFORE,
+DATETIME_PARSE, CREATED_TIME, LAST_MODIFIED_TIME).
+
+Usage:
+    python benchmarks/fake_airtable.py [--port 8765] [--records 10000] [--table transactions]
+                                       [--latency 0.05] [--page-size 100] [--requests-per-second 5]
+
+Point the app at it with endpoint_url = "http://127.0.0.1:8765" under [airtable]
+in .streamlit/secrets.toml.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Largest page Airtable serves, and records accepted per write request
+MAX_PAGE_SIZE = 100
+MAX_RECORDS_PER_REQUEST = 10
+
+# Requests per second Airtable accepts for one base
+DEFAULT_REQUESTS_PER_SECOND = 5
+
+# Retry-After sent with 429 responses (Airtable asks clients to wait 30 seconds)
+DEFAULT_RETRY_AFTER = 30
+
+PATH_RE = re.compile(r"^/v0/(app[A-Za-z0-9]+)/([^/]+)(?:/([^/]+))?$")
+SORT_PARAM_RE = re.compile(r"^sort\[(\d+)\]\[(field|direction)\]$")
+TOKEN_RE = re.compile(r"""\s*(?:
+    (?P<field>\{[^}]*\})
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op>!=|>=|<=|[=<>(),])
+)""", re.VERBOSE)
+
+
+class FakeAirtableError(Exception):
+    """An error response: HTTP status, Airtable error type and message."""
+
+    def __init__(self, status: int, error_type: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.error_type = error_type
+
+
+def format_time(timestamp: float) -> str:
+    """Airtable's timestamp format, e.g. 2025-01-01T12:00:00.000Z."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.") + \
+        f"{int(timestamp % 1 * 1000):03d}Z"
+
+
+def parse_time(value: Any) -> Optional[float]:
+    """Timestamp of an ISO date string, or None."""
+    if not value:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        raise FakeAirtableError(422, "INVALID_FILTER_BY_FORMULA", f"Cannot parse date '{value}'")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def tokenize(formula: str) -> List[tuple]:
+    """Split a formula into (kind, text) tokens."""
+    tokens = []
+    position = 0
+    formula = formula.rstrip()
+    while position < len(formula):
+        match = TOKEN_RE.match(formula, position)
+        if match is None:
+            raise FakeAirtableError(422, "INVALID_FILTER_BY_FORMULA",
+                                    f"Unexpected character in formula at {position}: {formula!r}")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+
+def parse_formula(formula: str):
+    """
+    Parse a formula into a tree of ("field", name), ("value", v),
+    ("call", name, args) and ("compare", op, left, right) nodes.
+    """
+    tokens = tokenize(formula)
+    position = 0
+
+    def invalid(message):
+        return FakeAirtableError(422, "INVALID_FILTER_BY_FORMULA", f"{message}: {formula!r}")
+
+    def peek():
+        return tokens[position] if position < len(tokens) else (None, None)
+
+    def take(text=None):
+        nonlocal position
+        token = peek()
+        if token[0] is None or (text is not None and token[1] != text):
+            raise invalid(f"Expected {text or 'a value'}")
+        position += 1
+        return token
+
+    def operand():
+        kind, text = take()
+        if kind == "field":
+            return ("field", text[1:-1])
+        if kind == "string":
+            return ("value", re.sub(r"\\(.)", r"\1", text[1:-1]))
+        if kind == "number":
+            return ("value", float(text))
+        if kind == "name":
+            take("(")
+            args = []
+            if peek()[1] != ")":
+                args.append(expression())
+                while peek()[1] == ",":
+                    take(",")
+                    args.append(expression())
+            take(")")
+            return ("call", text.upper(), args)
+        if text == "(":
+            node = expression()
+            take(")")
+            return node
+        raise invalid(f"Unexpected '{text}'")
+
+    def expression():
+        left = operand()
+        if peek()[0] == "op" and peek()[1] in ("=", "!=", "<", ">", "<=", ">="):
+            op = take()[1]
+            return ("compare", op, left, operand())
+        return left
+
+    tree = expression()
+    if position != len(tokens):
+        raise invalid("Unexpected text after the formula")
+    return tree
+
+
+def comparable(left: Any, right: Any):
+    """Coerce two values for comparison the way Airtable formulas loosely do."""
+    left = "" if left is None else left
+    right = "" if right is None else right
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+        return left, right
+    if isinstance(left, (int, float)) or isinstance(right, (int, float)):
+        try:
+            return float(left), float(right)
+        except (TypeError, ValueError):
+            pass
+    return str(left), str(right)
+
+
+def sort_key(value: Any) -> tuple:
+    """Order numbers before text, with empty values last."""
+    if value is None or value == "":
+        return (2, 0)
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, str(value))
+
+
+COMPARISONS = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    ">": lambda a, b: a > b,
+    "<=": lambda a, b: a <= b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+def evaluate(node, record: Dict[str, Any]) -> Any:
+    """Evaluate a parsed formula against a stored record."""
+    kind = node[0]
+    if kind == "field":
+        return record["fields"].get(node[1])
+    if kind == "value":
+        return node[1]
+    if kind == "compare":
+        left, right = comparable(evaluate(node[2], record), evaluate(node[3], record))
+        return COMPARISONS[node[1]](left, right)
+
+    name, args = node[1], node[2]
+    if name == "AND":
+        return all(evaluate(arg, record) for arg in args)
+    if name == "OR":
+        return any(evaluate(arg, record) for arg in args)
+    if name == "NOT" and len(args) == 1:
+        return not evaluate(args[0], record)
+    if name in ("TRUE", "FALSE", "BLANK") and not args:
+        return {"TRUE": True, "FALSE": False, "BLANK": None}[name]
+    if name == "CREATED_TIME" and not args:
+        return record["created"]
+    if name == "LAST_MODIFIED_TIME" and not args:
+        return record["modified"]
+    if name == "DATETIME_PARSE" and args:
+        return parse_time(evaluate(args[0], record))
+    if name in ("IS_AFTER", "IS_BEFORE") and len(args) == 2:
+        left, right = (parse_time(evaluate(arg, record)) for arg in args)
+        if left is None or right is None:
+            return False
+        return left > right if name == "IS_AFTER" else left < right
+    raise FakeAirtableError(422, "INVALID_FILTER_BY_FORMULA", f"Unsupported formula function {name}()")
+
+
+class FakeTable:
+    """Records of one table in insertion order, with creation and modification times."""
+
+    def __init__(self):
+        self.records: Dict[str, Dict[str, Any]] = {}
+
+    def insert(self, fields: Dict[str, Any], now: float) -> Dict[str, Any]:
+        record_id = "rec" + uuid.uuid4().hex[:14]
+        record = self.records[record_id] = {"id": record_id, "created": now, "modified": now, "fields": dict(fields)}
+        return record
+
+    def get(self, record_id: str) -> Dict[str, Any]:
+        record = self.records.get(record_id)
+        if record is None:
+            raise FakeAirtableError(404, "NOT_FOUND", f"Record {record_id} not found")
+        return record
+
+    def update(self, record_id: str, fields: Dict[str, Any], now: float, replace: bool = False) -> Dict[str, Any]:
+        record = self.get(record_id)
+        record["fields"] = dict(fields) if replace else {**record["fields"], **fields}
+        record["modified"] = now
+        return record
+
+
+class FakeAirtable:
+    """
+    Threaded HTTP server faking Airtable's record API, holding tables in memory.
+
+    Use as a context manager (or call start() and stop()) and pass `url` as
+    pyairtable's endpoint_url.
+    """
+
+    def __init__(self, latency: float = 0.0, page_size: int = MAX_PAGE_SIZE,
+                 requests_per_second: Optional[float] = DEFAULT_REQUESTS_PER_SECOND,
+                 retry_after: Optional[float] = DEFAULT_RETRY_AFTER,
+                 host: str = "127.0.0.1", port: int = 0):
+        """
+        Create a server with no tables.
+
+        Args:
+            latency: Seconds each response is delayed by
+            page_size: Largest page served, even if a client asks for more
+            requests_per_second: Requests one base may make per second before
+                getting 429 responses (None for no limit)
+            retry_after: Retry-After seconds sent with 429 responses (None to omit the header)
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+        """
+        self.latency = latency
+        self.page_size = min(page_size, MAX_PAGE_SIZE)
+        self.requests_per_second = requests_per_second
+        self.retry_after = retry_after
+        self.tables: Dict[tuple, FakeTable] = {}
+        self.stats: Dict[str, int] = {"requests": 0, "throttled": 0, "errors": 0, "records_listed": 0,
+                                      "records_written": 0}
+        self._recent: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), FakeAirtableHandler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Endpoint URL to pass to pyairtable (or AirtableManager)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeAirtable":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeAirtable":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def table(self, base_id: str, table_name: str) -> FakeTable:
+        """The table, created if missing."""
+        with self._lock:
+            return self.tables.setdefault((base_id, table_name), FakeTable())
+
+    def seed(self, base_id: str, table_name: str, records: Iterable[Dict[str, Any]],
+             created: Optional[float] = None) -> List[str]:
+        """
+        Insert records directly, without requests or rate limits.
+
+        Args:
+            base_id: Airtable base ID
+            table_name: Table name
+            records: Field dictionaries
+            created: Creation and modification time (default: now)
+
+        Returns:
+            The new record IDs
+        """
+        table = self.table(base_id, table_name)
+        now = time.time() if created is None else created
+        with self._lock:
+            return [table.insert(fields, now)["id"] for fields in records]
+
+    def touch(self, base_id: str, table_name: str, record_ids: Iterable[str], fields: Dict[str, Any]) -> None:
+        """Update records directly (marking them modified now), as another Airtable user would."""
+        table = self.table(base_id, table_name)
+        now = time.time()
+        with self._lock:
+            for record_id in record_ids:
+                table.update(record_id, fields, now)
+
+    def admit(self, base_id: str) -> bool:
+        """Count a request against the base's per-second limit; False if it is over the limit."""
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.requests_per_second is None:
+                return True
+            now = time.monotonic()
+            recent = self._recent.setdefault(base_id, deque())
+            while recent and recent[0] <= now - 1.0:
+                recent.popleft()
+            if len(recent) >= self.requests_per_second:
+                self.stats["throttled"] += 1
+                return False
+            recent.append(now)
+            return True
+
+    @staticmethod
+    def _response_record(record: Dict[str, Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """A stored record as Airtable returns it (empty fields are left out, as Airtable does)."""
+        values = record["fields"]
+        if fields is not None:
+            values = {name: values[name] for name in fields if name in values}
+        return {"id": record["id"], "createdTime": format_time(record["created"]),
+                "fields": {name: value for name, value in values.items() if value not in (None, "", [])}}
+
+    def list_records(self, base_id: str, table_name: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        One page of records.
+
+        Args:
+            options: fields, filterByFormula, sort ([{"field", "direction"}]),
+                maxRecords, pageSize and offset, as in a listRecords body
+        """
+        page_size = min(int(options.get("pageSize") or self.page_size), self.page_size)
+        start = int(options.get("offset") or 0)
+        formula = options.get("filterByFormula")
+        tree = parse_formula(formula) if formula else None
+
+        table = self.table(base_id, table_name)
+        with self._lock:
+            records = list(table.records.values())
+        if tree is not None:
+            records = [record for record in records if evaluate(tree, record)]
+        for sort in reversed(options.get("sort") or []):
+            records.sort(key=lambda record: sort_key(record["fields"].get(sort["field"])),
+                         reverse=sort.get("direction") == "desc")
+        if options.get("maxRecords"):
+            records = records[:int(options["maxRecords"])]
+
+        page = records[start:start + page_size]
+        with self._lock:
+            self.stats["records_listed"] += len(page)
+        response = {"records": [self._response_record(record, options.get("fields")) for record in page]}
+        if start + page_size < len(records):
+            response["offset"] = str(start + page_size)
+        return response
+
+    def create_records(self, base_id: str, table_name: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Create one record ({"fields"}) or a batch ({"records": [{"fields"}]})."""
+        table = self.table(base_id, table_name)
+        now = time.time()
+        if "records" not in body:
+            with self._lock:
+                self.stats["records_written"] += 1
+                return self._response_record(table.insert(body.get("fields") or {}, now))
+        items = self._batch(body)
+        with self._lock:
+            self.stats["records_written"] += len(items)
+            created = [table.insert(item.get("fields") or {}, now) for item in items]
+        return {"records": [self._response_record(record) for record in created]}
+
+    def update_records(self, base_id: str, table_name: str, body: Dict[str, Any],
+                       record_id: Optional[str] = None, replace: bool = False) -> Dict[str, Any]:
+        """Update one record, a batch, or upsert a batch on performUpsert.fieldsToMergeOn."""
+        table = self.table(base_id, table_name)
+        now = time.time()
+        if record_id is not None:
+            with self._lock:
+                self.stats["records_written"] += 1
+                return self._response_record(table.update(record_id, body.get("fields") or {}, now, replace))
+
+        items = self._batch(body)
+        merge_on = (body.get("performUpsert") or {}).get("fieldsToMergeOn")
+        with self._lock:
+            self.stats["records_written"] += len(items)
+            if not merge_on:
+                updated = [table.update(item["id"], item.get("fields") or {}, now, replace) for item in items]
+                return {"records": [self._response_record(record) for record in updated]}
+
+            created_ids, updated_ids, results = [], [], []
+            for item in items:
+                fields = item.get("fields") or {}
+                key = tuple(fields.get(name) for name in merge_on)
+                match = next((record for record in table.records.values()
+                              if tuple(record["fields"].get(name) for name in merge_on) == key), None)
+                if match is None:
+                    record = table.insert(fields, now)
+                    created_ids.append(record["id"])
+                else:
+                    record = table.update(match["id"], fields, now, replace)
+                    updated_ids.append(record["id"])
+                results.append(self._response_record(record))
+        return {"records": results, "createdRecords": created_ids, "updatedRecords": updated_ids}
+
+    def delete_records(self, base_id: str, table_name: str, record_ids: List[str]) -> List[Dict[str, Any]]:
+        """Delete records, failing the whole request if one is missing."""
+        if len(record_ids) > MAX_RECORDS_PER_REQUEST:
+            raise FakeAirtableError(422, "INVALID_RECORDS", f"At most {MAX_RECORDS_PER_REQUEST} records per request")
+        table = self.table(base_id, table_name)
+        with self._lock:
+            for record_id in record_ids:
+                table.get(record_id)
+            for record_id in record_ids:
+                del table.records[record_id]
+            self.stats["records_written"] += len(record_ids)
+        return [{"id": record_id, "deleted": True} for record_id in record_ids]
+
+    @staticmethod
+    def _batch(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """The records of a batch write, checked against Airtable's batch size."""
+        items = body.get("records")
+        if not isinstance(items, list) or not items:
+            raise FakeAirtableError(422, "INVALID_REQUEST_MISSING_FIELDS", "Missing records")
+        if len(items) > MAX_RECORDS_PER_REQUEST:
+            raise FakeAirtableError(422, "INVALID_RECORDS", f"At most {MAX_RECORDS_PER_REQUEST} records per request")
+        return items
+
+
+def list_options_from_query(query: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Convert GET list parameters (fields[], sort[0][field], ...) to listRecords body options."""
+    options: Dict[str, Any] = {}
+    sorts: Dict[int, Dict[str, str]] = {}
+    for name, values in query.items():
+        sort_match = SORT_PARAM_RE.match(name)
+        if name in ("fields[]", "fields"):
+            options["fields"] = values
+        elif sort_match:
+            sorts.setdefault(int(sort_match.group(1)), {})[sort_match.group(2)] = values[-1]
+        else:
+            options[name] = values[-1]
+    if sorts:
+        options["sort"] = [sorts[index] for index in sorted(sorts)]
+    return options
+
+
+class FakeAirtableHandler(BaseHTTPRequestHandler):
+    """Routes requests to the FakeAirtable that owns the server."""
+
+    # Keep-alive connections, like the real API
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self) -> None:
+        fake: FakeAirtable = self.server.fake
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+
+        match = PATH_RE.match(url.path)
+        if match is None:
+            self._send_json(404, {"error": {"type": "NOT_FOUND", "message": f"Unknown path {url.path}"}})
+            return
+        base_id, table_name, record_id = match.group(1), unquote(match.group(2)), match.group(3)
+
+        if fake.latency:
+            time.sleep(fake.latency)
+        if not fake.admit(base_id):
+            headers = {} if fake.retry_after is None else {"Retry-After": str(fake.retry_after)}
+            self._send_json(429, {"errors": [{"error": "RATE_LIMIT_REACHED",
+                                              "message": "Rate limit exceeded. Please try again later"}]}, headers)
+            return
+
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+            if self.command == "GET" and record_id is None:
+                result = fake.list_records(base_id, table_name, list_options_from_query(query))
+            elif self.command == "GET":
+                result = fake._response_record(fake.table(base_id, table_name).get(record_id))
+            elif self.command == "POST" and record_id == "listRecords":
+                result = fake.list_records(base_id, table_name, {**list_options_from_query(query), **body})
+            elif self.command == "POST" and record_id is None:
+                result = fake.create_records(base_id, table_name, body)
+            elif self.command in ("PATCH", "PUT"):
+                result = fake.update_records(base_id, table_name, body, record_id, replace=self.command == "PUT")
+            elif self.command == "DELETE" and record_id is None:
+                result = {"records": fake.delete_records(base_id, table_name, query.get("records[]", []))}
+            elif self.command == "DELETE":
+                result = fake.delete_records(base_id, table_name, [record_id])[0]
+            else:
+                raise FakeAirtableError(404, "NOT_FOUND", f"{self.command} {url.path} is not supported")
+        except FakeAirtableError as e:
+            with fake._lock:
+                fake.stats["errors"] += 1
+            self._send_json(e.status, {"error": {"type": e.error_type, "message": str(e)}})
+            return
+        except (ValueError, KeyError, TypeError) as e:
+            with fake._lock:
+                fake.stats["errors"] += 1
+            self._send_json(422, {"error": {"type": "INVALID_REQUEST_UNKNOWN", "message": str(e)}})
+            return
+        self._send_json(200, result)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def synthetic_transactions(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Field dictionaries shaped like the finance app's transactions table."""
+    rng = random.Random(seed)
+    accounts = ["1000", "1100", "2000", "4000", "4100", "5000", "5100", "6000"]
+    return [
+        {
+            "transaction_id": f"T{i:07d}",
+            "timestamp": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00.000Z",
+            "account_id": rng.choice(accounts),
+            "amount": round(rng.uniform(-5000, 5000), 2),
+            "description": f"Synthetic transaction {i}",
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--base", default="appFakeBase", help="Base ID the seeded table belongs to")
+    parser.add_argument("--table", default="transactions", help="Table seeded with synthetic transactions")
+    parser.add_argument("--records", type=int, default=0, help="Synthetic transactions to seed")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--page-size", type=int, default=MAX_PAGE_SIZE)
+    parser.add_argument("--requests-per-second", type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help="Per-base limit before 429 responses (0 for none)")
+    parser.add_argument("--retry-after", type=float, default=DEFAULT_RETRY_AFTER)
+    args = parser.parse_args()
+
+    fake = FakeAirtable(latency=args.latency, page_size=args.page_size,
+                        requests_per_second=args.requests_per_second or None,
+                        retry_after=args.retry_after, host=args.host, port=args.port)
+    if args.records:
+        fake.seed(args.base, args.table, synthetic_transactions(args.records))
+    print(f"Fake Airtable serving {args.records} records of {args.base}/{args.table} at {fake.url} (Ctrl+C to stop)")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Synthetic visit-export generator for parser benchmarks
+
+Produces iso-8859-2 HTML in the clinic's export format: a header block
+followed by <B>dd/mm/yyyy hh:mm: Wizyta<BR></B> (or Badanie) sections with
+owner, animal, treatment, medication and recommendation lines.
+
+Usage:
+    python benchmarks/synthetic.py OUTPUT.html --visits 100000 [--seed N]
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+ENCODING = "iso-8859-2"
+
+PREAMBLE = """<HTML>
+<HEAD>
+<TITLE>Historia wizyt</TITLE>
+<META HTTP-EQUIV='content-type' Content='text/html; charset=iso-8859-2'>
+</HEAD>
+<BODY>
+<TABLE BORDER=0 WIDTH=100% BORDERCOLOR="#FFFFFF">
+<TR><TD><IMG SRC="koteria.png" BORDER="0" ALT="Logo" WIDTH="100"></TD>
+<TD>
+<B>Fundacja Dla Zwierząt "Koteria"<BR></B><BR>
+ul. Garncarska 37a<BR>Ośrodek dla Kotów Miejskich Koteria<BR>04-886 Warszawa<BR>Tel.: 603651044<BR>
+<I></I><BR>
+</TD></TR>
+</TABLE>
+<BR>
+<B>Historia wizyt</B><BR>
+"""
+
+CLOSING = "</BODY>\n</HTML>\n"
+
+SURNAMES = ["Kowalska", "Nowak", "Wiśniewski", "Wójcik", "Kamińska", "Lewandowski", "Zieliński",
+            "Szymańska", "Woźniak", "Dąbrowski", "Kozłowska", "Jankowski", "Mazur", "Krawczyk"]
+FIRST_NAMES = ["Anna", "Piotr", "Małgorzata", "Krzysztof", "Agnieszka", "Tomasz", "Paulina",
+               "Michał", "Ewa", "Łukasz", "Żaneta", "Grzegorz"]
+STREETS = ["Garncarska", "Grochowska", "Puławska", "Górczewska", "Czerniakowska", "Wołoska"]
+CITIES = ["04-886 Warszawa", "01-460 Warszawa", "05-640 Mogielnica", "07-202 Wyszków"]
+SPECIES = ["__kot wolno żyjący", "_kot płatny", "__kot wolno żyjący", "_kot fundacyjny"]
+BREEDS = ["obsługiwalny do adopcji", "nieobsługiwalny", "nie wiadomo", "domowy", "europejski"]
+SEXES = ["samica", "samiec", "płeć nieznana"]
+AGES = ["1 rok i 6 miesięcy", "2 lata i 6 miesięcy", "3 lata i 6 miesięcy", "6 lat i 6 miesięcy"]
+TREATMENTS = ["__KASTRACJA WOLNO ŻYJĄCEGO", "_zaczipowanie i wpisanie do bazy", "__PRZYJĘCIE",
+              "a_kocur kastracja", "_szczepienie"]
+MEDICATIONS = ["MORPHASOL  ROZT.DO WSTRZ. 10 MG/ML FIOLKA - 20 ML 0,1 ml",
+               "TOLFINE INJ. 40 MG/ML FLAKON - 100 ML 0,5 ml",
+               "VETAKETAM ROZT.DO WSTRZ. 100 MG/ML FIOLKA - 50 ML 0,1 ml",
+               "NARCOSTART  ROZT.DO WSTRZ. 1 MG/ML FIOLKA - 10 ML 0,1 ml"]
+RECOMMENDATIONS = ["bez badań krwi", "fiv/felv (-)", "kontrola za tydzień", "czyszczenie i usuwanie zębów"]
+
+
+def visit_html(rng, visit_time, number):
+    """Return the HTML of one visit section, header included."""
+    visit_type = "Badanie" if rng.random() < 0.1 else "Wizyta"
+    phone = f"{rng.randrange(500000000, 799999999)}"
+    owner = f"{rng.choice(SURNAMES)} {rng.choice(FIRST_NAMES)}"
+
+    parts = [
+        f"<B>\n{visit_time:%d/%m/%Y %H:%M}: {visit_type}<BR>\n</B>\n<BR>\n",
+        f"<B>Właściciel: {owner}  Nr: {phone}</B><BR>\n",
+        f"{rng.choice(STREETS)} {rng.randrange(1, 200)}, {rng.choice(CITIES)}<BR>\n",
+        f"Tel.: {phone}<BR>\n",
+    ]
+    if rng.random() < 0.8:
+        parts.append(f"E-mail: klient{rng.randrange(100000)}@example.pl<BR>\n")
+    parts.append("  <BR>\n")
+    parts.append(f"<B>Zwierzę: {chr(65 + number % 26)}{number % 100:02d}  Nr: {number}/{visit_time.year}</B><BR>\n")
+    parts.append(f"Gatunek: {rng.choice(SPECIES)}<BR>\n")
+    parts.append(f"Rasa: {rng.choice(BREEDS)}<BR>\n")
+    parts.append(f"Płeć: {rng.choice(SEXES)}<BR>\n")
+    parts.append(f"Wiek: {rng.choice(AGES)}<BR>\n")
+    if rng.random() < 0.7:
+        parts.append(f"Mikrochip: 6160939{rng.randrange(10 ** 8):08d}<BR>\n")
+    parts.append("  <BR>\n")
+
+    if rng.random() < 0.5:
+        parts.append("<B>\nZabiegi<BR>\n</B>\n")
+        for treatment in rng.sample(TREATMENTS, rng.randrange(1, 3)):
+            parts.append(f"  {treatment} <BR>\n")
+        if rng.random() < 0.7:
+            parts.append("Zastosowane leki<BR>\n")
+            for medication in rng.sample(MEDICATIONS, rng.randrange(1, 4)):
+                parts.append(f"  {medication}<BR>\n")
+    if rng.random() < 0.1:
+        parts.append(" <BR>\nZalecenia:<BR>\n")
+        parts.append(f"{rng.choice(RECOMMENDATIONS)}<BR>\n")
+    parts.append("<BR>\n")
+    return "".join(parts)
+
+
+def iter_export_chunks(n_visits, seed=0, start=datetime(2024, 1, 2, 8, 0)):
+    """Yield the export as encoded byte chunks, one visit at a time."""
+    rng = random.Random(seed)
+    yield PREAMBLE.encode(ENCODING)
+    visit_time = start
+    for number in range(n_visits):
+        visit_time += timedelta(minutes=rng.randrange(5, 90))
+        yield visit_html(rng, visit_time, number).encode(ENCODING)
+    yield CLOSING.encode(ENCODING)
+
+
+def generate_export(n_visits, seed=0):
+    """Return a synthetic export with n_visits visits as bytes."""
+    return b"".join(iter_export_chunks(n_visits, seed))
+
+
+def write_export(path, n_visits, seed=0):
+    """Write a synthetic export to path without holding it in memory; returns its size in bytes."""
+    size = 0
+    with open(path, "wb") as f:
+        for chunk in iter_export_chunks(n_visits, seed):
+            f.write(chunk)
+            size += len(chunk)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output")
+    parser.add_argument("--visits", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    size = write_export(args.output, args.visits, args.seed)
+    print(f"Wrote {args.visits} visits ({size / 1024 / 1024:.1f} MB) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
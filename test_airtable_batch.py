@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the AirtableManager batch operations
+"""
+import json
+import sys
+sys.path.append('.')
+
+import requests
+
+from app.utils.airtable import AirtableManager, is_validation_error
+from airtable_fakes import ValidationError, make_manager
+
+
+def test_batch_create_sends_ten_records_per_request():
+    """95 records take 10 requests instead of 95, with one result per record."""
+    manager, table = make_manager()
+    batches = []
+    results = manager.batch_create("tbl", [{"n": i} for i in range(95)], on_batch=batches.append)
+
+    assert table.requests == [10] * 9 + [5]
+    assert [len(batch) for batch in batches] == [10] * 9 + [5]
+    assert [result.index for result in results] == list(range(95))
+    assert all(result.success and result.created for result in results)
+    assert table.records[results[42].record_id] == {"n": 42}
+
+
+def test_batch_create_isolates_invalid_records():
+    """A rejected batch is retried record by record; only bad records fail."""
+    manager, table = make_manager()
+    records = [{"n": i, "bad": i in (3, 14)} for i in range(20)]
+    results = manager.batch_create("tbl", records)
+
+    failed = [result.index for result in results if not result.success]
+    assert failed == [3, 14]
+    assert "INVALID_VALUE_FOR_COLUMN" in results[3].error
+    assert len(table.records) == 18
+
+
+def test_batch_update_delete_and_upsert():
+    """Updates, deletes and upserts report per-record outcomes."""
+    manager, table = make_manager()
+    created = manager.batch_create("tbl", [{"code": str(i), "amount": i} for i in range(12)])
+    ids = [result.record_id for result in created]
+
+    updated = manager.batch_update("tbl", [{"id": record_id, "fields": {"amount": 0}} for record_id in ids[:11]])
+    assert all(result.success for result in updated)
+    assert table.records[ids[10]]["amount"] == 0 and table.records[ids[11]]["amount"] == 11
+
+    upserted = manager.batch_upsert("tbl", [{"code": "11", "amount": 5}, {"code": "99", "amount": 1}], ["code"])
+    assert [(result.record_id == ids[11], result.created) for result in upserted] == [(True, False), (False, True)]
+
+    # A failed delete batch fails only its own records
+    deleted = manager.batch_delete("tbl", ids[:10] + ["recMissing"])
+    assert [result.success for result in deleted] == [True] * 10 + [False]
+    assert "404" in deleted[10].error
+    assert len(table.records) == 3
+
+
+def test_only_rejected_requests_count_as_validation_errors():
+    """Only 422s are retried per record; upsert records missing a key field are rejected unsent."""
+    manager, fake_table = make_manager()
+    upserted = manager.batch_upsert("tbl", [{"code": "a", "n": 1}, {"n": 2}, {"code": "b", "n": 3}], ["code"])
+    assert [(result.success, result.rejected) for result in upserted] == [(True, False), (False, True), (True, False)]
+    assert "code" in upserted[1].error and fake_table.requests == [2]
+
+    assert is_validation_error(ValidationError("INVALID_VALUE_FOR_COLUMN"))
+    assert not is_validation_error(requests.exceptions.JSONDecodeError("Expecting value", "<html>", 0))
+    try:
+        json.loads("<html>")
+    except ValueError as e:
+        assert not is_validation_error(e)
+    assert not is_validation_error(ValueError("committed, but the reply was unreadable"))
+
+    # A committed batch answered with an unreadable body must not be resent record by record
+    manager, fake_table = make_manager()
+
+    def unreadable_reply(records, typecast=False):
+        fake_table.requests.append(len(records))
+        raise requests.exceptions.JSONDecodeError("Expecting value", "<html>", 0)
+
+    fake_table.batch_create = unreadable_reply
+    results = manager.batch_create("tbl", [{"n": i} for i in range(3)])
+    assert fake_table.requests == [3]
+    assert not any(result.success for result in results)
+
+
+def test_batch_without_configuration():
+    """Without an API every record fails instead of raising."""
+    manager = AirtableManager(api_key="key", base_id="app")
+    manager.api = None
+    results = manager.batch_create("tbl", [{"n": 1}, {"n": 2}])
+    assert [result.success for result in results] == [False, False]
+
+
+if __name__ == "__main__":
+    test_batch_create_sends_ten_records_per_request()
+    test_batch_create_isolates_invalid_records()
+    test_batch_update_delete_and_upsert()
+    test_only_rejected_requests_count_as_validation_errors()
+    test_batch_without_configuration()
+    print("All Airtable batch tests passed")
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent, filtered and streamed Airtable fetches and the per-base rate limiter
+"""
+import sys
+import tempfile
+import time
+sys.path.append('.')
+
+import pandas as pd
+
+from app.utils.airtable import TableQuery, any_of_formula, concat_chunks
+from app.utils.rate_limit import TokenBucket, base_id_from_url
+from airtable_fakes import make_manager
+
+
+def make_slow_manager(delays, failing=()):
+    """AirtableManager whose tables hold three records each and take `delays` seconds to list."""
+    options = {
+        name: {"records": {f"rec{name}{i}": {"table": name, "n": i} for i in range(3)}, "delay": delay,
+               "fail": RuntimeError("422 Client Error: Unprocessable Entity") if name in failing else None}
+        for name, delay in delays.items()
+    }
+    manager, _ = make_manager(options_by_table=options)
+    return manager
+
+
+def numbered(n):
+    """Fields of n records rec0, rec1, ... numbered in field n."""
+    return {f"rec{i}": {"n": i} for i in range(n)}
+
+
+def test_tables_fetched_concurrently():
+    """Fetching three tables takes about as long as the slowest one."""
+    manager = make_slow_manager({"transactions": 0.3, "chart_of_accounts": 0.2, "budgets": 0.25})
+    started = time.monotonic()
+    frames, errors = manager.fetch_tables(["transactions", "chart_of_accounts", "budgets"])
+    elapsed = time.monotonic() - started
+
+    assert errors == {}
+    assert list(frames) == ["transactions", "chart_of_accounts", "budgets"]
+    assert frames["chart_of_accounts"]["table"].tolist() == ["chart_of_accounts"] * 3
+    assert frames["budgets"]["id"].tolist() == ["recbudgets0", "recbudgets1", "recbudgets2"]
+    assert elapsed < 0.5, f"Fetch took {elapsed:.2f}s; the tables were not fetched concurrently"
+    assert len(manager.api.threads) == 3
+
+
+def test_worker_limit_and_failures():
+    """max_workers bounds the pool and a failed table does not hide the others."""
+    manager = make_slow_manager({"a": 0.1, "b": 0.1, "c": 0.1}, failing={"b"})
+    frames, errors = manager.fetch_tables(["a", "b", "c", "a"], max_workers=1)
+
+    assert list(frames) == ["a", "b", "c"]
+    assert len(manager.api.threads) == 1
+    assert frames["b"].empty and "422" in errors["b"]
+    assert len(frames["a"]) == 3 and len(frames["c"]) == 3
+
+
+def test_query_pushed_down_and_cached_separately():
+    """Fields, formula, sort and max_records reach Airtable and are part of the cache key."""
+    manager, table = make_manager("transactions", records={"rec1": {"account_id": "4000", "amount": 5}})
+    calls = table.calls
+    formula = any_of_formula("account_id", ["4000", "4'1"])
+    assert formula == "OR({account_id}='4000', {account_id}='4\\'1')"
+
+    latest = manager.get_table_data("transactions", fields=["amount", "note"], formula=formula,
+                                     sort=["-timestamp"], max_records=10)
+    assert calls == [{"fields": ["amount", "note"], "formula": formula, "sort": ["-timestamp"], "max_records": 10}]
+    # Requested fields that Airtable left out (all empty) still become columns
+    assert latest.columns.tolist() == ["amount", "id", "note"]
+
+    whole = manager.get_table_data("transactions")
+    assert calls[-1] == {} and "account_id" in whole.columns
+    manager.get_table_data("transactions", fields=["amount", "note"], formula=formula,
+                           sort=["-timestamp"], max_records=10)
+    assert len(calls) == 2
+
+    query = TableQuery("transactions", formula="FALSE()", fields=["amount"])
+    frames = manager.get_tables_data([query, "transactions"])
+    assert frames[query].empty and frames[query].columns.tolist() == ["amount", "id"]
+    assert len(frames["transactions"]) == 1 and len(calls) == 3
+
+
+def test_stream_yields_first_page_early():
+    """The first page is yielded alone, before more pages are requested; later pages are grouped."""
+    manager, table = make_manager("transactions", records=numbered(2450))
+    chunks = manager.iter_table_chunks("transactions", chunk_records=1000)
+
+    first = next(chunks)
+    assert len(first) == 100 and table.pages_served == 1
+    rest = list(chunks)
+    assert [len(chunk) for chunk in rest] == [1000, 1000, 350]
+
+    streamed = pd.concat([first] + rest, ignore_index=True)
+    assert streamed.equals(manager.fetch_table("transactions"))
+    assert streamed["n"].tolist() == list(range(2450))
+
+
+def test_stream_empty_table_keeps_columns():
+    """An empty result still yields one chunk, with the requested fields as columns."""
+    manager, _ = make_manager("transactions")
+    chunks = list(manager.iter_table_chunks(TableQuery("transactions", fields=["n"], max_records=5)))
+    assert len(chunks) == 1 and chunks[0].empty and chunks[0].columns.tolist() == ["n", "id"]
+
+
+def test_stream_through_mirror():
+    """A first stream fills the mirror page by page; later streams read the mirror."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager, table = make_manager("transactions", mirror_dir=tmp, records=numbered(1500))
+
+        chunks = manager.iter_table_chunks("transactions", chunk_records=500)
+        assert len(next(chunks)) == 100 and table.pages_served == 1
+        assert sum(len(chunk) for chunk in chunks) == 1400
+        assert manager.mirror("transactions").status()["records"] == 1500
+
+        # The delta sync re-reads every page of this fake, but rows come from the mirror
+        sizes = [len(chunk) for chunk in manager.iter_table_chunks("transactions", chunk_records=500)]
+        assert sizes == [500, 500, 500]
+
+
+def test_cold_mirror_returns_only_requested_fields():
+    """A fields query answered by the first full sync of a mirror has the same columns as later ones."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager, _ = make_manager("transactions", mirror_dir=tmp,
+                                  records={f"rec{i}": {"account_id": "4000", "amount": i, "desc": "x"}
+                                           for i in range(250)})
+        query = TableQuery("transactions", fields=["account_id", "amount"])
+        cold = manager.fetch_table(query)
+        assert cold.columns.tolist() == ["account_id", "amount", "id"] and len(cold) == 250
+        assert all(chunk.columns.tolist() == ["account_id", "amount", "id"]
+                   for chunk in manager.iter_table_chunks(query, chunk_records=100))
+        assert manager.fetch_table(query).equals(cold)
+        # The mirror itself keeps every field
+        assert "desc" in manager.fetch_table("transactions").columns
+
+
+def test_concat_chunks_consumes_chunks():
+    """Chunks are combined like pd.concat, missing fields included, and the list is emptied."""
+    chunks = [
+        pd.DataFrame({"amount": [1, 2], "id": ["rec0", "rec1"]}),
+        pd.DataFrame({"amount": [3], "note": ["x"], "id": ["rec2"]}),
+        pd.DataFrame({"id": ["rec3"], "paid": [True]}),
+    ]
+    expected = pd.concat([chunk.copy() for chunk in chunks], ignore_index=True)
+    combined = concat_chunks(chunks)
+    assert combined.equals(expected) and combined.dtypes.equals(expected.dtypes)
+    assert combined.columns.tolist() == ["amount", "id", "note", "paid"]
+    assert chunks == []
+    assert concat_chunks([]).empty
+
+
+def test_token_bucket_spaces_requests():
+    """After the initial burst, requests are spaced 1/rate seconds apart."""
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=5, clock=lambda: now[0], sleep=sleep)
+    waits = [bucket.acquire() for _ in range(8)]
+    assert waits[:5] == [0.0] * 5
+    assert [round(wait, 3) for wait in waits[5:]] == [0.2, 0.2, 0.2]
+    assert round(now[0], 3) == 0.6
+
+
+def test_token_bucket_queues_concurrent_callers():
+    """Concurrent callers reserve successive slots instead of all waking at once."""
+    now = [0.0]
+    bucket = TokenBucket(rate=5, capacity=1, clock=lambda: now[0], sleep=lambda seconds: None)
+    waits = [bucket.acquire() for _ in range(4)]
+    assert [round(wait, 3) for wait in waits] == [0.0, 0.2, 0.4, 0.6]
+
+
+def test_base_id_from_url():
+    """Requests are limited per base; other endpoints are not."""
+    assert base_id_from_url("https://api.airtable.com/v0/appAbc123/transactions?offset=x") == "appAbc123"
+    assert base_id_from_url("https://api.airtable.com/v0/meta/bases/appAbc123/tables") == "appAbc123"
+    assert base_id_from_url("https://api.airtable.com/v0/meta/whoami") is None
+
+
+if __name__ == "__main__":
+    test_tables_fetched_concurrently()
+    test_worker_limit_and_failures()
+    test_query_pushed_down_and_cached_separately()
+    test_stream_yields_first_page_early()
+    test_stream_empty_table_keeps_columns()
+    test_stream_through_mirror()
+    test_cold_mirror_returns_only_requested_fields()
+    test_concat_chunks_consumes_chunks()
+    test_token_bucket_spaces_requests()
+    test_token_bucket_queues_concurrent_callers()
+    test_base_id_from_url()
+    print("All Airtable fetch tests passed")
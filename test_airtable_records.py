@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized CSV-to-Airtable record conversion
+"""
+import io
+import json
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append('.')
+
+from app.utils.airtable_records import RecordConverter, dataframe_to_records
+
+
+def legacy_records(df):
+    """Row-by-row conversion previously done by upload_csv_to_airtable (reference)."""
+    records = []
+    for _, row in df.iterrows():
+        record = {}
+        for col, value in row.items():
+            if pd.notna(value):
+                if isinstance(value, str):
+                    if value.strip().startswith('[') and value.strip().endswith(']'):
+                        try:
+                            record[col] = json.loads(value)
+                        except:
+                            record[col] = value
+                    else:
+                        record[col] = value
+                elif isinstance(value, (int, float)):
+                    record[col] = value
+                elif hasattr(value, 'isoformat'):
+                    record[col] = value.isoformat()
+                else:
+                    record[col] = str(value)
+        records.append(record)
+    return records
+
+
+CSV = """description,amount,count,account_id,accounts,paid,note
+Rent,1200.50,1,4000,"[""recA"", ""recB""]",True,
+Coffee,,2,3100,[broken,False, padded 
+Salary,5000,3,,[],True,"[1, 2]"
+,,4,,,False,
+"""
+
+
+def test_matches_legacy_conversion():
+    """Records equal the row-by-row conversion for a typical mixed-type CSV."""
+    df = pd.read_csv(io.StringIO(CSV))
+    records = dataframe_to_records(df)
+    assert records == legacy_records(df)
+
+    assert records[0]["accounts"] == ["recA", "recB"]
+    assert records[1]["accounts"] == "[broken"
+    assert records[3] == {"count": 4, "paid": False}
+    assert type(records[0]["count"]) is int and type(records[0]["paid"]) is bool
+
+
+def test_column_kinds():
+    """Each column's target type is inferred once from its dtype and values."""
+    df = pd.read_csv(io.StringIO(CSV))
+    kinds = {col: RecordConverter.column_kind(df[col]) for col in df.columns}
+    assert kinds == {
+        "description": "text", "amount": "number", "count": "number", "account_id": "number",
+        "accounts": "text", "paid": "checkbox", "note": "text",
+    }
+    assert RecordConverter.column_kind(pd.Series([1, "a", None], dtype=object)) == "mixed"
+
+
+def test_datetimes_and_native_types():
+    """Datetimes become ISO strings and numpy scalars become Python values."""
+    df = pd.DataFrame({
+        "when": pd.to_datetime(["2025-01-02 09:07", None]),
+        "utc": pd.to_datetime(["2025-01-02 09:07", "2025-01-03 00:00"]).tz_localize("Europe/Warsaw"),
+        "n": np.array([1, 2], dtype=np.int64),
+        "mixed": pd.Series([np.int64(7), pd.Timestamp("2025-01-05")], dtype=object),
+    })
+    records = dataframe_to_records(df)
+    assert records[0] == {"when": "2025-01-02T09:07:00", "utc": "2025-01-02T08:07:00.000Z", "n": 1, "mixed": 7}
+    assert records[1] == {"utc": "2025-01-02T23:00:00.000Z", "n": 2, "mixed": "2025-01-05T00:00:00"}
+    assert type(records[1]["n"]) is int
+    json.dumps(records)
+
+
+def test_large_frame_keeps_row_order():
+    """Rows with different missing fields come back in their original order."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "a": rng.integers(0, 100, 5000).astype(float),
+        "b": rng.choice(["x", "y", None], 5000),
+    })
+    df.loc[rng.random(5000) < 0.3, "a"] = np.nan
+    assert dataframe_to_records(df) == legacy_records(df)
+    assert dataframe_to_records(df.iloc[:0]) == []
+
+
+if __name__ == "__main__":
+    test_matches_legacy_conversion()
+    test_column_kinds()
+    test_datetimes_and_native_types()
+    test_large_frame_keeps_row_order()
+    print("All Airtable record conversion tests passed")
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Tests for retries, Retry-After handling and the circuit breaker of the shared Airtable session
+"""
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append('.')
+
+import requests
+from pyairtable import Api
+
+from app.utils.rate_limit import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, RateLimitedAdapter, TokenBucket,
+    base_guard, client_metrics, parse_retry_after, retry_delay,
+)
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers each request with the next (status, headers) of the server's script, then 200."""
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        server = self.server
+        with server.lock:
+            server.requests.append((self.command, self.path))
+            status, headers = server.script.pop(0) if server.script else (200, {})
+        body = json.dumps({"records": [{"id": "rec1", "createdTime": "2025-01-01T00:00:00.000Z",
+                                        "fields": {"amount": 1}}]} if status == 200 else {"error": status})
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(script):
+    """Local HTTP server replying with `script`; returns (server, endpoint_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+    server.script = list(script)
+    server.requests = []
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_api(endpoint_url, sleeps):
+    """Api with the rate-limited adapter, recording backoff sleeps instead of sleeping."""
+    api = Api("key", retry_strategy=None, endpoint_url=endpoint_url)
+    adapter = RateLimitedAdapter(sleep=sleeps.append)
+    api.session.mount("http://", adapter)
+    return api
+
+
+def test_429_retried_with_retry_after():
+    """A 429 is retried after Retry-After plus jitter, and counted as throttled."""
+    server, url = start_server([(429, {"Retry-After": "0"}), (429, {"Retry-After": "0"})])
+    sleeps = []
+    try:
+        records = make_api(url, sleeps).table("appRetry429", "transactions").all()
+    finally:
+        server.shutdown()
+    assert [r["id"] for r in records] == ["rec1"]
+    assert len(server.requests) == 3 and len(sleeps) == 2
+    assert all(0 <= delay <= 1 for delay in sleeps)
+
+    metrics = client_metrics()["appRetry429"]
+    assert (metrics["requests"], metrics["throttled"], metrics["retries"]) == (3, 2, 2)
+    assert metrics["breaker_state"] == CLOSED
+
+
+def test_create_not_repeated_after_server_error():
+    """A failed create is not retried (it may have been applied), a failed read is."""
+    server, url = start_server([(503, {}), (503, {})])
+    sleeps = []
+    try:
+        table = make_api(url, sleeps).table("appNoRepeat", "transactions")
+        try:
+            table.create({"amount": 1})
+            assert False, "create should fail on 503"
+        except requests.exceptions.HTTPError as e:
+            assert "503" in str(e)
+        assert len(server.requests) == 1 and sleeps == []
+
+        assert len(table.all()) == 1
+        assert len(server.requests) == 3 and len(sleeps) == 1
+    finally:
+        server.shutdown()
+
+
+def test_outage_opens_circuit():
+    """Repeated server errors open the circuit, after which requests fail without being sent."""
+    server, url = start_server([(503, {})] * 20)
+    sleeps = []
+    try:
+        table = make_api(url, sleeps).table("appOutage", "transactions")
+        for _ in range(2):
+            try:
+                table.all()
+                assert False, "listing should fail while the service is down"
+            except CircuitOpenError:
+                pass
+    finally:
+        server.shutdown()
+    # The breaker opened on the 5th failure; the second listing was refused outright
+    assert len(server.requests) == 5
+    metrics = client_metrics()["appOutage"]
+    assert metrics["breaker_state"] == OPEN and metrics["server_errors"] == 5
+    assert metrics["times_opened"] == 1 and metrics["rejected"] == 2
+
+
+def test_circuit_breaker_states():
+    """Open after the threshold, one trial when half-open, closed again on success."""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    now[0] = 9
+    try:
+        breaker.before_request()
+        assert False, "open circuit should refuse requests"
+    except CircuitOpenError:
+        pass
+
+    now[0] = 10
+    breaker.before_request()
+    assert breaker.state == HALF_OPEN
+    try:
+        breaker.before_request()
+        assert False, "only one trial request is allowed"
+    except CircuitOpenError:
+        pass
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.times_opened == 2
+
+    now[0] = 20
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failures == 0
+    assert breaker.rejected == 2
+
+
+def test_unexpected_error_ends_half_open_trial():
+    """An error other than a connection error during the trial reopens the circuit instead of wedging it."""
+    now = [0.0]
+    guard = base_guard("appTrialError")
+    guard.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    guard.breaker.record_failure()
+    now[0] = 10
+
+    adapter = RateLimitedAdapter(sleep=lambda seconds: None)
+    request = requests.Request("GET", "http://127.0.0.1:1/v0/appTrialError/transactions").prepare()
+    original_send = requests.adapters.HTTPAdapter.send
+
+    def broken_send(self, request, **kwargs):
+        raise requests.exceptions.ContentDecodingError("bad gzip")
+
+    requests.adapters.HTTPAdapter.send = broken_send
+    try:
+        adapter.send(request)
+        assert False, "the decoding error should propagate"
+    except requests.exceptions.ContentDecodingError:
+        pass
+    finally:
+        requests.adapters.HTTPAdapter.send = original_send
+
+    assert guard.breaker.state == OPEN
+    now[0] = 20
+    guard.breaker.before_request()
+    assert guard.breaker.state == HALF_OPEN
+
+
+def test_backoff_and_retry_after_parsing():
+    """Backoff grows with jitter up to the cap; Retry-After accepts seconds and HTTP dates."""
+    for attempt, (low, high) in enumerate([(0.5, 1), (1, 2), (2, 4), (4, 8)]):
+        delays = [retry_delay(attempt) for _ in range(50)]
+        assert all(low <= delay <= high for delay in delays)
+        assert len(set(delays)) > 1
+    assert 15 <= retry_delay(20) <= 30
+
+    assert parse_retry_after("30") == 30.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None and parse_retry_after(None) is None
+
+
+def test_retry_after_pauses_the_whole_base():
+    """After a 429 with Retry-After, other requests to the base wait too."""
+    now = [0.0]
+    bucket = TokenBucket(rate=5, clock=lambda: now[0], sleep=lambda seconds: None)
+    bucket.pause(2)
+    assert round(bucket.acquire(), 3) == 2.2
+    assert base_guard("appShared").limiter is base_guard("appShared").limiter
+
+
+if __name__ == "__main__":
+    test_429_retried_with_retry_after()
+    test_create_not_repeated_after_server_error()
+    test_outage_opens_circuit()
+    test_circuit_breaker_states()
+    test_unexpected_error_ends_half_open_trial()
+    test_backoff_and_retry_after_parsing()
+    test_retry_after_pauses_the_whole_base()
+    print("All Airtable resilience tests passed")
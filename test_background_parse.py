@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for the progressive preview and background parse
+"""
+import sys
+import time
+import pandas as pd
+sys.path.append('.')
+
+from app.utils.background_parse import BackgroundParse, ProgressReader, preview_frame
+from app.utils.html_processor import read_html
+from app.utils.visit_merge import merge_visits
+from benchmarks.synthetic import generate_export
+
+
+def parse_file(reader, content_hash, name):
+    """Parse function with the signature of process_html_file."""
+    return read_html(reader, name, backend="tokenizer")
+
+
+def merge_files(frames, content_hashes):
+    """Merge function with the signature of merge_processed_files."""
+    return merge_visits(frames)
+
+
+def wait_for(job, timeout=60):
+    """Wait until a background parse has finished."""
+    deadline = time.monotonic() + timeout
+    while not job.done:
+        assert time.monotonic() < deadline, "background parse did not finish"
+        time.sleep(0.05)
+
+
+def test_progress_reader():
+    """The reader reports how far the parser has read."""
+    reader = ProgressReader(b"0123456789")
+    assert reader.bytes_read == 0
+    reader.read(4)
+    assert reader.bytes_read == 4
+    reader.read()
+    assert reader.bytes_read == 10
+
+
+def test_preview_is_head_of_full_parse():
+    """The preview holds the first visits of the export, parsed the same way."""
+    content = generate_export(300)
+    full = read_html(content, "synthetic.html", backend="tokenizer")
+    preview = preview_frame(content, 50, "tokenizer")
+    pd.testing.assert_frame_equal(preview, full.head(50))
+
+    assert preview_frame(b"<HTML></HTML>", 50, "tokenizer").empty
+
+
+def test_background_parse_single_file():
+    """A single upload is parsed in the worker and reported complete."""
+    content = generate_export(500)
+    job = BackgroundParse(("hash",), [("synthetic.html", content, "hash")], parse_file, merge_files)
+    assert not job.done and job.progress == 0
+    job.start()
+    wait_for(job)
+
+    df, filename, merge_report = job.result
+    assert job.progress == 1.0 and not job.errors
+    assert filename == "synthetic.html" and merge_report is None
+    pd.testing.assert_frame_equal(df, read_html(content, filename, backend="tokenizer"))
+
+
+def test_background_parse_merges_and_reports_errors():
+    """Several uploads are merged; failed files are reported instead of raised."""
+    first = generate_export(200, seed=1)
+    second = generate_export(200, seed=2)
+
+    def failing_parse(reader, content_hash, name):
+        return None if name == "broken.html" else parse_file(reader, content_hash, name)
+
+    uploads = [("a.html", first, "a"), ("broken.html", b"", "x"), ("b.html", second, "b"), ("a2.html", first, "a")]
+    job = BackgroundParse(("a", "x", "b", "a"), uploads, failing_parse, merge_files).start()
+    wait_for(job)
+
+    df, filename, merge_report = job.result
+    assert job.errors == ["Error processing file: broken.html"]
+    assert filename == "combined_3_files"
+    assert len(df) == 400
+    assert merge_report["duplicates"].tolist() == [0, 0, 200]
+
+
+if __name__ == "__main__":
+    test_progress_reader()
+    test_preview_is_head_of_full_parse()
+    test_background_parse_single_file()
+    test_background_parse_merges_and_reports_errors()
+    print("All background parse tests passed")
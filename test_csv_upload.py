@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for the resumable chunked CSV upload
+"""
+import sys
+import tempfile
+sys.path.append('.')
+
+import requests
+from pyairtable import Api
+from requests.adapters import HTTPAdapter
+
+from app.utils.airtable import AirtableManager
+from app.utils.csv_upload import (
+    ChunkedCsvUploader, UploadCheckpoint, UploadInterrupted, UploadProgress, format_duration,
+)
+from app.utils.table_cache import TableCache
+from benchmarks.fake_airtable import FakeAirtable
+import airtable_fakes
+
+
+class Interrupted(Exception):
+    """Simulates the app stopping mid-upload."""
+
+
+def make_manager():
+    """AirtableManager wired to an in-memory table rejecting records with amount -1."""
+    return airtable_fakes.make_manager(rejects=lambda fields: fields.get("amount") == -1)
+
+
+def make_csv(rows, bad_rows=()):
+    """CSV bytes with a quoted multi-line field, so rows and lines differ."""
+    lines = ["description,amount"]
+    for i in range(rows):
+        amount = -1 if i in bad_rows else i
+        lines.append(f'"Transaction {i}\nsecond line",{amount}' if i % 7 == 0 else f"Transaction {i},{amount}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def test_interrupted_upload_resumes_without_duplicates():
+    """An upload stopped mid-way continues after the last committed batch."""
+    content = make_csv(2500)
+    manager, table = make_manager()
+
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        def stop_after_1200(progress):
+            if progress.rows_done >= 1200:
+                raise Interrupted()
+
+        uploader = ChunkedCsvUploader(manager, "tbl", content, checkpoint_dir, chunk_rows=500)
+        try:
+            uploader.run(stop_after_1200)
+            assert False, "upload should have been interrupted"
+        except Interrupted:
+            pass
+        assert len(table.records) == 1200
+
+        # A new session finds the checkpoint by file content and table
+        resumed = ChunkedCsvUploader(manager, "tbl", content, checkpoint_dir, chunk_rows=500)
+        assert resumed.checkpoint.rows_committed == 1200 and not resumed.checkpoint.completed
+
+        progress = []
+        checkpoint = resumed.run(progress.append)
+        assert checkpoint.completed and checkpoint.uploaded == 2500
+        rows = list(table.records.values())
+        assert len(rows) == 2500
+        assert [record["amount"] for record in rows] == list(range(2500))
+        assert rows[7]["description"] == "Transaction 7\nsecond line"
+        assert progress[0].resumed_from == 1200 and progress[-1].fraction == 1.0
+
+        # The same file for another table starts from scratch
+        assert ChunkedCsvUploader(manager, "other", content, checkpoint_dir).checkpoint.rows_committed == 0
+
+
+def test_failed_rows_are_recorded():
+    """Rejected rows are kept in the checkpoint with their CSV row number."""
+    manager, table = make_manager()
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        uploader = ChunkedCsvUploader(manager, "tbl", make_csv(30, bad_rows={4, 25}), checkpoint_dir, chunk_rows=20)
+        checkpoint = uploader.run()
+        assert checkpoint.uploaded == 28
+        assert [failure["row"] for failure in checkpoint.failures] == [5, 26]
+        assert checkpoint.failures[1]["record"] == {"description": "Transaction 25", "amount": -1}
+
+        stored = UploadCheckpoint(uploader.file_hash, "tbl", checkpoint_dir)
+        assert stored.completed and len(stored.failures) == 2
+
+        stored.clear()
+        assert UploadCheckpoint(uploader.file_hash, "tbl", checkpoint_dir).rows_committed == 0
+
+
+class FlakyAdapter(HTTPAdapter):
+    """Transport that refuses connections once `down` is set, or after `fail_after` requests."""
+
+    def __init__(self, fail_after=None):
+        super().__init__()
+        self.fail_after = fail_after
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        if self.fail_after is not None and self.sent >= self.fail_after:
+            raise requests.exceptions.ConnectionError("Connection refused")
+        self.sent += 1
+        return super().send(request, **kwargs)
+
+
+def test_outage_stops_upload_for_resume():
+    """Transport errors are not row failures: the upload stops uncompleted and resumes later."""
+    content = make_csv(100)
+    with FakeAirtable(requests_per_second=None) as fake, tempfile.TemporaryDirectory() as checkpoint_dir:
+        manager = AirtableManager(api_key="key", base_id="appUploadOutage", cache=TableCache())
+        manager.api = Api("key", retry_strategy=None, endpoint_url=fake.url)
+        adapter = FlakyAdapter(fail_after=3)
+        manager.api.session.mount("http://", adapter)
+
+        uploader = ChunkedCsvUploader(manager, "tbl", content, checkpoint_dir)
+        try:
+            uploader.run()
+            assert False, "the outage should stop the upload"
+        except UploadInterrupted as e:
+            assert "row 31" in str(e) and "Connection refused" in str(e)
+        assert len(fake.table("appUploadOutage", "tbl").records) == 30
+
+        stored = UploadCheckpoint(uploader.file_hash, "tbl", checkpoint_dir)
+        assert (stored.rows_committed, stored.uploaded, stored.failures, stored.completed) == (30, 30, [], False)
+
+        adapter.fail_after = None
+        checkpoint = ChunkedCsvUploader(manager, "tbl", content, checkpoint_dir).run()
+        assert checkpoint.completed and checkpoint.uploaded == 100 and not checkpoint.failures
+        records = fake.table("appUploadOutage", "tbl").records.values()
+        assert sorted(record["fields"]["amount"] for record in records) == list(range(100))
+
+
+def test_column_types_are_inferred_over_the_whole_file():
+    """A column that turns to text in a later chunk is sent as text from every chunk."""
+    lines = ["code,amount,paid"]
+    for i in range(1501):
+        code = "A12" if i == 1500 else "4000"
+        amount = "" if i == 1200 else str(i)
+        paid = "" if i == 10 else ("True" if i % 2 else "False")
+        lines.append(f"{code},{amount},{paid}")
+    manager, table = make_manager()
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        uploader = ChunkedCsvUploader(manager, "tbl", ("\n".join(lines) + "\n").encode(), checkpoint_dir,
+                                      chunk_rows=500)
+        assert uploader.run().uploaded == 1501
+
+    rows = list(table.records.values())
+    assert [record["code"] for record in rows[:1500:500]] == ["4000", "4000", "4000"]
+    assert rows[-1]["code"] == "A12"
+    assert {type(record["code"]) for record in rows} == {str}
+    # Missing numbers make the whole column float, as reading the whole file would
+    assert {type(record["amount"]) for record in rows if "amount" in record} == {float}
+    assert rows[1]["paid"] is True and "paid" not in rows[10]
+
+
+def test_progress_rate_and_eta():
+    """Throughput only counts rows sent in this run."""
+    progress = UploadProgress(total_rows=50000, rows_done=20000, uploaded=20000, failed=0,
+                              resumed_from=10000, elapsed=200.0)
+    assert progress.rows_per_sec == 50.0
+    assert progress.eta_seconds == 600.0
+    assert "ETA 10m 00s" in progress.describe()
+    assert format_duration(None) == "unknown" and format_duration(3720) == "1h 02m"
+
+
+if __name__ == "__main__":
+    test_interrupted_upload_resumes_without_duplicates()
+    test_failed_rows_are_recorded()
+    test_outage_stops_upload_for_resume()
+    test_column_types_are_inferred_over_the_whole_file()
+    test_progress_rate_and_eta()
+    print("All CSV upload tests passed")
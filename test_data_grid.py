@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for the paginated data grid
+"""
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append('.')
+
+from app.utils.data_grid import DataGrid
+
+
+def sample_frame():
+    """Airtable-like frame with numbers, dates, text and linked records."""
+    return pd.DataFrame({
+        'amount': [120.0, None, 35.5, 980.0, 35.5],
+        'timestamp': pd.to_datetime(['2025-03-02', '2025-01-15', None, '2025-02-01', '2025-03-01']),
+        'account_id': ['4000', '3000', '3100', '4000', None],
+        'accounts': [['rec1'], 'rec2', None, 7, ['rec3']],
+    }, index=[10, 11, 12, 13, 14])
+
+
+def test_sort_order_is_stable_with_missing_last():
+    """Sorting returns row positions, keeps ties in order and puts missing values last."""
+    df = sample_frame()
+    assert DataGrid.sort_order(df, 'amount').tolist() == [2, 4, 0, 3, 1]
+    assert DataGrid.sort_order(df, 'amount', ascending=False).tolist() == [3, 0, 2, 4, 1]
+    assert DataGrid.sort_order(df, 'timestamp').tolist() == [1, 3, 4, 0, 2]
+
+    # Mixed lists, text and numbers are ordered by their text
+    assert DataGrid.sort_order(df, 'accounts').tolist() == [3, 0, 4, 1, 2]
+
+
+def test_filter_mask():
+    """Comparisons apply to number and date columns; other queries match text."""
+    df = sample_frame()
+    assert DataGrid.filter_mask(df, 'amount', '>= 100').tolist() == [True, False, False, True, False]
+    assert DataGrid.filter_mask(df, 'amount', '= 35.5').tolist() == [False, False, True, False, True]
+    assert DataGrid.filter_mask(df, 'timestamp', '< 2025-03-01').tolist() == [False, True, False, True, False]
+    assert DataGrid.filter_mask(df, 'account_id', '40').tolist() == [True, False, False, True, False]
+    assert DataGrid.filter_mask(df, 'accounts', 'REC').tolist() == [True, True, False, False, True]
+
+    # A comparison on a text column is a plain text search
+    assert DataGrid.filter_mask(df, 'account_id', '>4').tolist() == [False] * 5
+
+
+def test_page_positions():
+    """Pages are sliced from the sorted, filtered row positions."""
+    df = sample_frame()
+    order = DataGrid.sort_order(df, 'amount')
+    mask = DataGrid.filter_mask(df, 'amount', '> 30')
+
+    positions, matching = DataGrid.page_positions(len(df), order, mask, page=2, page_size=3)
+    assert matching == 4
+    assert positions.tolist() == [3]
+    assert df.iloc[positions]['amount'].tolist() == [980.0]
+
+    positions, matching = DataGrid.page_positions(len(df), None, mask, page=1, page_size=3)
+    assert (positions.tolist(), matching) == ([0, 2, 3], 4)
+
+    positions, matching = DataGrid.page_positions(len(df), None, None, page=2, page_size=3)
+    assert (positions.tolist(), matching) == ([3, 4], 5)
+
+    assert DataGrid.page_count(0, 25) == 1
+    assert DataGrid.page_count(51, 25) == 3
+
+
+def test_page_matches_full_sort():
+    """Paging a large frame returns the same rows as sorting and filtering it in full."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'amount': rng.normal(100, 50, 20000).round(2)})
+    order = DataGrid.sort_order(df, 'amount', ascending=False)
+    mask = DataGrid.filter_mask(df, 'amount', '< 90')
+
+    positions, matching = DataGrid.page_positions(len(df), order, mask, page=7, page_size=50)
+    expected = df[df['amount'] < 90].sort_values('amount', ascending=False, kind='stable')
+    assert matching == len(expected)
+    pd.testing.assert_frame_equal(df.iloc[positions], expected.iloc[300:350])
+
+
+def grid_app():
+    """App showing one of two tables in the same grid, chosen by session state."""
+    import pandas as pd
+    import streamlit as st
+    from app.utils.data_grid import data_grid
+
+    n = st.session_state.get("rows", 1000)
+    data_grid(pd.DataFrame({"amount": range(n), "id": [f"rec{i}" for i in range(n)]}), key="airtable_grid")
+
+
+def test_new_frame_resets_filter_and_page():
+    """Loading another table under the same key drops the old filter and page."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_function(grid_app)
+    app.run()
+    app.text_input(key="airtable_grid_filter").input(">= 990").run()
+    assert "of 10 (filtered from 1000)" in app.caption[0].value
+
+    app.session_state["rows"] = 50
+    app.run()
+    assert app.text_input(key="airtable_grid_filter").value == ""
+    assert app.caption[0].value.startswith("Page 1 of 2: rows 1–25 of 50")
+
+
+if __name__ == "__main__":
+    test_sort_order_is_stable_with_missing_last()
+    test_filter_mask()
+    test_page_positions()
+    test_page_matches_full_sort()
+    test_new_frame_resets_filter_and_page()
+    print("All data grid tests passed")
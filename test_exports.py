@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for lazily generated, cached exports
+"""
+import io
+import os
+import sys
+import tempfile
+import pandas as pd
+import pyarrow.ipc as pa_ipc
+sys.path.append('.')
+
+from app.utils.exports import DataExporter, get_export_bytes, write_excel, write_year_partitioned
+
+
+def sample_frame():
+    """Small frame with the dtypes read_html produces."""
+    return pd.DataFrame({
+        'data': pd.to_datetime(['2025-01-02 09:07', '2025-01-02 10:35']),
+        'typ': ['Wizyta', 'Badanie'],
+        'email': ['a@example.pl', None],
+    })
+
+
+def test_fingerprint_tracks_content():
+    """Equal content gives equal fingerprints; any change gives a new one."""
+    df = sample_frame()
+    assert DataExporter.fingerprint(df) == DataExporter.fingerprint(sample_frame())
+
+    changed = sample_frame()
+    changed.loc[1, 'email'] = 'b@example.pl'
+    assert DataExporter.fingerprint(changed) != DataExporter.fingerprint(df)
+    assert DataExporter.fingerprint(df.rename(columns={'typ': 'type'})) != DataExporter.fingerprint(df)
+
+    # Airtable linked-record fields hold lists, which pandas cannot hash directly
+    linked = pd.DataFrame({'accounts': [['rec1'], ['rec2', 'rec3']]})
+    assert DataExporter.fingerprint(linked) != DataExporter.fingerprint(linked.iloc[::-1])
+
+
+def test_export_bytes_match_direct_export():
+    """Cached exports hold the same content as exporting directly."""
+    df = sample_frame()
+    fingerprint = DataExporter.fingerprint(df)
+
+    csv_bytes = get_export_bytes(df, fingerprint, 'csv')
+    assert csv_bytes == df.to_csv(index=False).encode('utf-8')
+
+    excel_bytes = get_export_bytes(df, fingerprint, 'excel')
+    pd.testing.assert_frame_equal(pd.read_excel(io.BytesIO(excel_bytes)), df)
+
+    parquet_bytes = get_export_bytes(df, fingerprint, 'parquet')
+    pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(parquet_bytes)), df)
+
+    arrow_bytes = get_export_bytes(df, fingerprint, 'arrow')
+    pd.testing.assert_frame_equal(pa_ipc.open_file(arrow_bytes).read_pandas(), df)
+
+
+def test_arrow_exports_handle_mixed_airtable_columns():
+    """Columns mixing numbers and text are exported as strings instead of failing."""
+    df = pd.DataFrame({'code': [4000, 'n/a', None], 'accounts': [['rec1'], ['rec2'], None]})
+    restored = pd.read_parquet(io.BytesIO(DataExporter.to_bytes(df, 'parquet')))
+    assert restored['code'].tolist()[:2] == ['4000', 'n/a']
+    assert restored['code'].isna().tolist() == [False, False, True]
+    assert list(restored['accounts'][1]) == ['rec2']
+
+
+def test_streaming_excel_splits_sheets():
+    """Large frames continue on further sheets with typed cells and the header repeated."""
+    df = pd.DataFrame({
+        'data': pd.to_datetime(['2025-01-02 09:07', None, '2025-03-01 08:00', '2025-03-02 08:00', '2025-03-03 08:00']),
+        'kwota': [1.5, None, 3.0, 4.0, 5.5],
+        'typ': ['Wizyta', 'Badanie', None, 'Wizyta', 'Wizyta'],
+        'accounts': [['rec1'], None, 'x', 'y', 'z'],
+    })
+    sheets = pd.read_excel(io.BytesIO(write_excel(df, max_rows_per_sheet=2)), sheet_name=None)
+    assert list(sheets) == ['Sheet1', 'Sheet2', 'Sheet3']
+    assert [len(sheet) for sheet in sheets.values()] == [2, 2, 1]
+
+    restored = pd.concat(sheets.values(), ignore_index=True)
+    assert restored['data'].dtype.kind == 'M'
+    assert restored['data'].isna().tolist() == [False, True, False, False, False]
+    assert restored['kwota'].tolist()[2:] == [3.0, 4.0, 5.5]
+    assert restored['accounts'][0] == "['rec1']"
+
+    empty = pd.read_excel(io.BytesIO(write_excel(df.iloc[:0])))
+    assert list(empty.columns) == list(df.columns) and empty.empty
+
+
+def test_year_partitioned_dataset():
+    """Visits are partitioned by year and can be loaded one year at a time."""
+    df = pd.DataFrame({
+        'data': pd.to_datetime(['2024-12-30 14:55', '2025-01-02 09:07', '2025-07-21 17:48']),
+        'typ': ['Wizyta', 'Badanie', 'Wizyta'],
+    })
+    with tempfile.TemporaryDirectory() as root_dir:
+        write_year_partitioned(df, root_dir)
+        assert sorted(os.listdir(root_dir)) == ['year=2024', 'year=2025']
+
+        visits_2025 = pd.read_parquet(root_dir, columns=['typ'], filters=[('year', '=', 2025)])
+        assert visits_2025['typ'].tolist() == ['Badanie', 'Wizyta']
+
+        # Rewriting a year replaces its partition instead of appending to it
+        write_year_partitioned(df[df['data'].dt.year == 2025], root_dir)
+        assert len(pd.read_parquet(root_dir, filters=[('year', '=', 2025)])) == 2
+
+
+if __name__ == "__main__":
+    test_fingerprint_tracks_content()
+    test_export_bytes_match_direct_export()
+    test_arrow_exports_handle_mixed_airtable_columns()
+    test_streaming_excel_splits_sheets()
+    test_year_partitioned_dataset()
+    print("All export tests passed")
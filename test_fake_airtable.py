@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the local fake Airtable server driven through AirtableManager
+"""
+import sys
+import tempfile
+import time
+sys.path.append('.')
+
+from app.utils.airtable import AirtableManager, TableQuery, any_of_formula
+from app.utils.rate_limit import client_metrics
+from app.utils.table_cache import TableCache
+from benchmarks.fake_airtable import FakeAirtable, parse_formula, evaluate, synthetic_transactions
+
+
+def make_manager(fake, base_id, mirror_dir=None):
+    """AirtableManager talking HTTP to the fake server, with a private cache."""
+    return AirtableManager(api_key="key", base_id=base_id, cache=TableCache(),
+                           endpoint_url=fake.url, mirror_dir=mirror_dir)
+
+
+def test_list_paginates_and_pushes_down_queries():
+    """Listings are paged, and fields, formulas, sorts and limits are applied by the server."""
+    with FakeAirtable(page_size=50, requests_per_second=None) as fake:
+        fake.seed("appFakeList", "transactions", synthetic_transactions(230))
+        manager = make_manager(fake, "appFakeList")
+
+        df = manager.fetch_table("transactions")
+        assert len(df) == 230 and fake.stats["requests"] == 5
+        assert df["transaction_id"].tolist()[:2] == ["T0000000", "T0000001"]
+
+        query = TableQuery("transactions", fields=["account_id", "amount"],
+                           formula=any_of_formula("account_id", ["4000", "4100"]), sort=["-amount"], max_records=7)
+        latest = manager.fetch_table(query)
+        assert len(latest) == 7 and set(latest["account_id"]) <= {"4000", "4100"}
+        assert latest["amount"].tolist() == sorted(latest["amount"], reverse=True)
+        assert sorted(latest.columns) == ["account_id", "amount", "id"]
+
+
+def test_writes_round_trip():
+    """Batch create, update, upsert and delete change what later listings return."""
+    with FakeAirtable(requests_per_second=None) as fake:
+        manager = make_manager(fake, "appFakeWrite")
+        created = manager.batch_create("accounts", [{"code": str(i), "name": f"a{i}"} for i in range(25)])
+        assert all(result.success for result in created) and fake.stats["requests"] == 3
+
+        ids = [result.record_id for result in created]
+        assert all(r.success for r in manager.batch_update("accounts", [{"id": ids[0], "fields": {"name": "x"}}]))
+        upserted = manager.batch_upsert("accounts", [{"code": "1", "name": "y"}, {"code": "99", "name": "z"}], ["code"])
+        assert [result.created for result in upserted] == [False, True]
+        assert all(result.success for result in manager.batch_delete("accounts", ids[10:]))
+
+        df = manager.fetch_table("accounts").set_index("code")
+        assert len(df) == 11
+        assert (df.loc["0", "name"], df.loc["1", "name"], df.loc["99", "name"]) == ("x", "y", "z")
+
+        missing = manager.batch_delete("accounts", ["recMissing"])
+        assert not missing[0].success and "404" in missing[0].error
+
+
+def test_mirror_delta_sync_uses_modified_times():
+    """The mirror's modified-since formula is evaluated, so a delta sync fetches only changes."""
+    with FakeAirtable(requests_per_second=None) as fake, tempfile.TemporaryDirectory() as tmp:
+        ids = fake.seed("appFakeSync", "transactions", synthetic_transactions(300), created=time.time() - 3600)
+        mirror = make_manager(fake, "appFakeSync", mirror_dir=tmp).mirror("transactions")
+        assert mirror.sync().fetched == 300
+
+        fake.touch("appFakeSync", "transactions", ids[:3], {"amount": 0})
+        result = mirror.sync()
+        assert not result.full and result.fetched == 3 and result.total == 300
+        assert (mirror.load().set_index("id").loc[ids[:3], "amount"] == 0).all()
+
+
+def test_rate_limit_answers_429_and_client_recovers():
+    """Above its rate the server answers 429; the client backs off and still gets every record."""
+    with FakeAirtable(requests_per_second=2, retry_after=0) as fake:
+        fake.seed("appFakeLimit", "transactions", synthetic_transactions(500))
+        df = make_manager(fake, "appFakeLimit").fetch_table("transactions")
+        assert len(df) == 500
+        assert fake.stats["throttled"] > 0
+        assert client_metrics()["appFakeLimit"]["throttled"] == fake.stats["throttled"]
+
+
+def test_formula_evaluation():
+    """Comparisons coerce like Airtable, and unsupported functions are rejected."""
+    record = {"fields": {"amount": 5, "name": "it's"}, "created": 0.0, "modified": 100.0}
+    assert evaluate(parse_formula("AND({amount}>5, {name}='it\\'s')"), record) is False
+    assert evaluate(parse_formula("AND({amount}>=5, {name}='it\\'s', NOT({missing}!=''))"), record) is True
+    assert evaluate(parse_formula("IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('1970-01-01T00:01:00.000Z'))"),
+                    record) is True
+    try:
+        evaluate(parse_formula("SEARCH('a', {name})"), record)
+        assert False, "unsupported functions should be rejected"
+    except Exception as e:
+        assert "SEARCH" in str(e)
+
+
+if __name__ == "__main__":
+    test_list_paginates_and_pushes_down_queries()
+    test_writes_round_trip()
+    test_mirror_delta_sync_uses_modified_times()
+    test_rate_limit_answers_429_and_client_recovers()
+    test_formula_evaluation()
+    print("All fake Airtable tests passed")
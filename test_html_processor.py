@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Golden-output tests for the HTML visit parser
+"""
+import glob
+import io
+import os
+import re
+import sys
+import pandas as pd
+from bs4 import BeautifulSoup
+sys.path.append('.')
+
+from app.utils.html_processor import HTMLProcessor, TEXT_BACKENDS, read_html, iter_visits
+
+RAW_FILES = sorted(glob.glob(os.path.join('data', 'raw', '*.html')))
+
+
+def reference_read_html(file_path):
+    """Original multi-pass parser, kept as the golden reference."""
+    with open(file_path, encoding="iso-8859-2") as f:
+        html = f.read()
+
+    visit_sections = re.split(r"<B>\s*\d{2}/\d{2}/\d{4} \d{2}:\d{2}: (?:Wizyta|Badanie)<BR>\s*</B>", html)
+    visit_headers = re.findall(r"<B>\s*(\d{2}/\d{2}/\d{4} \d{2}:\d{2}): (Wizyta|Badanie)<BR>\s*</B>", html)
+
+    data = []
+    for i, section in enumerate(visit_sections[1:]):
+        soup = BeautifulSoup(section, "html.parser")
+        text = soup.get_text(separator="\n")
+        lines = [line.strip() for line in text.split("\n") if line.strip()]
+
+        animal_line = next((l for l in lines if l.startswith("Zwierz")), None)
+        if animal_line:
+            match = re.search(r"Zwierz.*?:\s*(\S+)\s+Nr:\s*(\S+)", animal_line)
+            animal_name = match.group(1) if match else None
+            animal_id = match.group(2) if match else None
+        else:
+            animal_name = None
+            animal_id = None
+
+        recommendations = []
+        if "Zalecenia:" in lines:
+            start_idx = lines.index("Zalecenia:") + 1
+            while start_idx < len(lines) and not re.match(r"^\d{2}/\d{2}/\d{4} \d{2}:\d{2}:", lines[start_idx]):
+                recommendations.append(lines[start_idx])
+                start_idx += 1
+
+        treatments = [l.strip() for l in lines if l.startswith("__") or l.startswith("_")]
+        medications = [l.strip() for l in lines if re.match(r"^[A-Z].*\d{1,2}[.,]?\s?ml", l)]
+
+        data.append({
+            "data": visit_headers[i][0],
+            "typ": visit_headers[i][1],
+            "wlasciciel": next((l.split(":")[1].strip() for l in lines if "Właściciel" in l), None),
+            "telefon": next((l.split(":")[1].strip() for l in lines if l.startswith("Tel.:")), None),
+            "email": next((l.split(":")[1].strip() for l in lines if l.startswith("E-mail:")), None),
+            "nazwa_zwierzecia": animal_name,
+            "id_zwierzecia": animal_id,
+            "gatunek": next((l.split(":")[1].strip() for l in lines if l.startswith("Gatunek")), None),
+            "rasa": next((l.split(":")[1].strip() for l in lines if l.startswith("Rasa")), None),
+            "plec": next((l.split(":")[1].strip() for l in lines if "Płeć" in l), None),
+            "wiek": next((l.split(":")[1].strip() for l in lines if l.startswith("Wiek")), None),
+            "microchip": next((l.split(":")[1].strip() for l in lines if l.startswith("Mikrochip")), None),
+            "zabiegi": HTMLProcessor.clean_multiline(treatments),
+            "leki": HTMLProcessor.clean_multiline(medications),
+            "zalecenia": HTMLProcessor.clean_multiline(recommendations)
+        })
+
+    df = pd.DataFrame(data)
+    if not df.empty:
+        df['data'] = pd.to_datetime(df['data'], format='%d/%m/%Y %H:%M')
+    return df
+
+
+def test_read_html_matches_reference():
+    """read_html must reproduce the reference output for every export in data/raw."""
+    assert RAW_FILES, "No HTML fixtures found in data/raw"
+    for file_path in RAW_FILES:
+        expected = reference_read_html(file_path)
+        actual = read_html(file_path, os.path.basename(file_path))
+        pd.testing.assert_frame_equal(actual, expected, obj=file_path)
+
+
+def test_parse_visit_lines_recommendations_stop_at_date():
+    """Recommendations are collected after "Zalecenia:" up to the next date line."""
+    lines = [
+        "Właściciel: Jan Kowalski  Nr: 1",
+        "Zwierzę: A01  Nr: 12/2025",
+        "Zalecenia:",
+        "_kontrola za tydzień",
+        "01/02/2025 10:00: notatka",
+        "po dacie",
+    ]
+    entry = HTMLProcessor.parse_visit_lines("01/02/2025 09:00", "Wizyta", lines)
+    assert entry["wlasciciel"] == "Jan Kowalski  Nr"
+    assert entry["nazwa_zwierzecia"] == "A01"
+    assert entry["id_zwierzecia"] == "12/2025"
+    assert entry["zalecenia"] == "_kontrola za tydzień"
+    assert entry["zabiegi"] == "_kontrola za tydzień"
+
+
+def test_iter_sections_small_chunks():
+    """Markers split across read chunks must not change the parsed sections."""
+    file_path = os.path.join('data', 'raw', 'Wizyty2.html')
+    with open(file_path, 'rb') as f:
+        whole = list(HTMLProcessor.iter_sections(f))
+    with open(file_path, 'rb') as f:
+        chunked = list(HTMLProcessor.iter_sections(f, chunk_size=7))
+    assert len(whole) == 71
+    assert chunked == whole
+
+
+def test_iter_visits_batches_match_read_html():
+    """Batched DataFrames concatenate to the read_html output."""
+    file_path = os.path.join('data', 'raw', 'Wizyty2025.html')
+    expected = read_html(file_path, 'Wizyty2025.html')
+    batches = list(iter_visits(file_path, batch_size=100))
+    assert [len(batch) for batch in batches] == [100] * 6 + [85]
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), expected)
+
+    with open(file_path, encoding='iso-8859-2') as f:
+        records = list(iter_visits(f))
+    assert len(records) == len(expected)
+    assert records[0]['data'] == expected['data'][0].strftime('%d/%m/%Y %H:%M')
+
+
+def test_read_html_from_bytes_and_buffer():
+    """Raw bytes and in-memory buffers parse the same as the file on disk."""
+    file_path = os.path.join('data', 'raw', 'Wizyty2.html')
+    expected = read_html(file_path, 'Wizyty2.html')
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    pd.testing.assert_frame_equal(read_html(content, 'Wizyty2.html'), expected)
+    pd.testing.assert_frame_equal(read_html(io.BytesIO(content), 'Wizyty2.html'), expected)
+
+
+def test_read_html_parallel_matches_serial():
+    """Sharded parsing across processes keeps visits in file order."""
+    file_path = os.path.join('data', 'raw', 'Wizyty2.html')
+    expected = read_html(file_path, 'Wizyty2.html')
+    actual = HTMLProcessor.read_html_parallel(file_path, workers=2, min_visits=0)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_text_backends_match_bs4():
+    """Every installed text backend yields the same lines as bs4 on the data/raw exports."""
+    for file_path in RAW_FILES:
+        with open(file_path, 'rb') as f:
+            sections = [section for _, _, section in HTMLProcessor.iter_sections(f)]
+        expected = [HTMLProcessor.section_lines(section, 'bs4') for section in sections]
+        for backend in TEXT_BACKENDS:
+            actual = [HTMLProcessor.section_lines(section, backend) for section in sections]
+            assert actual == expected, f"{backend} differs on {file_path}"
+
+
+def test_tokenizer_handles_entities_and_comments():
+    """The tokenizer decodes entities and drops comments like html.parser does."""
+    section = "<B>Tel.:&nbsp;123</B><BR><!-- ukryte --><TD>a &lt; b</TD>"
+    assert HTMLProcessor.section_lines(section, 'tokenizer') == HTMLProcessor.section_lines(section, 'bs4')
+
+
+def test_compact_output_keeps_values():
+    """The compact schema saves memory without changing exported values."""
+    file_path = os.path.join('data', 'raw', 'Wizyty2024.html')
+    df = read_html(file_path, 'Wizyty2024.html', backend='tokenizer')
+    plain = df.astype({col: object for col in df.columns if col != 'data'})
+    plain_memory = plain.memory_usage(deep=True).sum()
+    compact = HTMLProcessor.compact_dataframe(plain)
+
+    assert compact['typ'].dtype == 'category'
+    assert compact.attrs['uncompacted_memory'] == plain_memory
+    assert compact.memory_usage(deep=True).sum() * 4 < plain_memory
+    assert compact.to_csv(index=False) == plain.to_csv(index=False)
+
+
+def test_synthetic_export_parses():
+    """The benchmark generator produces exports the parser reads completely."""
+    from benchmarks.synthetic import generate_export
+    df = read_html(generate_export(500), 'synthetic.html', backend='tokenizer')
+    assert len(df) == 500
+    assert set(df['typ']) == {'Wizyta', 'Badanie'}
+    assert df['gatunek'].notna().all()
+
+
+if __name__ == "__main__":
+    test_read_html_matches_reference()
+    test_parse_visit_lines_recommendations_stop_at_date()
+    test_iter_sections_small_chunks()
+    test_iter_visits_batches_match_read_html()
+    test_read_html_from_bytes_and_buffer()
+    test_read_html_parallel_matches_serial()
+    test_text_backends_match_bs4()
+    test_tokenizer_handles_entities_and_comments()
+    test_compact_output_keeps_values()
+    test_synthetic_export_parses()
+    print("All HTML processor tests passed")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental re-ingestion of growing visit exports
+"""
+import os
+import sys
+import tempfile
+import pandas as pd
+sys.path.append('.')
+
+from app.utils.html_processor import HTML_ENCODING, VISIT_HEADER_RE, read_html
+from app.utils.incremental import IncrementalParser
+
+
+def test_reimport_parses_only_new_visits():
+    """A grown export reuses stored visits and matches a full parse."""
+    with open(os.path.join('data', 'raw', 'Wizyty2025.html'), 'rb') as f:
+        content = f.read()
+    starts = [match.start() for match in VISIT_HEADER_RE.finditer(content.decode(HTML_ENCODING))]
+    earlier_export = content[:starts[600]]
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        parser = IncrementalParser(store_dir)
+        df, stats = parser.ingest(earlier_export, 'Wizyty2025')
+        assert stats == {'total': 600, 'reused': 0, 'new': 600, 'changed': 0}
+        pd.testing.assert_frame_equal(df, read_html(earlier_export, 'Wizyty2025.html'))
+
+        df, stats = parser.ingest(content, 'Wizyty2025')
+        assert stats == {'total': 685, 'reused': 600, 'new': 85, 'changed': 0}
+        pd.testing.assert_frame_equal(df, read_html(content, 'Wizyty2025.html'))
+
+
+def test_changed_section_is_reparsed():
+    """A visit whose section changed is parsed again under the same key."""
+    with open(os.path.join('data', 'raw', 'Wizyty2.html'), 'rb') as f:
+        content = f.read()
+    edited = content.replace(b'Tel.: 694793461', b'Tel.: 111222333', 1)
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        parser = IncrementalParser(store_dir)
+        parser.ingest(content, 'Wizyty2')
+        df, stats = parser.ingest(edited, 'Wizyty2')
+        assert stats['changed'] == 1
+        assert stats['reused'] == stats['total'] - 1
+        assert df['telefon'][0] == '111222333'
+
+
+def test_dataset_name_ignores_download_suffix():
+    """Re-downloaded copies map to the same dataset."""
+    assert IncrementalParser.dataset_name('Wizyty25 (1).html') == 'Wizyty25'
+    assert IncrementalParser.dataset_name('Wizyty25.html') == 'Wizyty25'
+
+
+if __name__ == "__main__":
+    test_reimport_parses_only_new_visits()
+    test_changed_section_is_reparsed()
+    test_dataset_name_ignores_download_suffix()
+    print("All incremental ingestion tests passed")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent parse cache
+"""
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+sys.path.append('.')
+
+from app.utils.html_processor import read_html
+from app.utils.parse_cache import ParseCache, write_parquet_atomic
+
+
+def test_round_trip_matches_parsed_frame():
+    """A cached export loads back identical to the parsed DataFrame."""
+    file_path = os.path.join('data', 'raw', 'Wizyty2.html')
+    df = read_html(file_path, 'Wizyty2.html')
+    with open(file_path, 'rb') as f:
+        content_hash = ParseCache.content_hash(f.read())
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ParseCache(cache_dir)
+        assert cache.get(content_hash) is None
+        cache.put(content_hash, df)
+        pd.testing.assert_frame_equal(cache.get(content_hash), df)
+
+        # A new parser version must not reuse the entry
+        assert ParseCache(cache_dir, parser_version='next').get(content_hash) is None
+
+
+def test_lru_eviction_keeps_recently_used():
+    """Entries beyond the size cap are evicted least recently used first."""
+    df = pd.DataFrame({'value': range(1000)})
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ParseCache(cache_dir)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, df)
+            time.sleep(0.01)
+        entry_size = os.path.getsize(cache._path('a'))
+
+        # Touch "a" so that "b" becomes the least recently used entry
+        time.sleep(0.01)
+        cache.get('a')
+
+        cache.max_bytes = entry_size * 2
+        cache.evict()
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.get('c') is not None
+
+
+def test_eviction_covers_incremental_store():
+    """Stored incremental results count towards the cap and are evicted like entries."""
+    df = pd.DataFrame({'value': range(1000)})
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ParseCache(cache_dir)
+        store = os.path.join(cache_dir, 'incremental', 'Wizyty25-v1.parquet')
+        write_parquet_atomic(df, store)
+        time.sleep(0.01)
+        cache.put('a', df)
+        time.sleep(0.01)
+
+        cache.max_bytes = os.path.getsize(cache._path('a')) * 2
+        cache.put('b', df)
+        assert not os.path.exists(store)
+        assert cache.get('a') is not None and cache.get('b') is not None
+
+
+if __name__ == "__main__":
+    test_round_trip_matches_parsed_frame()
+    test_lru_eviction_keeps_recently_used()
+    test_eviction_covers_incremental_store()
+    print("All parse cache tests passed")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounded Airtable table cache and its write-through invalidation
+"""
+import sys
+sys.path.append('.')
+
+import numpy as np
+import pandas as pd
+
+from app.utils.airtable import upsert_rows, drop_rows
+from app.utils.table_cache import TableCache, frame_nbytes
+import airtable_fakes
+
+
+def make_manager(cache=None, base_id="app1"):
+    """AirtableManager with a private cache and in-memory tables of five records each."""
+    manager, _ = airtable_fakes.make_manager(base_id=base_id, cache=cache,
+                                             records={f"rec{i}": {"amount": i} for i in range(5)})
+    return manager
+
+
+def frame(n):
+    return pd.DataFrame({"id": [f"rec{i}" for i in range(n)], "amount": range(n)})
+
+
+def test_lru_eviction_under_memory_cap():
+    """Above the memory cap the least recently used table is evicted first."""
+    size = frame_nbytes(frame(100))
+    cache = TableCache(max_bytes=int(size * 2.5))
+    cache.put("app1", "a", frame(100))
+    cache.put("app1", "b", frame(100))
+    assert cache.get("app1", "a") is not None  # a is now more recent than b
+    cache.put("app1", "c", frame(100))
+
+    assert cache.get("app1", "b") is None
+    assert cache.get("app1", "a") is not None and cache.get("app1", "c") is not None
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["bytes"] <= cache.max_bytes
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+    # A table larger than the whole cap is never stored
+    cache.put("app1", "huge", frame(1000))
+    assert cache.get("app1", "huge") is None and cache.stats()["entries"] == 2
+
+
+def test_ttl_expiry_and_copies():
+    """Entries expire after the TTL; hits share the cached data but column changes stay local."""
+    now = [0.0]
+    cache = TableCache(ttl=60, clock=lambda: now[0])
+    cache.put("app1", "a", frame(3))
+    df = cache.get("app1", "a")
+    assert np.shares_memory(df["amount"].to_numpy(), cache.get("app1", "a")["amount"].to_numpy())
+    df["amount"] = -1
+    df["note"] = "x"
+    cached = cache.get("app1", "a")
+    assert cached["amount"].tolist() == [0, 1, 2] and "note" not in cached.columns
+
+    now[0] = 61
+    assert cache.get("app1", "a") is None
+    assert cache.stats()["expirations"] == 1 and cache.stats()["entries"] == 0
+
+
+def test_invalidation_is_scoped():
+    """Invalidating a table leaves other tables and other bases cached."""
+    cache = TableCache()
+    cache.put("app1", "a", frame(2))
+    cache.put("app1", "a", frame(1), variant=("fields", "amount"))
+    cache.put("app1", "b", frame(2))
+    cache.put("app2", "a", frame(2))
+
+    assert cache.invalidate("app1", "a") == 2
+    assert cache.get("app1", "b") is not None and cache.get("app2", "a") is not None
+    assert cache.invalidate("app1") == 1
+    assert cache.get("app2", "a") is not None
+
+
+def test_refresh_does_not_grow_the_cache():
+    """get_table_data_fresh replaces the table's entry instead of adding one per refresh."""
+    manager = make_manager()
+    for _ in range(5):
+        manager.get_table_data_fresh("transactions")
+    assert manager.cache_stats()["entries"] == 1
+    assert manager.api.tables["transactions"].listings == 5
+
+    manager.get_table_data("transactions")
+    assert manager.api.tables["transactions"].listings == 5
+
+
+def test_single_writes_patch_the_cached_table():
+    """add/update/delete patch the cached table, so no refetch is needed."""
+    manager = make_manager()
+    manager.get_table_data("transactions")
+    manager.get_table_data("accounts")
+
+    assert manager.add_record("transactions", {"amount": 50})
+    assert manager.update_record("transactions", "rec1", {"amount": -1})
+    assert manager.delete_record("transactions", "rec3")
+
+    df = manager.get_table_data("transactions")
+    assert manager.api.tables["transactions"].listings == 1
+    assert df["id"].tolist() == ["rec0", "rec1", "rec2", "rec4", "rec5"]
+    assert df["amount"].tolist() == [0, -1, 2, 4, 50]
+    assert manager.cache_stats()["entries"] == 2
+
+
+def test_batch_writes_invalidate_only_their_table():
+    """A batch upload drops its table from the cache and keeps the others."""
+    manager = make_manager()
+    manager.get_table_data("transactions")
+    manager.get_table_data("accounts")
+    manager.batch_create("transactions", [{"amount": i} for i in range(25)])
+
+    assert len(manager.get_table_data("transactions")) == 30
+    assert manager.api.tables["transactions"].listings == 2
+    manager.get_table_data("accounts")
+    assert manager.api.tables["accounts"].listings == 1
+
+
+def test_row_patch_helpers():
+    """Updated rows keep their position, new rows are appended, deleted rows removed."""
+    df = pd.DataFrame({"id": ["a", "b", "c"], "amount": [1, 2, 3]})
+    patched = upsert_rows(df, [{"id": "b", "fields": {"amount": 20, "note": "x"}},
+                               {"id": "d", "fields": {"amount": 4}}])
+    assert patched["id"].tolist() == ["a", "b", "c", "d"]
+    assert patched["amount"].tolist() == [1, 20, 3, 4]
+    assert patched["note"].tolist()[1] == "x"
+    assert drop_rows(patched, ["a", "d"])["id"].tolist() == ["b", "c"]
+    assert upsert_rows(pd.DataFrame(), [{"id": "a", "fields": {"n": 1}}])["id"].tolist() == ["a"]
+
+
+if __name__ == "__main__":
+    test_lru_eviction_under_memory_cap()
+    test_ttl_expiry_and_copies()
+    test_invalidation_is_scoped()
+    test_refresh_does_not_grow_the_cache()
+    test_single_writes_patch_the_cached_table()
+    test_batch_writes_invalidate_only_their_table()
+    test_row_patch_helpers()
+    print("All table cache tests passed")
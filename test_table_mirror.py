@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the local Airtable table mirror
+"""
+import sys
+import tempfile
+import time
+sys.path.append('.')
+
+from app.utils.airtable import AirtableManager
+from app.utils.table_cache import TableCache
+from app.utils.table_mirror import TableMirror, SYNC_OVERLAP_SECONDS
+from benchmarks.fake_airtable import FakeAirtable, synthetic_transactions
+from airtable_fakes import FakeApi
+
+
+def make_table(n):
+    """Api whose transactions table holds n records last modified an hour ago, served in pages of 10."""
+    return FakeApi(records={f"rec{i:03d}": {"account_id": str(4000 + i % 3), "amount": i} for i in range(n)},
+                   modified=time.time() - 3600, page_size=10)
+
+
+def test_first_sync_downloads_everything():
+    """An empty mirror is filled by a full download and serves the same DataFrame."""
+    api = make_table(25)
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = TableMirror(api, "app1", "transactions", mirror_dir=tmp)
+        result = mirror.sync()
+        assert result.full and result.fetched == 25 and result.total == 25
+        assert api.fake_table("transactions").pages_served == 3
+
+        df = mirror.load()
+        assert df["id"].tolist() == [f"rec{i:03d}" for i in range(25)]
+        assert df["amount"].tolist() == list(range(25))
+
+
+def test_delta_sync_downloads_only_changes():
+    """Later syncs fetch only created or modified records, in one page."""
+    api = make_table(250)
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = TableMirror(api, "app1", "transactions", mirror_dir=tmp)
+        mirror.sync()
+        table = api.fake_table("transactions")
+        table.pages_served = 0
+
+        table.put("rec007", {"account_id": "4000", "amount": -7}, time.time())
+        table.put("recNew", {"account_id": "5000", "amount": 99, "note": "new"}, time.time())
+        result = mirror.sync()
+
+        assert not result.full and result.fetched == 2 and result.total == 251
+        assert table.pages_served == 1
+
+        # A new mirror object reads the same file without calling Airtable
+        df = TableMirror(None, "app1", "transactions", mirror_dir=tmp).load()
+        assert df.set_index("id").loc["rec007", "amount"] == -7
+        assert df["id"].iloc[-1] == "recNew" and df["note"].iloc[-1] == "new"
+        assert len(df) == 251
+
+
+def test_overlap_and_full_reconcile():
+    """Changes just before the last sync are re-read; full syncs drop deleted records."""
+    api = make_table(5)
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = TableMirror(api, "app1", "transactions", mirror_dir=tmp, full_sync_interval=3600)
+        mirror.sync()
+
+        # Modified before the sync started by Airtable's (skewed) clock
+        api.fake_table("transactions").put("rec001", {"amount": 100}, time.time() - SYNC_OVERLAP_SECONDS / 2)
+        del api.fake_table("transactions").records["rec004"]
+        result = mirror.sync()
+        assert not result.full and result.fetched == 1
+        assert mirror.load().set_index("id").loc["rec001", "amount"] == 100
+        assert result.total == 5  # the deletion is not visible to a delta sync
+
+        result = mirror.sync(full=True)
+        assert result.full and result.total == 4
+        assert "rec004" not in mirror.load()["id"].tolist()
+
+        mirror.full_sync_interval = 0
+        assert mirror.sync().full
+
+
+def test_manager_reads_through_mirror():
+    """With a mirror_dir, fetch_table syncs the mirror and reads from it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = AirtableManager(api_key="key", base_id="app1", mirror_dir=tmp)
+        manager.api = make_table(12)
+        assert len(manager.fetch_table("transactions")) == 12
+        manager.api.fake_table("transactions").pages_served = 0
+        assert len(manager.fetch_table("transactions")) == 12
+        assert manager.api.fake_table("transactions").pages_served == 0
+        assert manager.mirror("transactions").status()["records"] == 12
+
+
+def test_deletes_reach_the_mirror():
+    """Records deleted through the manager do not come back when the table is rebuilt from the mirror."""
+    with FakeAirtable(requests_per_second=None) as fake, tempfile.TemporaryDirectory() as tmp:
+        ids = fake.seed("appMirrorDelete", "transactions", synthetic_transactions(20), created=time.time() - 3600)
+        manager = AirtableManager(api_key="key", base_id="appMirrorDelete", mirror_dir=tmp,
+                                  cache=TableCache(), endpoint_url=fake.url)
+        assert len(manager.get_table_data("transactions")) == 20
+
+        assert manager.delete_record("transactions", ids[0])
+        assert all(result.success for result in manager.batch_delete("transactions", ids[1:6]))
+        # A rejected batch removes nothing from the mirror
+        assert not manager.batch_delete("transactions", [ids[6], "recMissing"])[0].success
+        assert len(fake.table("appMirrorDelete", "transactions").records) == 14
+
+        manager.clear_cache("transactions")
+        for df in (manager.get_table_data("transactions"), manager.fetch_table("transactions"),
+                   manager.get_table_data_fresh("transactions")):
+            assert len(df) == 14 and not set(ids[:6]) & set(df["id"])
+        assert manager.mirror("transactions").status()["records"] == 14
+
+
+if __name__ == "__main__":
+    test_first_sync_downloads_everything()
+    test_delta_sync_downloads_only_changes()
+    test_overlap_and_full_reconcile()
+    test_manager_reads_through_mirror()
+    test_deletes_reach_the_mirror()
+    print("All table mirror tests passed")
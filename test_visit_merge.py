@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for merging overlapping visit exports
+"""
+import os
+import sys
+import pandas as pd
+sys.path.append('.')
+
+from app.utils.html_processor import read_html
+from app.utils.visit_merge import VisitMerger, merge_visits
+
+
+def load(name):
+    """Parse one export from data/raw."""
+    return read_html(os.path.join('data', 'raw', name), name, backend='tokenizer')
+
+
+def test_merge_drops_overlapping_visits():
+    """Identical and overlapping exports only contribute their new visits."""
+    frames = [
+        ('Wizyty2.html', load('Wizyty2.html')),
+        ('Wizyty2 2.html', load('Wizyty2 2.html')),
+        ('Wizyty2025.html', load('Wizyty2025.html')),
+    ]
+    df, report = merge_visits(frames)
+
+    assert report['added'].tolist() == [71, 0, 614]
+    assert report['duplicates'].tolist() == [0, 71, 71]
+    assert len(df) == 685
+    assert not df.duplicated().any()
+
+
+def test_same_minute_visits_are_kept():
+    """Visits sharing a key inside one export are matched one-to-one, not collapsed."""
+    visit = {'data': pd.Timestamp('2025-01-02 10:00'), 'typ': 'Wizyta',
+             'id_zwierzecia': '1/2025', 'wlasciciel': 'Jan Kowalski  Nr'}
+    first = pd.DataFrame([visit])
+    second = pd.DataFrame([visit, dict(visit, wlasciciel=' jan   KOWALSKI nr ')])
+
+    merger = VisitMerger()
+    assert merger.add('first.html', first) == 1
+    assert merger.add('second.html', second) == 1
+    assert len(merger.result()) == 2
+
+
+if __name__ == "__main__":
+    test_merge_drops_overlapping_visits()
+    test_same_minute_visits_are_kept()
+    print("All visit merge tests passed")